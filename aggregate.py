@@ -0,0 +1,262 @@
+# aggregate.py
+
+"""
+Map-reduce skill / certification statistics for corpora too large to load
+into one JobCorpus.
+
+1) Split the jobs into job_id ranges of about the same number of skill rows
+   (boundaries come from the job_id index, so each worker does an indexed
+   range scan instead of a full table scan).
+2) Every worker process streams its range from SQLite in job_id order, a few
+   hundred thousand rows at a time, and folds each chunk into partial skill
+   counts, pair counts (Xᵀ·X of the chunk's indicator matrix) and cert counts.
+3) The parent merges partials as they finish, so it only ever holds the
+   running totals plus one partial.
+"""
+
+import argparse
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy import sparse
+
+from data_loader import (
+    DEFAULT_DB_PATH, Vocabulary, _column_counts, _cooccurrence, _indicator,
+    _name_matrix, _remap_counts, _remap_square, _report, _table_columns,
+    select_names_sql,
+)
+from db_pool import read_snapshot
+
+CHUNK_ROWS = 200_000          # skill/cert rows folded per step inside a worker
+PARTITIONS_PER_WORKER = 4     # more partitions than workers evens out skew
+
+# skill_cooccurrence / required_skill_cooccurrence are symmetric CSR matrices
+# like JobCorpus.cooccurrence (the diagonal holds the per-skill counts).
+CorpusAggregates = namedtuple("CorpusAggregates", [
+    "n_jobs",
+    "skills", "skill_counts", "required_skill_counts",
+    "skill_cooccurrence", "required_skill_cooccurrence",
+    "certs", "cert_counts", "required_cert_counts",
+])
+
+
+# ─── Partitioning ────────────────────────────────────────────────────────────
+def partition_bounds(db_path, partitions):
+    """
+    Sorted job_id boundaries splitting the skills rows into ≤ `partitions`
+    ranges of roughly equal size ([] means one range covering everything).
+    """
+    with read_snapshot(db_path) as conn:
+        if not _table_columns(conn.cursor(), "skills"):
+            return []
+        total = conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+        bounds = []
+        for i in range(1, partitions):
+            row = conn.execute(
+                "SELECT job_id FROM skills WHERE job_id IS NOT NULL ORDER BY job_id LIMIT 1 OFFSET ?",
+                (total * i // partitions,)
+            ).fetchone()
+            if row is not None and (not bounds or row[0] != bounds[-1]):
+                bounds.append(row[0])
+    return bounds
+
+
+def _range_where(lo, hi):
+    """(WHERE clause, params) for lo ≤ job_id < hi; None means unbounded (NULL ids go first)."""
+    if lo is None and hi is None:
+        return "1", ()
+    if lo is None:
+        return "(job_id < ? OR job_id IS NULL)", (hi,)
+    if hi is None:
+        return "job_id >= ?", (lo,)
+    return "job_id >= ? AND job_id < ?", (lo, hi)
+
+
+# ─── Map ─────────────────────────────────────────────────────────────────────
+def _job_chunks(cursor, sql, params):
+    """
+    Yield lists of (job_id, name, required) rows of about CHUNK_ROWS rows,
+    never splitting one job's rows across two chunks.
+    """
+    cursor.execute(sql, params)
+    carry = []
+    for rows in iter(lambda: cursor.fetchmany(CHUNK_ROWS), []):
+        rows = carry + rows
+        last = rows[-1][0]
+        cut = len(rows)
+        while cut > 0 and rows[cut - 1][0] == last:
+            cut -= 1
+        if cut == 0:        # one job spans the whole fetch: keep reading
+            carry = rows
+            continue
+        carry = rows[cut:]
+        yield rows[:cut]
+    if carry:
+        yield carry
+
+
+def _fold_names(cursor, table, where, params, pairs):
+    """
+    Stream one table's range → (names, counts, required_counts, pair matrices).
+    Pair matrices ({False: all, True: required}) are only built if `pairs`.
+    """
+    columns = _table_columns(cursor, table)
+    vocab = Vocabulary()
+    counts = np.zeros(0, dtype=np.int64)
+    required_counts = np.zeros(0, dtype=np.int64)
+    totals = {False: sparse.csr_matrix((0, 0), dtype=np.int64), True: sparse.csr_matrix((0, 0), dtype=np.int64)}
+    if not columns:
+        return vocab.strings, counts, required_counts, totals
+
+    sql, pre_normalized = select_names_sql(table, columns)
+    for rows in _job_chunks(cursor, f"{sql} WHERE {where} ORDER BY job_id", params):
+        job_index = {}
+        for job_id, _, _ in rows:
+            job_index.setdefault(job_id, len(job_index))
+        flags, vocab = _name_matrix(rows, job_index, pre_normalized, vocab)
+        n = len(vocab)
+        counts = _grow_counts(counts, n) + _column_counts(flags, False, n)
+        required_counts = _grow_counts(required_counts, n) + _column_counts(flags, True, n)
+        if pairs:
+            for required_only in (False, True):
+                totals[required_only] = (
+                    _grow_square(totals[required_only], n)
+                    + _cooccurrence(_indicator(flags, required_only))
+                )
+    return vocab.strings, counts, required_counts, totals
+
+
+def _grow_counts(counts, size):
+    return np.pad(counts, (0, size - len(counts)))
+
+
+def _grow_square(matrix, size):
+    matrix = matrix.tocsr()
+    matrix.resize((size, size))
+    return matrix
+
+
+def aggregate_partition(db_path, lo=None, hi=None):
+    """
+    Process-pool worker: partial statistics of the jobs with lo ≤ job_id < hi.
+    Returns a picklable dict (names are local to this partial).
+    """
+    where, params = _range_where(lo, hi)
+    with read_snapshot(db_path) as conn:
+        cursor = conn.cursor()
+        skill_names, skill_counts, required_skill_counts, pairs = _fold_names(cursor, "skills", where, params, True)
+        cert_names, cert_counts, required_cert_counts, _ = _fold_names(cursor, "certifications", where, params, False)
+        tables = [t for t in ("jobs", "skills", "certifications") if _table_columns(cursor, t)]
+        n_jobs = cursor.execute(
+            "SELECT COUNT(*) FROM (" + " UNION ".join(f"SELECT job_id FROM {t} WHERE {where}" for t in tables) + ")",
+            params * len(tables)
+        ).fetchone()[0] if tables else 0
+    return {
+        "n_jobs": n_jobs,
+        "skills": skill_names, "skill_counts": skill_counts, "required_skill_counts": required_skill_counts,
+        "pairs": pairs[False], "required_pairs": pairs[True],
+        "certs": cert_names, "cert_counts": cert_counts, "required_cert_counts": required_cert_counts,
+    }
+
+
+# ─── Reduce ──────────────────────────────────────────────────────────────────
+class _Totals:
+    """Running sums that partials are merged into one at a time."""
+
+    def __init__(self):
+        self.n_jobs = 0
+        self.skills, self.certs = Vocabulary(), Vocabulary()
+        self.skill_counts = self.required_skill_counts = np.zeros(0, dtype=np.int64)
+        self.cert_counts = self.required_cert_counts = np.zeros(0, dtype=np.int64)
+        self.pairs = self.required_pairs = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+    def add(self, part):
+        self.n_jobs += part["n_jobs"]
+
+        remap = self.skills.intern_many(part["skills"])
+        n = len(self.skills)
+        self.skill_counts = _grow_counts(self.skill_counts, n) + _remap_counts(part["skill_counts"], remap, n)
+        self.required_skill_counts = (
+            _grow_counts(self.required_skill_counts, n) + _remap_counts(part["required_skill_counts"], remap, n)
+        )
+        self.pairs = _grow_square(self.pairs, n) + _remap_square(part["pairs"], remap, n)
+        self.required_pairs = _grow_square(self.required_pairs, n) + _remap_square(part["required_pairs"], remap, n)
+
+        remap = self.certs.intern_many(part["certs"])
+        n = len(self.certs)
+        self.cert_counts = _grow_counts(self.cert_counts, n) + _remap_counts(part["cert_counts"], remap, n)
+        self.required_cert_counts = (
+            _grow_counts(self.required_cert_counts, n) + _remap_counts(part["required_cert_counts"], remap, n)
+        )
+
+    def result(self):
+        return CorpusAggregates(
+            self.n_jobs,
+            self.skills, self.skill_counts, self.required_skill_counts,
+            self.pairs.tocsr(), self.required_pairs.tocsr(),
+            self.certs, self.cert_counts, self.required_cert_counts,
+        )
+
+
+def aggregate_corpus(db_path=DEFAULT_DB_PATH, max_workers=None, partitions=None, progress_callback=None):
+    """
+    Skill / cert counts and skill pair counts of a whole database computed by
+    `max_workers` processes (default: every core) over `partitions` job_id
+    ranges. Returns CorpusAggregates; memory stays bounded by the number of
+    distinct skills and pairs rather than the number of postings.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    bounds = partition_bounds(db_path, partitions or workers * PARTITIONS_PER_WORKER)
+    ranges = list(zip([None] + bounds, bounds + [None]))
+    totals = _Totals()
+    if workers <= 1:
+        for i, (lo, hi) in enumerate(ranges):
+            totals.add(aggregate_partition(db_path, lo, hi))
+            _report(progress_callback, int(95 * (i + 1) / len(ranges)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            futures = [pool.submit(aggregate_partition, db_path, lo, hi) for lo, hi in ranges]
+            for i, future in enumerate(as_completed(futures)):
+                totals.add(future.result())
+                _report(progress_callback, int(95 * (i + 1) / len(ranges)))
+    result = totals.result()
+    _report(progress_callback, 100)
+    return result
+
+
+def upper_pairs(matrix, min_weight=1):
+    """(a_ids, b_ids, weights) of a symmetric pair matrix with a < b and weight ≥ min_weight."""
+    upper = sparse.triu(matrix, k=1).tocoo()
+    keep = upper.data >= max(min_weight, 1)
+    return upper.row[keep].astype(np.int32), upper.col[keep].astype(np.int32), upper.data[keep].astype(np.int64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print skill / cert statistics computed in parallel.")
+    parser.add_argument("db_path", nargs="?", default=DEFAULT_DB_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db_path):
+        print(f"ERROR: Database not found at '{args.db_path}'")
+        return
+    agg = aggregate_corpus(args.db_path, max_workers=args.workers)
+    print(f"{agg.n_jobs} jobs, {len(agg.skills)} skills, {len(agg.certs)} certifications\n")
+
+    print("Top skills:")
+    for i in np.argsort(-agg.skill_counts, kind="stable")[:args.top]:
+        print(f"  {agg.skills[i]:<40} {agg.skill_counts[i]:>8}  (required {agg.required_skill_counts[i]})")
+    print("\nTop skill pairs:")
+    a_ids, b_ids, weights = upper_pairs(agg.skill_cooccurrence)
+    for i in np.argsort(-weights, kind="stable")[:args.top]:
+        print(f"  {agg.skills[a_ids[i]] + ' + ' + agg.skills[b_ids[i]]:<60} {weights[i]:>8}")
+    print("\nTop certifications:")
+    for i in np.argsort(-agg.cert_counts, kind="stable")[:args.top]:
+        print(f"  {agg.certs[i]:<40} {agg.cert_counts[i]:>8}  (required {agg.required_cert_counts[i]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@ import tkinter as tk
 from tkinter import ttk
 from threading import Thread
 from charts.word_cloud_job_titles import run_word_clouds
-from threading import Thread
 from charts.plot_skill_salary_correlation import plot_skill_salary_correlation
-from data_loader import load_skills, load_job_skill_map, load_unique_skills
+from data_loader import load_corpus
+from skill_query import SkillQueryError, query_jobs
+from job_matching import match_jobs, missing_skills
+from gui_widgets import VirtualChecklist, VirtualTreeview
+from skill_search import SkillSearchIndex
+from task_scheduler import TaskScheduler, check_cancelled
+import compute_pool
 from charts.plot_top_companies_by_skill import plot_top_companies_by_skill
 from charts.plot_skill_cooccurrence_network import plot_skill_cooccurrence_network
 from charts.plot_bar import plot_top_skills_bar
@@ -16,7 +21,7 @@ from charts.plot_diminishing_returns import plot_diminishing_returns
 from charts.plot_skill_coverage_comparison import plot_skill_coverage_comparison
 from charts.plot_greedy_unlock_curve import compute_greedy_unlock_data, plot_greedy_unlock_curve
 from charts.plot_skill_job_heatmap import plot_skill_job_heatmap
-from charts.plot_skill_network import compute_skill_edges, plot_skill_network
+from charts.plot_skill_network import compute_skill_network, draw_skill_network
 from charts.plot_skill_galaxy import plot_skill_galaxy
 from charts.plot_skill_clusters import plot_skill_clusters
 from charts.plot_skill_clusters_radial import plot_skill_clusters_radial
@@ -26,47 +31,43 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from charts.plot_remote_vs_onsite import plot_remote_vs_onsite
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from threading import Thread
 
-def compute_and_plot_skill_gap(user_selected_skills, 
-                               job_skill_map, 
-                               job_info_map, 
-                               max_missing=3, 
+def compute_and_plot_skill_gap(corpus,
+                               user_selected_skills,
+                               max_missing=3,
                                top_n=10):
     """
-    1) user_selected_skills: list of skill‐strings (e.g. ["python","sql"]).
-    2) job_skill_map:   { job_id: set([...required skills...]), ... }
-    3) job_info_map:    { job_id: (title, company), ... }
-    4) max_missing:     only include jobs where len(missing) <= max_missing
-    5) top_n:           how many missing‐skill bars to show
+    1) corpus:          the shared JobCorpus (required skills are used)
+    2) user_selected_skills: list of skill‐strings (e.g. ["python","sql"]).
+    3) max_missing:     only include jobs where len(missing) <= max_missing
+    4) top_n:           how many missing‐skill bars to show
     
     Produces a horizontal bar chart `skill_gap_analysis.html` showing
     the top_n most frequently missing skills (across all jobs where
     the user is missing ≤ max_missing skills).
     """
 
-    # Normalize the user's skills
-    user_set = set(s.strip().lower() for s in user_selected_skills)
-
-    # Count how often each missing skill appears (only for jobs missing ≤ max_missing total).
-    missing_counts = {}
-    for job_id, req_skills in job_skill_map.items():
-        # lowercase & stripped skills in job_skill_map should already be normalized,
-        # but just in case:
-        req_lower = set(s.strip().lower() for s in req_skills)
+    # Mark the user's skills in skill-ID space
+    X = corpus.skill_indicator(required_only=True)
+    user_mask = corpus.skill_mask(user_selected_skills)
 
-        missing = req_lower - user_set
-        if 0 < len(missing) <= max_missing:
-            for skill in missing:
-                missing_counts[skill] = missing_counts.get(skill, 0) + 1
+    # Missing required skills per job, then count how often each missing skill
+    # appears (only for jobs missing ≤ max_missing total).
+    missing = np.diff(X.indptr) - X @ user_mask.astype(np.int32)
+    rows = (missing > 0) & (missing <= max_missing)
+    missing_counts = np.asarray(X[rows].sum(axis=0)).ravel()
+    missing_counts[user_mask] = 0
 
     # Build a DataFrame of (skill, frequency), take top_n
-    gap_df = (
-        pd.DataFrame.from_dict(missing_counts, orient='index', columns=['frequency'])
-          .nlargest(top_n, 'frequency')
-          .reset_index()
-          .rename(columns={'index': 'skill'})
-    )
+    top = np.argsort(-missing_counts, kind="stable")[:top_n]
+    top = top[missing_counts[top] > 0]
+    gap_df = pd.DataFrame({
+        'skill': corpus.skill_names(top),
+        'frequency': missing_counts[top],
+    })
+    check_cancelled()
 
     if gap_df.empty:
         # If no missing skills (or no jobs within max_missing), show a simple message.
@@ -111,637 +112,746 @@ def compute_and_plot_skill_gap(user_selected_skills,
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# Helper to bind mousewheel scrolling to a specific canvas
-def bind_mousewheel(widget, target_canvas):
-    def _on_mousewheel(event):
-        target_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-    widget.bind("<Enter>", lambda e: widget.bind_all("<MouseWheel>", _on_mousewheel))
-    widget.bind("<Leave>", lambda e: widget.unbind_all("<MouseWheel>"))
+# Main application (guarded: compute_pool's spawned workers import this module
+# as __mp_main__ and must not build a second GUI)
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("Skill Chart Generator")
+    root.geometry("1000x600")  # wider so we have space for two columns
+
+    # Data is loaded once, in the background (see load_corpus_in_background)
+    corpus           = None
+    excluded_skills  = []  # skills removed from the frequency charts via "Update Skills"
+    all_skills       = []  # list of (skill, freq)
+    skill_items      = []  # [(skill, "skill (freq%)"), …] in all_skills order
+    skill_index      = None  # SkillSearchIndex over all_skills
+    rerun_job_search = None  # recomputes the job list shown (re-run after a refresh)
+
+    # ──────────────────────────────────────────────────────────────────────────────
+    # Column 0: Skill Selection Frame (Search + Scrollable Checkboxes)  ───────────
+    skill_frame = ttk.LabelFrame(root, text="Skill Selection", padding=(5,5))
+    skill_frame.grid(row=0, column=0, rowspan=3, sticky="nsew", padx=5, pady=5)
+
+    # Make column 0 stretch vertically
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=0)  # fixed width
+
+    # Search entry
+    search_entry = ttk.Entry(skill_frame, width=30)
+    search_entry.grid(row=0, column=0, padx=5, pady=(5, 10))
+    search_entry.insert(0, "Search for skills...")
+
+    # Virtual checkbox list (only the visible rows are widgets)
+    skill_list = VirtualChecklist(skill_frame, width=300, height=300)
+    skill_list.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+
+    # Configure row/column so that the list expands
+    skill_frame.grid_rowconfigure(1, weight=1)
+    skill_frame.grid_columnconfigure(0, weight=1)
+
+
+    def set_skill_list(skills, index):
+        """Swap in a new [(skill, freq), …] list and its search index, keeping the current filter."""
+        global skill_index
+        all_skills[:] = skills
+        skill_items[:] = [(skill, f"{skill} ({round(freq * 100)}%)") for skill, freq in skills]
+        skill_index = index
+        apply_filter()
+
+    def get_user_selected_skills():
+        return [skill for skill, _ in all_skills if skill in skill_list.checked]
+
+
+    # Debounce filter logic
+    filter_job = None
+    def filter_skills_delayed(event=None):
+        global filter_job
+        if filter_job:
+            root.after_cancel(filter_job)
+        filter_job = root.after(150, apply_filter)
+
+    def apply_filter():
+        if skill_index is None:
+            return
+        search_text = search_entry.get()
+        if search_text.strip().lower() == "search for skills...":
+            search_text = ""
+        ids = skill_index.search(search_text)
+        skill_list.set_items([skill_items[i] for i in ids.tolist()])
+    
+    
+    def update_skills():
+        selected = get_user_selected_skills()
+        excluded_skills[:] = selected
+        status_label.config(text=f"Selected: {', '.join(selected) or 'None'}")
+
+    def show_job_matches(job_rows, missing=None, selection=None, empty_text="❌ No matching jobs found."):
+        # Only the rows scrolled into view are looked up (and their missing skills named)
+        if not len(job_rows):
+            job_list.set_source(1, lambda i: ("", empty_text, "", ""))
+            return
+        matched_corpus = corpus  # the rows index this corpus, even after a refresh replaces it
+
+        def get_row(i):
+            title, company = (value or "" for value in matched_corpus.job_info(job_rows[i]))
+            if missing is None or missing[i] == 0:
+                return ("✅", title, company, "")
+            names = missing_skills(matched_corpus, job_rows[i], selection)
+            return (f"missing {missing[i]}", title, company, ", ".join(names))
+
+        job_list.set_source(len(job_rows), get_row)
+
+    def find_matching_jobs(selected=None):
+        # Exact matches first, then jobs lacking 1 … MAX_MISSING required skills
+        global rerun_job_search
+        selected = get_user_selected_skills() if selected is None else selected
+        rerun_job_search = lambda: find_matching_jobs(selected)
+        matches = match_jobs(corpus, selected)
+        status_label.config(text=matches.summary())
+        show_job_matches(matches.rows, matches.missing, corpus.skill_mask(selected))
+
+    def run_skill_query(event=None, text=None):
+        # Boolean query over required skills, e.g. python AND (aws OR gcp) AND NOT java
+        global rerun_job_search
+        text = query_entry.get().strip() if text is None else text
+        if not text:
+            return
+        rerun_job_search = lambda: run_skill_query(text=text)
+        unknown = []
+        try:
+            job_rows = query_jobs(corpus, text, required_only=True, unknown=unknown)
+        except SkillQueryError as e:
+            status_label.config(text=f"Query error: {e}")
+            return
+        status = f"Query matched {len(job_rows)} jobs"
+        if unknown:
+            status += f" (unknown skills: {', '.join(sorted(set(unknown)))})"
+        status_label.config(text=status)
+        show_job_matches(job_rows[corpus.listed[job_rows]], empty_text="❌ No jobs match this query.")
+
+
+    search_entry.bind("<KeyRelease>", filter_skills_delayed)
+
+
+    # ──────────────────────────────────────────────────────────────────────────────
+    # Column 1: Right Side (Actions, Charts, Clusters, Job Matches)  ──────────────
+    right_container = ttk.Frame(root)
+    right_container.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
+
+    root.grid_columnconfigure(1, weight=1)
+    right_container.grid_rowconfigure(3, weight=1)  # make job matches area expand
+
+
+    # ─── Actions Frame (Update, Find Jobs, Show Connections) ────────────────────
+    actions_frame = ttk.LabelFrame(right_container, text="Actions", padding=(5,5))
+    actions_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=(0,5))
+    actions_frame.grid_columnconfigure(0, weight=1)
+    actions_frame.grid_columnconfigure(1, weight=1)
+
+    # Status label
+    status_label = ttk.Label(actions_frame, text="Selected: None")
+    status_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0,5))
+
+
+    # Update Skills button
+    btn_update = ttk.Button(actions_frame, text="Update Skills", command=update_skills)
+    btn_update.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
+
+    # Find Matching Jobs button
+    btn_find = ttk.Button(actions_frame, text="Find Matching Jobs", command=find_matching_jobs)
+    btn_find.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
+
+    # Show Connections checkbox
+    show_edges_var = tk.BooleanVar(value=False)
+    chk_show_conn = ttk.Checkbutton(
+        actions_frame,
+        text="Show Connections",
+        variable=show_edges_var,
+        command=lambda: scheduler.submit("Skill Galaxy (3D)", plot_skill_galaxy, corpus, show_edges=show_edges_var.get())
+    )
+    chk_show_conn.grid(row=2, column=0, pady=5, sticky="w")
 
+    # Refresh Data button (pulls postings added/changed since the corpus was loaded)
+    btn_refresh = ttk.Button(actions_frame, text="Refresh Data", command=lambda: refresh_corpus())
+    btn_refresh.grid(row=2, column=1, padx=5, pady=2, sticky="ew")
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Main application
-root = tk.Tk()
-root.title("Skill Chart Generator")
-root.geometry("1000x600")  # wider so we have space for two columns
-
-# Load data once
-raw_skills       = load_skills()
-current_skills   = raw_skills.copy()
-all_skills       = load_unique_skills()  # list of (skill, freq)
-job_skill_map, job_info_map = load_job_skill_map()
-skill_vars       = {}  # { skill: tk.BooleanVar() }
+    # Corpus loading progress (removed once the data is ready)
+    load_progress = ttk.Progressbar(actions_frame, mode="determinate", maximum=100)
+    load_progress.grid(row=4, column=0, columnspan=2, padx=5, pady=(5,0), sticky="ew")
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Column 0: Skill Selection Frame (Search + Scrollable Checkboxes)  ───────────
-skill_frame = ttk.LabelFrame(root, text="Skill Selection", padding=(5,5))
-skill_frame.grid(row=0, column=0, rowspan=3, sticky="nsew", padx=5, pady=5)
-
-# Make column 0 stretch vertically
-root.grid_rowconfigure(0, weight=1)
-root.grid_columnconfigure(0, weight=0)  # fixed width
-
-# Search entry
-search_entry = ttk.Entry(skill_frame, width=30)
-search_entry.grid(row=0, column=0, padx=5, pady=(5, 10))
-search_entry.insert(0, "Search for skills...")
-
-# Scrollable checkbox area
-checkbox_container = tk.Frame(skill_frame)
-checkbox_container.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-
-# Configure row/column so that the canvas expands
-skill_frame.grid_rowconfigure(1, weight=1)
-skill_frame.grid_columnconfigure(0, weight=1)
-
-skill_canvas    = tk.Canvas(checkbox_container, width=300, height=300)
-skill_scrollbar = ttk.Scrollbar(checkbox_container, orient="vertical", command=skill_canvas.yview)
-skill_list_frame= tk.Frame(skill_canvas)
-
-skill_list_frame.bind(
-    "<Configure>",
-    lambda e: skill_canvas.configure(scrollregion=skill_canvas.bbox("all"))
-)
-
-skill_canvas.create_window((0,0), window=skill_list_frame, anchor="nw")
-skill_canvas.configure(yscrollcommand=skill_scrollbar.set)
-
-skill_canvas.pack(side="left", fill="both", expand=True)
-skill_scrollbar.pack(side="right", fill="y")
-
-# Mousewheel binding
-bind_mousewheel(skill_canvas, skill_canvas)
-
-
-def render_skill_checkboxes(skills_to_show):
-    """Rebuild the checkbox list inside skill_list_frame."""
-    for widget in skill_list_frame.winfo_children():
-        widget.destroy()
-    for skill, freq in skills_to_show:
-        if skill not in skill_vars:
-            skill_vars[skill] = tk.BooleanVar()
-        label = f"{skill} ({round(freq * 100)}%)"
-        cb = ttk.Checkbutton(
-            skill_list_frame,
-            text=label,
-            variable=skill_vars[skill],
-            onvalue=True,
-            offvalue=False
+    # Boolean skill query (AND / OR / NOT, parentheses, "quoted names")
+    query_entry = ttk.Entry(actions_frame)
+    query_entry.grid(row=3, column=0, padx=5, pady=2, sticky="ew")
+    query_entry.bind("<Return>", run_skill_query)
+
+    btn_query = ttk.Button(actions_frame, text="Run Query", command=run_skill_query)
+    btn_query.grid(row=3, column=1, padx=5, pady=2, sticky="ew")
+
+
+
+
+
+
+
+    # ─── Charts Frame (all chart buttons) ───────────────────────────────────────
+    charts_frame = ttk.LabelFrame(right_container, text="Charts", padding=(5,5))
+    charts_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=(0,5))
+    for i in range(3):
+        charts_frame.grid_columnconfigure(i, weight=1)
+
+    # ─── Row 0 ───────────────────────────────────────
+
+    # Diminishing Returns Chart
+    btn_diminishing = ttk.Button(
+        charts_frame,
+        text="Diminishing Returns",
+        command=lambda: plot_diminishing_returns(corpus, get_user_selected_skills()),
+        width=25
+    )
+    btn_diminishing.grid(row=0, column=0, padx=5, pady=2, sticky="ew")
+
+    # Coverage Comparison Chart
+    btn_coverage = ttk.Button(
+        charts_frame,
+        text="Coverage Comparison",
+        command=lambda: plot_skill_coverage_comparison(corpus, get_user_selected_skills()),
+        width=25
+    )
+    btn_coverage.grid(row=0, column=1, padx=5, pady=2, sticky="ew")
+
+    # Greedy Unlock Chart (background task; reports progress and can be cancelled)
+    def start_greedy_chart():
+        def show_greedy_fig(coverage_progress, selected_skills):
+            fig = plot_greedy_unlock_curve(coverage_progress, selected_skills)
+            fig_win = tk.Toplevel(root)
+            fig_win.title("Greedy Unlock Curve")
+            canvas = FigureCanvasTkAgg(fig, master=fig_win)
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+        scheduler.submit(
+            "Greedy Unlock Curve",
+            compute_greedy_unlock_data,
+            corpus,
+            user_skills=get_user_selected_skills(),
+            progress=True,
+            on_done=lambda result: show_greedy_fig(*result)
         )
-        cb.pack(anchor="w", padx=5, pady=2)
 
-def get_user_selected_skills():
-    return [skill for skill, var in skill_vars.items() if var.get()]
+    btn_greedy = ttk.Button(
+        charts_frame,
+        text="Greedy Unlock Curve",
+        command=start_greedy_chart,
+        width=25
+    )
+    btn_greedy.grid(row=0, column=2, padx=5, pady=2, sticky="ew")
 
 
-# Debounce filter logic
-filter_job = None
-def filter_skills_delayed(event=None):
-    global filter_job
-    if filter_job:
-        root.after_cancel(filter_job)
-    filter_job = root.after(500, apply_filter)
+    # ─── Row 1 ───────────────────────────────────────
 
-def apply_filter():
-    search_text = search_entry.get().strip().lower()
-    filtered = [(s, f) for s, f in all_skills if search_text in s]
-    render_skill_checkboxes(filtered)
-    
-    
-def update_skills():
-    global current_skills
-    selected = get_user_selected_skills()
-    current_skills[:] = [s for s in raw_skills if s not in selected]
-    status_label.config(text=f"Selected: {', '.join(selected) or 'None'}")
 
-def find_matching_jobs():
-    # Clear existing results
-    for widget in scrollable_frame.winfo_children():
-        widget.destroy()
+    # Skill–Job Heatmap
+    btn_heatmap = ttk.Button(
+        charts_frame,
+        text="Skill–Job Heatmap",
+        command=lambda: plot_skill_job_heatmap(corpus),
+        width=25
+    )
+    btn_heatmap.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
+
+    # Skill Network Graph (edges and layout in the background; drawn with plt.show() on the Tk thread)
+    def start_network_chart():
+        scheduler.submit(
+            "Skill Network Graph",
+            compute_skill_network,
+            corpus,
+            on_done=lambda result: draw_skill_network(*result)
+        )
 
-    user_skills = set(get_user_selected_skills())
-    matched = []
-    for job_id, req_skills in job_skill_map.items():
-        if req_skills.issubset(user_skills):
-            matched.append(job_info_map[job_id])
+    btn_network = ttk.Button(
+        charts_frame,
+        text="Skill Network Graph",
+        command=start_network_chart,
+        width=25
+    )
+    btn_network.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
+
+    # Skill Galaxy (3D Plot with toggle above)
+    btn_galaxy = ttk.Button(
+        charts_frame,
+        text="Skill Galaxy (3D)",
+        command=lambda: scheduler.submit("Skill Galaxy (3D)", plot_skill_galaxy, corpus, show_edges=show_edges_var.get()),
+        width=25
+    )
+    btn_galaxy.grid(row=1, column=2, padx=5, pady=2, sticky="ew")
 
-    if matched:
-        for title, company in matched:
-            ttk.Label(scrollable_frame, text=f"✅ {title} @ {company}", anchor="w").pack(fill="x", padx=5, pady=2)
-    else:
-        ttk.Label(scrollable_frame, text="❌ No exact matches found.", foreground="red").pack(fill="x", padx=5, pady=2)
 
+    # ─── Row 2 ───────────────────────────────────────
 
-search_entry.bind("<KeyRelease>", filter_skills_delayed)
 
-# Initially render all skills
-render_skill_checkboxes(all_skills)
+    # Bar Chart
+    btn_bar = ttk.Button(
+        charts_frame,
+        text="Bar Chart",
+        command=lambda: plot_top_skills_bar(corpus, get_user_selected_skills()),
+        width=25
+    )
+    btn_bar.grid(row=2, column=0, padx=5, pady=2, sticky="ew")
+
+    # Cumulative Line Chart
+    btn_cumline = ttk.Button(
+        charts_frame,
+        text="Cumulative Line",
+        command=lambda: plot_cumulative_line(corpus, excluded_skills),
+        width=25
+    )
+    btn_cumline.grid(row=2, column=1, padx=5, pady=2, sticky="ew")
+
+    # Stackplot
+    btn_stack = ttk.Button(
+        charts_frame,
+        text="Stackplot",
+        command=lambda: plot_stackplot(corpus, excluded_skills),
+        width=25
+    )
+    btn_stack.grid(row=2, column=2, padx=5, pady=2, sticky="ew")
 
 
-# ──────────────────────────────────────────────────────────────────────────────
-# Column 1: Right Side (Actions, Charts, Clusters, Job Matches)  ──────────────
-right_container = ttk.Frame(root)
-right_container.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
-
-root.grid_columnconfigure(1, weight=1)
-right_container.grid_rowconfigure(3, weight=1)  # make job matches area expand
-
-
-# ─── Actions Frame (Update, Find Jobs, Show Connections) ────────────────────
-actions_frame = ttk.LabelFrame(right_container, text="Actions", padding=(5,5))
-actions_frame.grid(row=0, column=0, sticky="ew", padx=5, pady=(0,5))
-actions_frame.grid_columnconfigure(0, weight=1)
-actions_frame.grid_columnconfigure(1, weight=1)
-
-# Status label
-status_label = ttk.Label(actions_frame, text="Selected: None")
-status_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0,5))
-
-
-# Update Skills button
-btn_update = ttk.Button(actions_frame, text="Update Skills", command=update_skills)
-btn_update.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
-
-# Find Matching Jobs button
-btn_find = ttk.Button(actions_frame, text="Find Matching Jobs", command=find_matching_jobs)
-btn_find.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
-
-# Show Connections checkbox
-show_edges_var = tk.BooleanVar(value=False)
-chk_show_conn = ttk.Checkbutton(
-    actions_frame,
-    text="Show Connections",
-    variable=show_edges_var,
-    command=lambda: Thread(target=lambda: plot_skill_galaxy(job_skill_map, show_edges=show_edges_var.get())).start()
-)
-chk_show_conn.grid(row=2, column=0, columnspan=2, pady=5, sticky="w")
-
-
-
-
-
-
-
-# ─── Charts Frame (all chart buttons) ───────────────────────────────────────
-charts_frame = ttk.LabelFrame(right_container, text="Charts", padding=(5,5))
-charts_frame.grid(row=1, column=0, sticky="ew", padx=5, pady=(0,5))
-for i in range(3):
-    charts_frame.grid_columnconfigure(i, weight=1)
-
-# ─── Row 0 ───────────────────────────────────────
-
-# Diminishing Returns Chart
-btn_diminishing = ttk.Button(
-    charts_frame,
-    text="Diminishing Returns",
-    command=lambda: plot_diminishing_returns(get_user_selected_skills()),
-    width=25
-)
-btn_diminishing.grid(row=0, column=0, padx=5, pady=2, sticky="ew")
-
-# Coverage Comparison Chart
-btn_coverage = ttk.Button(
-    charts_frame,
-    text="Coverage Comparison",
-    command=lambda: plot_skill_coverage_comparison(job_skill_map, get_user_selected_skills()),
-    width=25
-)
-btn_coverage.grid(row=0, column=1, padx=5, pady=2, sticky="ew")
-
-# Greedy Unlock Chart (background thread)
-def start_greedy_chart():
-    user_skills = get_user_selected_skills()
-    def run_chart():
-        jm, _ = job_skill_map, job_info_map
-        coverage_progress, selected_skills = compute_greedy_unlock_data(jm, user_skills=user_skills)
-        root.after(0, lambda: show_greedy_fig(coverage_progress, selected_skills))
-    def show_greedy_fig(coverage_progress, selected_skills):
-        fig = plot_greedy_unlock_curve(coverage_progress, selected_skills)
-        fig_win = tk.Toplevel(root)
-        fig_win.title("Greedy Unlock Curve")
-        canvas = FigureCanvasTkAgg(fig, master=fig_win)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-    Thread(target=run_chart, daemon=True).start()
-
-btn_greedy = ttk.Button(
-    charts_frame,
-    text="Greedy Unlock Curve",
-    command=start_greedy_chart,
-    width=25
-)
-btn_greedy.grid(row=0, column=2, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 1 ───────────────────────────────────────
-
-
-# Skill–Job Heatmap
-btn_heatmap = ttk.Button(
-    charts_frame,
-    text="Skill–Job Heatmap",
-    command=lambda: plot_skill_job_heatmap(job_skill_map),
-    width=25
-)
-btn_heatmap.grid(row=1, column=0, padx=5, pady=2, sticky="ew")
-
-# Skill Network Graph
-btn_network = ttk.Button(
-    charts_frame,
-    text="Skill Network Graph",
-    command=lambda: plot_skill_network(compute_skill_edges(load_job_skill_map()[0])),
-    width=25
-)
-btn_network.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
-
-# Skill Galaxy (3D Plot with toggle above)
-btn_galaxy = ttk.Button(
-    charts_frame,
-    text="Skill Galaxy (3D)",
-    command=lambda: Thread(target=lambda: plot_skill_galaxy(job_skill_map, show_edges=show_edges_var.get())).start(),
-    width=25
-)
-btn_galaxy.grid(row=1, column=2, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 2 ───────────────────────────────────────
-
-
-# Bar Chart
-btn_bar = ttk.Button(
-    charts_frame,
-    text="Bar Chart",
-    command=lambda: plot_top_skills_bar(job_skill_map, get_user_selected_skills()),
-    width=25
-)
-btn_bar.grid(row=2, column=0, padx=5, pady=2, sticky="ew")
-
-# Cumulative Line Chart
-btn_cumline = ttk.Button(
-    charts_frame,
-    text="Cumulative Line",
-    command=lambda: plot_cumulative_line(current_skills),
-    width=25
-)
-btn_cumline.grid(row=2, column=1, padx=5, pady=2, sticky="ew")
-
-# Stackplot
-btn_stack = ttk.Button(
-    charts_frame,
-    text="Stackplot",
-    command=lambda: plot_stackplot(current_skills),
-    width=25
-)
-btn_stack.grid(row=2, column=2, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 3 ───────────────────────────────────────
-
-
-# Subplot2Grid
-btn_subplot = ttk.Button(
-    charts_frame,
-    text="Subplot2Grid",
-    command=lambda: plot_subplot2grid(current_skills),
-    width=25
-)
-btn_subplot.grid(row=3, column=0, padx=5, pady=2, sticky="ew")
-
-# Pareto Chart
-btn_pareto = ttk.Button(
-    charts_frame,
-    text="Pareto Chart",
-    command=lambda: plot_pareto_chart(current_skills),
-    width=25
-)
-btn_pareto.grid(row=3, column=1, padx=5, pady=2, sticky="ew")
-
-# Salary Distribution
-btn_salary = ttk.Button(
-    charts_frame,
-    text="Salary Distribution",
-    command=lambda: plot_salary_distribution(),
-    width=25
-)
-btn_salary.grid(row=3, column=2, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 4 ───────────────────────────────────────
-
-
-# 3D Skill Clusters
-btn_clusters3d = ttk.Button(
-    charts_frame,
-    text="Skill Clusters (3D)",
-    command=lambda: Thread(target=lambda: plot_skill_clusters(job_skill_map)).start(),
-    width=25
-)
-btn_clusters3d.grid(row=4, column=0, padx=5, pady=2, sticky="ew")
-
-# 2D Skill Clusters (Radial)
-btn_clusters2d = ttk.Button(
-    charts_frame,
-    text="Skill Clusters (2D)",
-    command=lambda: Thread(target=lambda: plot_skill_clusters_radial(job_skill_map)).start(),
-    width=25
-)
-btn_clusters2d.grid(row=4, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
-
-btn_skill_gap = ttk.Button(
-    charts_frame,
-    text="Skill Gap Analysis",
-    command=lambda: Thread(
-        target=lambda: compute_and_plot_skill_gap(
+    # ─── Row 3 ───────────────────────────────────────
+
+
+    # Subplot2Grid
+    btn_subplot = ttk.Button(
+        charts_frame,
+        text="Subplot2Grid",
+        command=lambda: plot_subplot2grid(corpus, excluded_skills),
+        width=25
+    )
+    btn_subplot.grid(row=3, column=0, padx=5, pady=2, sticky="ew")
+
+    # Pareto Chart
+    btn_pareto = ttk.Button(
+        charts_frame,
+        text="Pareto Chart",
+        command=lambda: plot_pareto_chart(corpus, excluded_skills),
+        width=25
+    )
+    btn_pareto.grid(row=3, column=1, padx=5, pady=2, sticky="ew")
+
+    # Salary Distribution
+    btn_salary = ttk.Button(
+        charts_frame,
+        text="Salary Distribution",
+        command=lambda: scheduler.submit("Salary Distribution", plot_salary_distribution, corpus),
+        width=25
+    )
+    btn_salary.grid(row=3, column=2, padx=5, pady=2, sticky="ew")
+
+
+    # ─── Row 4 ───────────────────────────────────────
+
+
+    # 3D Skill Clusters
+    btn_clusters3d = ttk.Button(
+        charts_frame,
+        text="Skill Clusters (3D)",
+        command=lambda: scheduler.submit("Skill Clusters (3D)", plot_skill_clusters, corpus),
+        width=25
+    )
+    btn_clusters3d.grid(row=4, column=0, padx=5, pady=2, sticky="ew")
+
+    # 2D Skill Clusters (Radial)
+    btn_clusters2d = ttk.Button(
+        charts_frame,
+        text="Skill Clusters (2D)",
+        command=lambda: scheduler.submit("Skill Clusters (2D)", plot_skill_clusters_radial, corpus),
+        width=25
+    )
+    btn_clusters2d.grid(row=4, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
+
+    btn_skill_gap = ttk.Button(
+        charts_frame,
+        text="Skill Gap Analysis",
+        command=lambda: scheduler.submit(
+            "Skill Gap Analysis",
+            compute_and_plot_skill_gap,
+            corpus,
             get_user_selected_skills(),
-            job_skill_map,
-            job_info_map,
             max_missing=3,
             top_n=10
-        )
-    ).start(),
-    width=25
-)
-# Place it below Salary Distribution (row=7, col=0)
-btn_skill_gap.grid(row=4, column=2, padx=5, pady=2, sticky="ew")
-
-
-
-# ─── Row 5 ───────────────────────────────────────
-
-
-# ─── Word Cloud of Job Titles
-btn_word_cloud = ttk.Button(
-    charts_frame,
-    text="Word Cloud: Job Titles",
-    command=lambda: Thread(target=lambda: run_word_clouds("preview_jobs.db")).start(),
-    width=25
-)
-# Place it below Skill Gap Analysis (adjust row/column as needed)
-btn_word_cloud.grid(row=5, column=0, padx=5, pady=2, sticky="ew")
-
-# ─── Remote vs. On-Site Pie Chart ─────────────────────────────────────────
-btn_remote_onsite = ttk.Button(
-    charts_frame,
-    text="Remote vs. On-Site",
-    command=lambda: Thread(
-        target=lambda: plot_remote_vs_onsite("preview_jobs.db")
-    ).start(),
-    width=25
-)
-# Adjust row/column to place it where you like; e.g., row=7, column=1:
-btn_remote_onsite.grid(row=5, column=1, padx=5, pady=2, sticky="ew")
-
-from charts.plot_certification_distribution import plot_certification_distribution
-# ─── Certification Distribution Chart ─────────────────────────────────────
-btn_cert_dist = ttk.Button(
-    charts_frame,
-    text="Certifications Distribution",
-    command=lambda: Thread(
-        target=lambda: plot_certification_distribution("preview_jobs.db"),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place it at row=15, spanning both columns:
-btn_cert_dist.grid(row=5, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 6 ───────────────────────────────────────
-
-
-from charts.plot_certification_salary_impact import plot_certification_salary_impact
-# ─── Certification Salary Impact Chart ────────────────────────────────────
-btn_cert_salary_imp = ttk.Button(
-    charts_frame,
-    text="Cert Salary Impact",
-    command=lambda: Thread(
-        target=lambda: plot_certification_salary_impact("preview_jobs.db"),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place at row=9, spanning one column
-btn_cert_salary_imp.grid(row=6, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-
-
-# ─── Show Top Companies (uses GUI‐selected skills) ─────────────────────────
-from charts.plot_top_companies_by_skill import plot_top_companies_by_skill
+        ),
+        width=25
+    )
+    # Place it below Salary Distribution (row=7, col=0)
+    btn_skill_gap.grid(row=4, column=2, padx=5, pady=2, sticky="ew")
+
+
+
+    # ─── Row 5 ───────────────────────────────────────
 
-btn_top_companies = ttk.Button(
-    charts_frame,
-    text="Show Top Companies",
-    command=lambda: Thread(
-        target=lambda: plot_top_companies_by_skill(
-            get_user_selected_skills(),   # pass the list of checked skills
-            "preview_jobs.db"
+
+    # ─── Word Cloud of Job Titles
+    btn_word_cloud = ttk.Button(
+        charts_frame,
+        text="Word Cloud: Job Titles",
+        command=lambda: scheduler.submit("Word Cloud: Job Titles", run_word_clouds, corpus),
+        width=25
+    )
+    # Place it below Skill Gap Analysis (adjust row/column as needed)
+    btn_word_cloud.grid(row=5, column=0, padx=5, pady=2, sticky="ew")
+
+    # ─── Remote vs. On-Site Pie Chart ─────────────────────────────────────────
+    btn_remote_onsite = ttk.Button(
+        charts_frame,
+        text="Remote vs. On-Site",
+        command=lambda: scheduler.submit("Remote vs. On-Site", plot_remote_vs_onsite, corpus),
+        width=25
+    )
+    # Adjust row/column to place it where you like; e.g., row=7, column=1:
+    btn_remote_onsite.grid(row=5, column=1, padx=5, pady=2, sticky="ew")
+
+    from charts.plot_certification_distribution import plot_certification_distribution
+    # ─── Certification Distribution Chart ─────────────────────────────────────
+    btn_cert_dist = ttk.Button(
+        charts_frame,
+        text="Certifications Distribution",
+        command=lambda: scheduler.submit("Certifications Distribution", plot_certification_distribution, corpus),
+        width=25
+    )
+    # Place it at row=15, spanning both columns:
+    btn_cert_dist.grid(row=5, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+    # ─── Row 6 ───────────────────────────────────────
+
+
+    from charts.plot_certification_salary_impact import plot_certification_salary_impact
+    # ─── Certification Salary Impact Chart ────────────────────────────────────
+    btn_cert_salary_imp = ttk.Button(
+        charts_frame,
+        text="Cert Salary Impact",
+        command=lambda: scheduler.submit("Cert Salary Impact", plot_certification_salary_impact, corpus),
+        width=25
+    )
+    # Place at row=9, spanning one column
+    btn_cert_salary_imp.grid(row=6, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+
+
+    # ─── Show Top Companies (uses GUI‐selected skills) ─────────────────────────
+    from charts.plot_top_companies_by_skill import plot_top_companies_by_skill
+
+    btn_top_companies = ttk.Button(
+        charts_frame,
+        text="Show Top Companies",
+        command=lambda: scheduler.submit(
+            "Show Top Companies",
+            plot_top_companies_by_skill,
+            corpus,
+            get_user_selected_skills()    # pass the list of checked skills
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place it on the next free row, e.g. row=8, spanning both columns:
-btn_top_companies.grid(row=6, column=1, columnspan=1, padx=5, pady=(5,10), sticky="ew")
-
-
-from charts.plot_certification_cooccurrence_network import plot_certification_cooccurrence_network
-# ─── Certification Co-Occurrence Network ──────────────────────────────────
-btn_cert_coocc = ttk.Button(
-    charts_frame,
-    text="Cert Co-Occurrence",
-    command=lambda: Thread(
-        target=lambda: plot_certification_cooccurrence_network(
-            "preview_jobs.db",
+        width=25
+    )
+    # Place it on the next free row, e.g. row=8, spanning both columns:
+    btn_top_companies.grid(row=6, column=1, columnspan=1, padx=5, pady=(5,10), sticky="ew")
+
+
+    from charts.plot_certification_cooccurrence_network import plot_certification_cooccurrence_network
+    # ─── Certification Co-Occurrence Network ──────────────────────────────────
+    btn_cert_coocc = ttk.Button(
+        charts_frame,
+        text="Cert Co-Occurrence",
+        command=lambda: scheduler.submit(
+            "Cert Co-Occurrence",
+            plot_certification_cooccurrence_network,
+            corpus,
             min_pair_count=5,
             min_node_freq=5,
             spring_k=0.5,
             spring_iterations=50
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place it at row=18, spanning both columns
-btn_cert_coocc.grid(row=6, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-
-# ─── Row 7 ───────────────────────────────────────
-
-
-
-# ─── Skill–Salary Correlation Chart ─────────────────────────────────────────
-btn_skill_salary_corr = ttk.Button(
-    charts_frame,
-    text="Skill–Salary Correlation",
-    command=lambda: Thread(
-        target=lambda: plot_skill_salary_correlation("preview_jobs.db"),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Put it at row=11, column=0 (adjust if needed)
-
-btn_skill_salary_corr.grid(row=7, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
-from charts.plot_skill_gap_similarity_matrix import plot_skill_gap_similarity_matrix
-# ─── Skill‐Gap Similarity Matrix ────────────────────────────────────────────
-btn_skill_gap_sim = ttk.Button(
-    charts_frame,
-    text="Missing‐Skill Similarity",
-    command=lambda: Thread(
-        target=lambda: plot_skill_gap_similarity_matrix(
-            get_user_selected_skills(),   # pass the GUI‐selected skills
-            "preview_jobs.db"
+        width=25
+    )
+    # Place it at row=18, spanning both columns
+    btn_cert_coocc.grid(row=6, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+
+    # ─── Row 7 ───────────────────────────────────────
+
+
+
+    # ─── Skill–Salary Correlation Chart ─────────────────────────────────────────
+    btn_skill_salary_corr = ttk.Button(
+        charts_frame,
+        text="Skill–Salary Correlation",
+        command=lambda: scheduler.submit("Skill–Salary Correlation", plot_skill_salary_correlation, corpus),
+        width=25
+    )
+    # Put it at row=11, column=0 (adjust if needed)
+
+    btn_skill_salary_corr.grid(row=7, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
+    from charts.plot_skill_gap_similarity_matrix import plot_skill_gap_similarity_matrix
+    # ─── Skill‐Gap Similarity Matrix ────────────────────────────────────────────
+    btn_skill_gap_sim = ttk.Button(
+        charts_frame,
+        text="Missing‐Skill Similarity",
+        command=lambda: scheduler.submit(
+            "Missing‐Skill Similarity",
+            plot_skill_gap_similarity_matrix,
+            corpus,
+            get_user_selected_skills()    # pass the GUI‐selected skills
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-btn_skill_gap_sim.grid(row=7, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
-
-from charts.plot_company_skill_focus import plot_company_skill_focus
-# ─── Company Skill Focus Chart ─────────────────────────────────────────────
-btn_company_focus = ttk.Button(
-    charts_frame,
-    text="Company Skill Focus",
-    command=lambda: Thread(
-        target=lambda: plot_company_skill_focus(
+        width=25
+    )
+    btn_skill_gap_sim.grid(row=7, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
+
+    from charts.plot_company_skill_focus import plot_company_skill_focus
+    # ─── Company Skill Focus Chart ─────────────────────────────────────────────
+    btn_company_focus = ttk.Button(
+        charts_frame,
+        text="Company Skill Focus",
+        command=lambda: scheduler.submit(
+            "Company Skill Focus",
+            plot_company_skill_focus,
+            corpus,
             get_user_selected_skills(),   # pass GUI‐selected skills
-            "preview_jobs.db", 
-            top_n_companies=5, 
+            top_n_companies=5,
             top_n_skills=10
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place it at an unused row, e.g., row=13, column=0 (adjust as needed)
-btn_company_focus.grid(row=7, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-# ─── Row 8 ───────────────────────────────────────
-
-
-from charts.plot_title_salary_bubble_chart import plot_title_salary_bubble_chart
-# ─── Title‐Salary Bubble Chart ───────────────────────────────────────────────
-btn_title_salary = ttk.Button(
-    charts_frame,
-    text="Title‐Salary Bubble",
-    command=lambda: Thread(
-        target=lambda: plot_title_salary_bubble_chart("preview_jobs.db"),
-        daemon=True
-    ).start(),
-    width=25
-)
-# Place it at an unused row, e.g., row=14, column=0 (adjust as needed)
-btn_title_salary.grid(row=8, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
-
-from charts.plot_skill_similarity_tSNE import plot_skill_similarity_tSNE
-# ─── Skill‐Similarity t-SNE ─────────────────────────────────────────────────
-btn_skill_tsne = ttk.Button(
-    charts_frame,
-    text="Skill t-SNE",
-    command=lambda: Thread(
-        target=lambda: plot_skill_similarity_tSNE(
-            "preview_jobs.db",
+        width=25
+    )
+    # Place it at an unused row, e.g., row=13, column=0 (adjust as needed)
+    btn_company_focus.grid(row=7, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+    # ─── Row 8 ───────────────────────────────────────
+
+
+    from charts.plot_title_salary_bubble_chart import plot_title_salary_bubble_chart
+    # ─── Title‐Salary Bubble Chart ───────────────────────────────────────────────
+    btn_title_salary = ttk.Button(
+        charts_frame,
+        text="Title‐Salary Bubble",
+        command=lambda: scheduler.submit("Title‐Salary Bubble", plot_title_salary_bubble_chart, corpus),
+        width=25
+    )
+    # Place it at an unused row, e.g., row=14, column=0 (adjust as needed)
+    btn_title_salary.grid(row=8, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
+
+    from charts.plot_skill_similarity_tSNE import plot_skill_similarity_tSNE
+    # ─── Skill‐Similarity t-SNE ─────────────────────────────────────────────────
+    btn_skill_tsne = ttk.Button(
+        charts_frame,
+        text="Skill t-SNE",
+        command=lambda: scheduler.submit(
+            "Skill t-SNE",
+            plot_skill_similarity_tSNE,
+            corpus,
             perplexity=30,
             max_iter=500
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-btn_skill_tsne.grid(row=8, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-from charts.plot_company_skill_cluster_sankey import plot_company_skill_cluster_sankey
-# ─── Company → Skill‐Cluster Sankey ──────────────────────────────────────
-btn_company_skill_sankey = ttk.Button(
-    charts_frame,
-    text="Company ↔ Skill Clusters",
-    command=lambda: Thread(
-        target=lambda: plot_company_skill_cluster_sankey(
-            "preview_jobs.db",
+        width=25
+    )
+    btn_skill_tsne.grid(row=8, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+    from charts.plot_company_skill_cluster_sankey import plot_company_skill_cluster_sankey
+    # ─── Company → Skill‐Cluster Sankey ──────────────────────────────────────
+    btn_company_skill_sankey = ttk.Button(
+        charts_frame,
+        text="Company ↔ Skill Clusters",
+        command=lambda: scheduler.submit(
+            "Company ↔ Skill Clusters",
+            plot_company_skill_cluster_sankey,
+            corpus,
             n_skill_clusters=10,
             min_jobs_per_company=5,
             top_skills_per_cluster=5
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-btn_company_skill_sankey.grid(row=8, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
+        width=25
+    )
+    btn_company_skill_sankey.grid(row=8, column=2, columnspan=1, padx=5, pady=2, sticky="ew")
 
 
-# ─── Row 9 ───────────────────────────────────────
+    # ─── Row 9 ───────────────────────────────────────
 
 
 
-from charts.plot_certification_presence_by_skill_cluster import (
-    plot_certification_presence_by_skill_cluster
-)
-# ─── Certification Presence by Skill Cluster ──────────────────────────────
-btn_cert_by_cluster = ttk.Button(
-    charts_frame,
-    text="Certs by Skill Cluster",
-    command=lambda: Thread(
-        target=lambda: plot_certification_presence_by_skill_cluster(
-            "preview_jobs.db",
+    from charts.plot_certification_presence_by_skill_cluster import (
+        plot_certification_presence_by_skill_cluster
+    )
+    # ─── Certification Presence by Skill Cluster ──────────────────────────────
+    btn_cert_by_cluster = ttk.Button(
+        charts_frame,
+        text="Certs by Skill Cluster",
+        command=lambda: scheduler.submit(
+            "Certs by Skill Cluster",
+            plot_certification_presence_by_skill_cluster,
+            corpus,
             min_edge_weight=3,       # keep skill‐edges with co‐occurrence ≥ 3
             min_skill_degree=1,      # include skills appearing at least once
             top_n_certs_per_cluster=10
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-btn_cert_by_cluster.grid(row=9, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-from charts.plot_required_optional_skill_breakdown import plot_required_optional_skill_breakdown
-# ─── Required vs Optional Skill Breakdown ───────────────────────────────────
-btn_req_opt_skills = ttk.Button(
-    charts_frame,
-    text="Required vs Optional Skills",
-    command=lambda: Thread(
-        target=lambda: plot_required_optional_skill_breakdown(
-            "preview_jobs.db", get_user_selected_skills()
+        width=25
+    )
+    btn_cert_by_cluster.grid(row=9, column=0, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+    from charts.plot_required_optional_skill_breakdown import plot_required_optional_skill_breakdown
+    # ─── Required vs Optional Skill Breakdown ───────────────────────────────────
+    btn_req_opt_skills = ttk.Button(
+        charts_frame,
+        text="Required vs Optional Skills",
+        command=lambda: scheduler.submit(
+            "Required vs Optional Skills",
+            plot_required_optional_skill_breakdown,
+            corpus, get_user_selected_skills()
         ),
-        daemon=True
-    ).start(),
-    width=25
-)
-btn_req_opt_skills.grid(row=9, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
-
-
-
-# ─── Job Matches Frame (scrollable) ────────────────────────────────────────
-matches_frame = ttk.LabelFrame(right_container, text="Job Matches", padding=(5,5))
-matches_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=(5,5))
-
-right_container.grid_rowconfigure(2, weight=1)
-
-canvas_matches = tk.Canvas(matches_frame, background="#f0f0f0")
-scrollbar_matches = ttk.Scrollbar(matches_frame, orient="vertical", command=canvas_matches.yview)
-scrollable_frame = ttk.Frame(canvas_matches)
-
-scrollable_frame.bind(
-    "<Configure>",
-    lambda e: canvas_matches.configure(scrollregion=canvas_matches.bbox("all"))
-)
-
-canvas_matches.create_window((0, 0), window=scrollable_frame, anchor="nw")
-canvas_matches.configure(yscrollcommand=scrollbar_matches.set)
-
-canvas_matches.pack(side="left", fill="both", expand=True)
-scrollbar_matches.pack(side="right", fill="y")
-
-# Mousewheel scrolling for matches
-bind_mousewheel(canvas_matches, canvas_matches)
-
-
-# ──────────────────────────────────────────────────────────────────────────────
-# Final setup
-print("GUI loaded successfully. Ready.")
-root.mainloop()
+        width=25
+    )
+    btn_req_opt_skills.grid(row=9, column=1, columnspan=1, padx=5, pady=2, sticky="ew")
+
+
+
+    # ─── Job Matches Frame (virtualized list) ──────────────────────────────────
+    matches_frame = ttk.LabelFrame(right_container, text="Job Matches", padding=(5,5))
+    matches_frame.grid(row=2, column=0, sticky="nsew", padx=5, pady=(5,5))
+
+    right_container.grid_rowconfigure(2, weight=1)
+
+    job_list = VirtualTreeview(matches_frame, columns=[
+        ("status", "Match", 80),
+        ("title", "Title", 260),
+        ("company", "Company", 160),
+        ("missing", "Missing skills", 240),
+    ])
+    job_list.pack(fill="both", expand=True)
+
+
+    # ─── Status Bar (background chart tasks) ────────────────────────────────────
+    task_bar = ttk.Frame(root, padding=(5,0))
+    task_bar.grid(row=3, column=0, columnspan=2, sticky="ew", padx=5, pady=(0,5))
+    task_bar.grid_columnconfigure(0, weight=1)
+
+    task_label = ttk.Label(task_bar, text="Idle")
+    task_label.grid(row=0, column=0, sticky="w")
+    task_progress = ttk.Progressbar(task_bar, mode="determinate", maximum=100, length=200)
+    task_progress.grid(row=0, column=1, padx=5)
+    btn_cancel_tasks = ttk.Button(task_bar, text="Cancel", command=lambda: scheduler.cancel())
+    btn_cancel_tasks.grid(row=0, column=2)
+    btn_cancel_tasks.state(["disabled"])
+
+    def show_tasks(tasks):
+        # Runs on the Tk thread after every queue/progress change
+        running = [t for t in tasks if t.state == "running"]
+        cancelling = [t for t in tasks if t.state == "cancelling"]
+        queued = len(tasks) - len(running) - len(cancelling)
+        if not tasks:
+            task_label.config(text="Idle")
+            task_progress.stop()
+            task_progress.configure(mode="determinate", value=0)
+            btn_cancel_tasks.state(["disabled"])
+            return
+        text = "Running: " + (", ".join(t.label for t in running) or "…")
+        if queued:
+            text += f" (+{queued} queued)"
+        if cancelling:
+            text += " — cancelling: " + ", ".join(t.label for t in cancelling)
+        task_label.config(text=text)
+        percent = next((t.progress for t in running if t.progress is not None), None)
+        if percent is None:
+            if str(task_progress.cget("mode")) != "indeterminate":
+                task_progress.configure(mode="indeterminate")
+                task_progress.start(20)
+        else:
+            task_progress.stop()
+            task_progress.configure(mode="determinate", value=percent)
+        btn_cancel_tasks.state(["!disabled"])
+
+    def show_task_error(task, error):
+        status_label.config(text=f"❌ {task.label} failed: {error}")
+
+    scheduler = TaskScheduler(
+        post=lambda fn: root.after(0, fn),
+        on_change=show_tasks,
+        on_error=show_task_error,
+    )
+    # CPU-bound chart steps (t-SNE, KMeans, Louvain, layouts) run in worker processes
+    compute_pool.enable()
+
+
+    # ──────────────────────────────────────────────────────────────────────────────
+    # Background data loading
+    def set_controls_enabled(enabled):
+        """Enable/disable every action and chart control (they all need the corpus)."""
+        state = ["!disabled"] if enabled else ["disabled"]
+        for frame in (actions_frame, charts_frame):
+            for widget in frame.winfo_children():
+                if isinstance(widget, (ttk.Button, ttk.Checkbutton, ttk.Entry)):
+                    widget.state(state)
+
+    def on_corpus_loaded(loaded_corpus, loaded_skills, loaded_index):
+        # Runs on the Tk thread: swap the new data in all at once
+        global corpus
+        corpus = loaded_corpus
+        set_skill_list(loaded_skills, loaded_index)
+        load_progress.grid_remove()
+        status_label.config(text="Selected: None")
+        set_controls_enabled(True)
+        print("Job data loaded. Ready.")
+
+    def refresh_job_data(current):
+        # Worker side: a new corpus (copy + delta) and skill list; `current` and
+        # the tasks still reading it are left alone
+        updated, changed = current.refreshed()
+        skills = updated.unique_skills() if changed else None
+        index = SkillSearchIndex([skill for skill, _ in skills]) if changed else None
+        return current, updated, changed, skills, index
+
+    def on_corpus_refreshed(base, updated, changed, skills, index):
+        # Runs on the Tk thread: swap the refreshed corpus in with one assignment
+        global corpus
+        if corpus is not base:
+            return  # stale: built from a corpus that has been replaced since
+        corpus = updated
+        if changed:
+            set_skill_list(skills, index)
+            if rerun_job_search:
+                rerun_job_search()  # the listed matches were computed before the new postings
+        status_label.config(text=f"Refreshed: {changed} new or updated job(s).")
+
+    def refresh_corpus():
+        # Clicking again while a refresh of the same corpus runs is coalesced into it
+        status_label.config(text="Checking for new postings…")
+        scheduler.submit("Refresh Data", refresh_job_data, corpus,
+                         on_done=lambda result: on_corpus_refreshed(*result))
+
+    def load_corpus_in_background():
+        set_controls_enabled(False)
+        status_label.config(text="Loading job data…")
+
+        def report(percent):
+            root.after(0, lambda: load_progress.configure(value=percent))
+
+        def work():
+            try:
+                loaded_corpus = load_corpus(progress_callback=report)
+                loaded_skills = loaded_corpus.unique_skills()
+                loaded_index = SkillSearchIndex([skill for skill, _ in loaded_skills])
+            except Exception as e:
+                message = f"❌ Failed to load job data: {e}"
+                root.after(0, lambda: status_label.config(text=message))
+                return
+            root.after(0, lambda: on_corpus_loaded(loaded_corpus, loaded_skills, loaded_index))
+
+        Thread(target=work, daemon=True).start()
+
+
+    # ──────────────────────────────────────────────────────────────────────────────
+    # Final setup
+    load_corpus_in_background()
+    print("GUI loaded successfully. Loading job data…")
+    root.mainloop()
+    scheduler.shutdown()  # drop queued chart tasks once the window is closed
+    compute_pool.shutdown()
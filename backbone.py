@@ -0,0 +1,100 @@
+# backbone.py
+
+"""
+Backbone extraction: which co-occurrence edges are worth drawing.
+
+A global weight threshold keeps far too many edges around hub skills and
+drops every edge of niche ones. Both rules below judge each edge against its
+own endpoints instead, vectorized over the (a_ids, b_ids, weights) pair
+arrays of the sparse co-occurrence matrix:
+
+• disparity filter (Serrano et al. 2009): an edge is significant for node i
+  when its share p = w / strength(i) is unlikely under a uniform split of
+  i's strength over its k edges: α = (1 − p)^(k − 1). An edge's α is the
+  smaller of its two endpoints' (it survives if either endpoint cares).
+• top-K: an edge's rank is its position in the heavier-first edge list of
+  whichever endpoint ranks it higher; rank < K keeps every node's K
+  heaviest edges.
+
+backbone_mask() applies a threshold (alpha / k) and/or an edge budget
+(max_edges). Under a budget every node's heaviest edge goes first, so no
+node drops out of the graph unless the budget is smaller than the number of
+nodes; the remaining budget is filled by significance.
+"""
+
+import numpy as np
+
+METHODS = ("disparity", "topk")
+DEFAULT_EDGE_BUDGET = 20_000      # edges the network charts draw at most
+
+
+def _endpoint_arrays(a_ids, b_ids, weights):
+    """Every edge listed once per endpoint: (node, weight, edge index)."""
+    m = len(weights)
+    return (
+        np.concatenate([a_ids, b_ids]).astype(np.int64),
+        np.concatenate([weights, weights]).astype(float),
+        np.tile(np.arange(m), 2),
+    )
+
+
+def endpoint_ranks(a_ids, b_ids, weights):
+    """Per edge: its best (smallest) 0-based rank among its endpoints' edges, heaviest first."""
+    m = len(weights)
+    node, weight, edge = _endpoint_arrays(a_ids, b_ids, weights)
+    order = np.lexsort((edge, -weight, node))
+    sorted_node = node[order]
+    group_start = np.searchsorted(sorted_node, sorted_node, side="left")
+    rank = np.empty(2 * m, dtype=np.int64)
+    rank[order] = np.arange(2 * m) - group_start
+    return np.minimum(rank[:m], rank[m:])
+
+
+def disparity_alpha(a_ids, b_ids, weights, n_nodes=None):
+    """Per edge: disparity-filter α (smaller = more significant), the minimum over both endpoints."""
+    node, weight, _ = _endpoint_arrays(a_ids, b_ids, weights)
+    n_nodes = n_nodes or (int(node.max()) + 1 if len(node) else 0)
+    strength = np.bincount(node, weights=weight, minlength=n_nodes)
+    degree = np.bincount(node, minlength=n_nodes)
+
+    def alpha_at(ends):
+        k = degree[ends]
+        p = np.asarray(weights, dtype=float) / strength[ends]
+        # A node with a single edge gives no evidence either way (α = 1)
+        return np.where(k > 1, (1.0 - p) ** np.maximum(k - 1, 0), 1.0)
+
+    return np.minimum(alpha_at(np.asarray(a_ids)), alpha_at(np.asarray(b_ids)))
+
+
+def backbone_mask(a_ids, b_ids, weights, method="disparity", max_edges=None, alpha=None, k=None):
+    """
+    Boolean mask of the backbone edges. method="disparity" keeps edges with
+    α < alpha, method="topk" edges with rank < k (no threshold if None);
+    max_edges then caps the count, keeping each node's heaviest edge first
+    and the most significant (disparity) / best-ranked (topk) ones after
+    that, heavier edges winning ties.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    weights = np.asarray(weights)
+    m = len(weights)
+    keep = np.ones(m, dtype=bool)
+    if not m or (max_edges is None and alpha is None and k is None):
+        return keep
+
+    rank = endpoint_ranks(a_ids, b_ids, weights)
+    if method == "disparity":
+        score = disparity_alpha(a_ids, b_ids, weights)
+        if alpha is not None:
+            keep &= score < alpha
+    else:
+        score = rank.astype(float)
+        if k is not None:
+            keep &= rank < k
+
+    if max_edges is not None and keep.sum() > max_edges:
+        candidates = np.flatnonzero(keep)
+        order = np.lexsort((-weights[candidates], score[candidates], rank[candidates] > 0))
+        keep[:] = False
+        keep[candidates[order[:max(max_edges, 0)]]] = True
+    return keep
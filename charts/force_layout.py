@@ -0,0 +1,213 @@
+# charts/force_layout.py
+
+"""
+Multilevel Fruchterman–Reingold layout that scales to 10k+ node graphs.
+
+1) Coarsen: repeatedly collapse heavy-edge matchings (each coarse node
+   carries the number of original nodes as its mass) until the graph has
+   ≤ COARSEST_NODES nodes or stops shrinking.
+2) Lay out the coarsest graph from random positions with the full number of
+   iterations.
+3) Prolong: every node starts at its coarse node's position (plus a little
+   jitter) and a shorter, cooler refinement runs on each finer level.
+
+Forces are numpy-vectorized. Attraction runs over the edge list. Repulsion
+is exact for graphs up to EXACT_MAX_NODES; above that it is exact only for
+each node's NEAR_NEIGHBORS nearest nodes (found with a k-d tree) and
+approximated for distant nodes by the centroids of a coarse grid of cells
+(a one-level Barnes–Hut). A weak pull
+toward the centroid keeps disconnected pieces in view. Works in 2D and 3D;
+returns positions scaled into [-1, 1] like nx.spring_layout.
+"""
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+COARSEST_NODES = 50
+MIN_SHRINK = 0.85            # stop coarsening when a level keeps > 85 % of the nodes
+EXACT_MAX_NODES = 1000       # all-pairs repulsion up to this size
+NEAR_NEIGHBORS = 24          # exact repulsion partners per node above it
+NODE_BLOCK = 2048            # nodes per far-field block (bounds memory)
+MIN_DIST2 = 1e-8
+GRAVITY = 0.3                # centroid pull at the layout's radius, relative to the total repulsion there
+REFINE_MIN_ITERATIONS = 10  # per finer level (iterations // 4 if larger)
+
+
+# ─── Forces ──────────────────────────────────────────────────────────────────
+def _accumulate(disp, idx, values):
+    for c in range(disp.shape[1]):
+        disp[:, c] += np.bincount(idx, weights=values[:, c], minlength=disp.shape[0])
+
+
+def _sq_dist(A, B):
+    """Pairwise squared distances (n_a × n_b) without an n_a × n_b × dim temporary."""
+    return np.maximum((A * A).sum(axis=1)[:, None] + (B * B).sum(axis=1)[None, :] - 2 * A @ B.T, 0.0)
+
+
+def _pull(A, B, F):
+    """Σ_j F[i, j] · (A[i] − B[j]) for every row i."""
+    return A * F.sum(axis=1)[:, None] - F @ B
+
+
+def _exact_repulsion(X, mass, k):
+    F = k * k * mass[None, :] / np.maximum(_sq_dist(X, X), MIN_DIST2)
+    np.fill_diagonal(F, 0.0)
+    return _pull(X, X, F)
+
+
+def _approx_repulsion(X, mass, k):
+    n, dim = X.shape
+    disp = np.zeros_like(X)
+
+    # Near field: exact over each node's NEAR_NEIGHBORS nearest nodes
+    dist, nbrs = cKDTree(X).query(X, k=min(NEAR_NEIGHBORS + 1, n))
+    dist, nbrs = dist[:, 1:], nbrs[:, 1:]
+    rows = np.repeat(np.arange(n), nbrs.shape[1])
+    delta = X[rows] - X[nbrs.ravel()]
+    f = (k * k * mass[nbrs.ravel()] / np.maximum(dist.ravel() ** 2, MIN_DIST2))[:, None]
+    _accumulate(disp, rows, delta * f)
+
+    # Far field: cell centroids, only for cells entirely outside a node's near ball
+    cells_per_axis = max(2, int(round(n ** (0.5 / dim))))
+    # Grid over the central 98 % so a few far-flung nodes can't squeeze
+    # everything else into one cell; outliers land in the border cells
+    lo, hi = np.percentile(X, [1, 99], axis=0)
+    size = np.maximum((hi - lo) / cells_per_axis, 1e-12)
+    coords = np.clip(np.floor((X - lo) / size), 0, cells_per_axis - 1).astype(np.int64)
+    cell = np.ravel_multi_index(coords.T, (cells_per_axis,) * dim)
+    _, cell = np.unique(cell, return_inverse=True)
+    cell_mass = np.bincount(cell, weights=mass)
+    centroid = np.stack([np.bincount(cell, weights=mass * X[:, c]) for c in range(dim)], axis=1) / cell_mass[:, None]
+    cutoff2 = ((dist[:, -1] + 0.5 * np.linalg.norm(size)) ** 2)[:, None]
+    for lo_row in range(0, n, NODE_BLOCK):
+        block = slice(lo_row, lo_row + NODE_BLOCK)
+        d2 = _sq_dist(X[block], centroid)
+        F = np.where(d2 > cutoff2[block], k * k * cell_mass[None, :] / np.maximum(d2, MIN_DIST2), 0.0)
+        disp[block] += _pull(X[block], centroid, F)
+    return disp
+
+
+def _run(X, edges, mass, k, iterations, temperature):
+    """Fruchterman–Reingold iterations with linear cooling; X is updated in place."""
+    u, v, w = edges
+    dt = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if len(X) <= EXACT_MAX_NODES:
+            disp = _exact_repulsion(X, mass, k)
+        else:
+            disp = _approx_repulsion(X, mass, k)
+        if len(u):
+            delta = X[u] - X[v]
+            f = (w * np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+            _accumulate(disp, u, -delta * f)
+            _accumulate(disp, v, delta * f)
+        # Gravity keeps small components and isolated nodes from drifting off:
+        # a linear pull scaled to the current radius R, so a lone node settles
+        # at about R / sqrt(GRAVITY) whatever the layout's size
+        offset = X - np.average(X, axis=0, weights=mass)
+        radius2 = max(np.percentile((offset ** 2).sum(axis=1), 90), MIN_DIST2)
+        disp -= (GRAVITY * k * k * mass.sum() / radius2) * offset
+        length = np.maximum(np.sqrt((disp ** 2).sum(axis=1)), 1e-12)
+        X += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= dt
+    return X
+
+
+# ─── Multilevel ──────────────────────────────────────────────────────────────
+def _edge_arrays(A):
+    upper = sparse.triu(A, k=1).tocoo()
+    return upper.row, upper.col, upper.data.astype(float)
+
+
+def _heavy_edge_matching(A, mass):
+    """Coarse node ID of every node (each pair joined along its heaviest free edge)."""
+    n = A.shape[0]
+    match = np.full(n, -1, dtype=np.int64)
+    degree = np.diff(A.indptr)
+    for u in np.argsort(degree, kind="stable"):
+        if match[u] >= 0:
+            continue
+        lo, hi = A.indptr[u], A.indptr[u + 1]
+        nbrs, weights = A.indices[lo:hi], A.data[lo:hi]
+        free = (match[nbrs] < 0) & (nbrs != u)
+        if free.any():
+            # Prefer heavy edges between light nodes so coarse masses stay balanced
+            score = weights[free] / (mass[u] * mass[nbrs[free]])
+            v = nbrs[free][np.argmax(score)]
+            match[u], match[v] = v, u
+        else:
+            match[u] = u
+    parent = np.full(n, -1, dtype=np.int64)
+    next_id = 0
+    for u in range(n):
+        if parent[u] < 0:
+            parent[u] = parent[match[u]] = next_id
+            next_id += 1
+    return parent, next_id
+
+
+def _coarsen(A, mass):
+    """[(A, mass, parent-of-previous-level), …] from finest to coarsest."""
+    levels = [(A, mass, None)]
+    while A.shape[0] > COARSEST_NODES:
+        parent, n_coarse = _heavy_edge_matching(A, mass)
+        if n_coarse > MIN_SHRINK * A.shape[0]:
+            break
+        P = sparse.csr_matrix((np.ones(len(parent)), (np.arange(len(parent)), parent)), shape=(len(parent), n_coarse))
+        A = (P.T @ A @ P).tocsr()
+        A.setdiag(0)
+        A.eliminate_zeros()
+        mass = np.bincount(parent, weights=mass, minlength=n_coarse)
+        levels.append((A, mass, parent))
+    return levels
+
+
+def _rescale(X):
+    X = X - X.mean(axis=0)
+    extent = np.abs(X).max()
+    return X / extent if extent > 0 else X
+
+
+def force_layout(G, dim=2, k=None, pos=None, iterations=50, weight="weight", seed=42):
+    """
+    Drop-in for nx.spring_layout(G, dim=dim, k=k, pos=pos,
+    iterations=iterations, weight=weight, seed=seed). With `pos` (a
+    {node: position} warm start) the multilevel phase is skipped and only a
+    single-level refinement runs. Returns {node: np.array position}.
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: np.zeros(dim)}
+    rng = np.random.default_rng(seed)
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format="csr").astype(float)
+    A = sparse.csr_matrix(A + A.T) / 2  # symmetric even for directed input
+    A.setdiag(0)
+    A.eliminate_zeros()
+    k_fine = k if k is not None else 1.0 / np.sqrt(n)
+
+    if pos is not None:
+        X = np.array([pos[v] if v in pos else rng.random(dim) for v in nodes], dtype=float)
+        span = np.ptp(X, axis=0).max() or 1.0
+        X = _run(X, _edge_arrays(A), np.ones(n), k_fine, iterations, 0.1 * span)
+        return dict(zip(nodes, _rescale(X)))
+
+    levels = _coarsen(A, np.ones(n))
+    X = None
+    for depth in range(len(levels) - 1, -1, -1):
+        A_level, mass, _ = levels[depth]
+        n_level = A_level.shape[0]
+        k_level = k_fine * np.sqrt(n / n_level)
+        if X is None:
+            X = rng.random((n_level, dim))
+            X = _run(X, _edge_arrays(A_level), mass, k_level, iterations, 0.1)
+        else:
+            parent = levels[depth + 1][2]
+            X = X[parent] + rng.normal(scale=0.1 * k_level, size=(n_level, dim))
+            span = np.ptp(X, axis=0).max() or 1.0
+            X = _run(X, _edge_arrays(A_level), mass, k_level, max(REFINE_MIN_ITERATIONS, iterations // 4), 0.03 * span)
+    return dict(zip(nodes, _rescale(X)))
@@ -0,0 +1,210 @@
+# charts/layout_cache.py
+
+"""
+Persistent, warm-started force-directed layouts for the network charts
+(computed by charts.force_layout, which scales to the full skill graph).
+
+1) A layout is stored under (graph fingerprint, family), where the family is
+   the dimension plus the layout parameters; files live in the cache
+   directory of the corpus the graph came from (corpus.cache_dir, i.e.
+   .job_analysis_cache/layout-*.npz next to that database).
+2) Same graph again → the stored positions are returned without any layout work.
+3) A different graph of the same family (new jobs, another threshold) →
+   the layout starts from the cached layout that shares the most nodes:
+   known nodes keep their old positions, new ones start next to their placed
+   neighbours, only a few cooling iterations run and the result is scaled
+   back onto the old coordinates, so the picture stays put across clicks
+   and sessions. Every result is finally rescaled into [-1, 1].
+4) pooled_spring_layout() runs the layout in a compute_pool worker. The
+   graph travels as a node-name array plus edge index / weight arrays and is
+   rebuilt there, instead of pickling the networkx graph for every call.
+"""
+
+import hashlib
+import os
+
+import networkx as nx
+import numpy as np
+
+from charts.force_layout import force_layout
+from compute_pool import run
+from corpus_cache import _atomic_write, cache_lock
+
+KEEP_LAYOUTS = 8            # newest layouts kept per family
+WARM_FRACTION = 0.2         # share of the iterations run on a warm start
+MIN_WARM_ITERATIONS = 10
+
+
+def _family(dim, k, iterations, weight, seed):
+    key = repr(("force", dim, k, iterations, weight, seed)).encode("utf-8")
+    return hashlib.blake2b(key, digest_size=6).hexdigest()
+
+
+def graph_fingerprint(G, weight="weight"):
+    """Hash of the node set and weighted edge set (independent of insertion order)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(repr(sorted(map(str, G.nodes()))).encode("utf-8"))
+    edges = sorted(
+        (min(str(u), str(v)), max(str(u), str(v)), d.get(weight, 1) if weight else 1)
+        for u, v, d in G.edges(data=True)
+    )
+    h.update(repr(edges).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _layout_path(cache_dir, family, fingerprint):
+    return os.path.join(cache_dir, f"layout-{family}-{fingerprint}.npz")
+
+
+def _read(path):
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            return npz["nodes"].tolist(), npz["coords"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store(cache_dir, family, fingerprint, nodes, coords):
+    try:
+        with cache_lock(cache_dir):
+            _atomic_write(
+                _layout_path(cache_dir, family, fingerprint),
+                lambda f: np.savez(f, nodes=np.array(nodes, dtype=str), coords=coords)
+            )
+            siblings = [
+                os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                if name.startswith(f"layout-{family}-") and name.endswith(".npz")
+            ]
+            siblings.sort(key=os.path.getmtime, reverse=True)
+            for path in siblings[KEEP_LAYOUTS:]:
+                os.remove(path)
+    except OSError as e:
+        print(f"⚠️ Could not store layout: {e}")
+
+
+def _closest_layout(cache_dir, family, nodes):
+    """{node: position} of the cached family layout sharing the most nodes (or {})."""
+    if not os.path.isdir(cache_dir):
+        return {}
+    wanted = set(nodes)
+    best, best_overlap = {}, 0
+    with cache_lock(cache_dir, shared=True):
+        for name in os.listdir(cache_dir):
+            if not (name.startswith(f"layout-{family}-") and name.endswith(".npz")):
+                continue
+            stored = _read(os.path.join(cache_dir, name))
+            if stored is None:
+                continue
+            names, coords = stored
+            overlap = len(wanted.intersection(names))
+            if overlap > best_overlap:
+                best = dict(zip(names, coords))
+                best_overlap = overlap
+    return best
+
+
+def _initial_positions(G, nodes, known, dim, seed):
+    """Cached positions for known nodes; new nodes at their placed neighbours' mean plus jitter."""
+    rng = np.random.default_rng(seed)
+    init = {n: known[str(n)] for n in nodes if str(n) in known}
+    if known:
+        spread = np.ptp(np.array(list(known.values())), axis=0).max() or 1.0
+    else:
+        spread = 1.0
+    for n in nodes:
+        if n in init:
+            continue
+        placed = [init[m] for m in G.neighbors(n) if m in init]
+        center = np.mean(placed, axis=0) if placed else np.zeros(dim)
+        init[n] = center + rng.normal(scale=0.05 * spread, size=dim)
+    return init
+
+
+def _align(pos, init, anchors):
+    """
+    Undo the re-centering / re-scaling the layout applies: uniformly scale
+    and translate `pos` so the anchor nodes best match their initial spots.
+    The scale stays positive (a negative least-squares fit would mirror the
+    picture); it falls back to the ratio of the anchors' spreads.
+    """
+    X = np.array([pos[n] for n in anchors])
+    Y = np.array([init[n] for n in anchors])
+    Xc, Yc = X - X.mean(axis=0), Y - Y.mean(axis=0)
+    denom = (Xc * Xc).sum()
+    scale = (Xc * Yc).sum() / denom if denom > 0 else 1.0
+    if scale <= 0:
+        scale = np.sqrt((Yc * Yc).sum() / denom) if denom > 0 else 1.0
+    shift = Y.mean(axis=0) - scale * X.mean(axis=0)
+    return {n: scale * p + shift for n, p in pos.items()}
+
+
+def cached_spring_layout(G, dim=2, k=None, iterations=50, weight="weight", seed=42, cache_dir=None):
+    """
+    Drop-in for nx.spring_layout(G, dim=dim, k=k, iterations=iterations,
+    weight=weight, seed=seed), backed by force_layout, that reuses and
+    warm-starts the layouts cached in `cache_dir` (pass corpus.cache_dir;
+    None computes the layout without caching).
+    Returns {node: np.array position}.
+    """
+    nodes = list(G.nodes())
+    if not nodes:
+        return {}
+    if cache_dir is None:
+        return force_layout(G, dim=dim, k=k, iterations=iterations, weight=weight, seed=seed)
+    family = _family(dim, k, iterations, weight, seed)
+    fingerprint = graph_fingerprint(G, weight)
+    path = _layout_path(cache_dir, family, fingerprint)
+
+    stored = _read(path) if os.path.exists(path) else None
+    if stored is not None:
+        names, coords = stored
+        cached = dict(zip(names, coords))
+        if all(str(n) in cached for n in nodes):
+            os.utime(path)  # keep recently used layouts from being pruned
+            return {n: cached[str(n)] for n in nodes}
+
+    known = _closest_layout(cache_dir, family, map(str, nodes))
+    if known:
+        init = _initial_positions(G, nodes, known, dim, seed)
+        warm_iterations = max(MIN_WARM_ITERATIONS, int(iterations * WARM_FRACTION))
+        pos = force_layout(G, dim=dim, k=k, pos=init, iterations=warm_iterations, weight=weight, seed=seed)
+        anchors = [n for n in nodes if str(n) in known]
+        if len(anchors) >= 2:
+            pos = _align(pos, init, anchors)
+    else:
+        pos = force_layout(G, dim=dim, k=k, iterations=iterations, weight=weight, seed=seed)
+
+    # Back into [-1, 1] like nx.spring_layout, so warm starts can't drift in scale
+    coords = nx.rescale_layout(np.array([pos[n] for n in nodes], dtype=float))
+    _store(cache_dir, family, fingerprint, [str(n) for n in nodes], coords)
+    return dict(zip(nodes, coords))
+
+
+def graph_to_arrays(G, weight="weight"):
+    """(node names, u, v, w): G as a str array plus edge endpoint indices and weights."""
+    names = np.array([str(n) for n in G.nodes()], dtype=str)
+    index = {n: i for i, n in enumerate(G.nodes())}
+    edges = list(G.edges(data=weight or "weight", default=1))
+    u = np.fromiter((index[a] for a, _, _ in edges), dtype=np.int32, count=len(edges))
+    v = np.fromiter((index[b] for _, b, _ in edges), dtype=np.int32, count=len(edges))
+    w = np.array([d for _, _, d in edges])  # keeps int weights int, so the fingerprint is unchanged
+    return names, u, v, w
+
+
+def layout_arrays(names, u, v, w, dim=2, k=None, iterations=50, weight="weight", seed=42, cache_dir=None):
+    """Worker side of pooled_spring_layout: rebuild the graph, lay it out; (n, dim) positions in `names` order."""
+    G = nx.Graph()
+    G.add_nodes_from(names.tolist())
+    G.add_weighted_edges_from(zip(names[u].tolist(), names[v].tolist(), w.tolist()), weight=weight or "weight")
+    pos = cached_spring_layout(G, dim=dim, k=k, iterations=iterations, weight=weight, seed=seed, cache_dir=cache_dir)
+    return np.array([pos[n] for n in names.tolist()]).reshape(len(names), dim)
+
+
+def pooled_spring_layout(G, dim=2, k=None, iterations=50, weight="weight", seed=42, cache_dir=None):
+    """cached_spring_layout(G, …) computed in a compute_pool worker (in-process if the pool is off)."""
+    if G.number_of_nodes() == 0:
+        return {}
+    names, u, v, w = graph_to_arrays(G, weight)
+    coords = run(layout_arrays, names, u, v, w, dim=dim, k=k, iterations=iterations,
+                 weight=weight, seed=seed, cache_dir=cache_dir)
+    return dict(zip(G.nodes(), coords))
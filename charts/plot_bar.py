@@ -1,27 +1,32 @@
-from collections import Counter
 import matplotlib.pyplot as plt
+import pandas as pd
 
-def plot_top_skills_bar(job_skill_map, selected_skills, top_n=50):
-    selected_skills = set(s.lower() for s in selected_skills)
-    skill_counts = Counter()
+import sketches
 
-    for required_skills in job_skill_map.values():
-        for skill in required_skills:
-            skill_lower = skill.lower()
-            if skill_lower not in selected_skills:
-                skill_counts[skill_lower] += 1
+def plot_top_skills_bar(corpus, selected_skills, top_n=50, approximate=False):
+    title = f'Top {top_n} Skills You May Be Missing'
+    if approximate:
+        # Fixed-memory heavy hitters; over-fetch so excluded skills don't shrink the list
+        hh = sketches.top_skills(corpus, k=top_n + len(selected_skills), required_only=True)
+        print(hh.summary())
+        excluded = corpus.skill_mask(selected_skills)
+        keep = ~excluded[hh.keys]
+        skill_counts = pd.Series(hh.estimates[keep], index=corpus.skill_names(hh.keys[keep]))
+        title += f' (≈, within +{hh.max_error})'
+    else:
+        skill_counts = corpus.skill_count_series(required_only=True, exclude=selected_skills)
 
-    if not skill_counts:
+    if skill_counts.empty:
         print("No remaining skills to recommend.")
         return
 
-    top_skills = skill_counts.most_common(top_n)
-    skills, counts = zip(*top_skills)
+    top_skills = skill_counts.head(top_n)
+    skills, counts = top_skills.index.tolist(), top_skills.values.tolist()
 
     plt.figure(figsize=(12, 8))
     plt.barh(skills[::-1], counts[::-1])
     plt.xlabel('Job Coverage (Excludes Your Skills)')
-    plt.title(f'Top {top_n} Skills You May Be Missing')
+    plt.title(title)
     plt.tight_layout()
     plt.grid(axis='x', linestyle='--', alpha=0.7)
     plt.show()
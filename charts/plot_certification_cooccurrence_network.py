@@ -1,68 +1,48 @@
 # charts/plot_certification_cooccurrence_network.py
 
-import sqlite3
-import pandas as pd
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
 import os
 import webbrowser
-from collections import Counter
-from itertools import combinations
+
+from charts.layout_cache import pooled_spring_layout
+from charts.trace_utils import edge_traces, graph_arrays
+from task_scheduler import check_cancelled
 
 def plot_certification_cooccurrence_network(
-    db_path="preview_jobs.db",
+    corpus,
     min_pair_count=5,
     min_node_freq=5,
     spring_k=0.5,
     spring_iterations=50
 ):
     """
-    1) Read job_id→certification name from the 'certifications' table.
-    2) Group by job_id to get a list of certs per job.
+    1) Take the job×certification indicator matrix from the shared corpus.
+    2) Each row is the set of certs on one job.
     3) Count how often each pair of certs appears together across all jobs.
     4) Build a NetworkX graph:
          • Include only certs that appear in ≥ min_node_freq postings.
          • Include only edges (a,b) with co-occurrence ≥ min_pair_count.
     5) Compute a spring layout and draw with Plotly:
          • Node size ~ frequency of that cert
-         • Edge width ~ co-occurrence count
+         • Edge width ~ co-occurrence count (a few width buckets, one trace each)
     6) Save as "certification_cooccurrence_network.html" and open in browser.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        df = pd.read_sql_query(
-            "SELECT job_id, name AS certification FROM certifications",
-            conn
-        )
-    except Exception as e:
-        print("ERROR reading from 'certifications' table:", e)
-        conn.close()
-        return
-    conn.close()
-
-    if df.empty:
+    C = corpus.cert_indicator()
+    if C.nnz == 0:
         print("No rows found in 'certifications' table.")
         return
 
-    # 2) For each job_id, gather its list of certifications
-    certs_per_job = df.groupby("job_id")["certification"].apply(list)
-
-    # 3) Count co-occurrence of each pair (sorted tuple)
-    pair_counts = Counter()
-    all_certs = []
-    for cert_list in certs_per_job:
-        # Only count pairs if there are at least 2 certs on that job
-        unique_certs = list(set(cert_list))
-        for a, b in combinations(sorted(unique_certs), 2):
-            pair_counts[(a, b)] += 1
-        # Also track individual cert frequencies
-        all_certs.extend(unique_certs)
-
-    cert_freq = Counter(all_certs)
+    # 2–3) Pair counts come from Cᵀ·C over the job×cert indicator
+    co = (C.T @ C).tocoo()
+    cert_names = corpus.certs.strings
+    cert_freq = {cert_names[i]: int(f) for i, f in enumerate(corpus.cert_counts())}
+    upper = co.row < co.col
+    pair_counts = {
+        (cert_names[a], cert_names[b]): int(w)
+        for a, b, w in zip(co.row[upper], co.col[upper], co.data[upper])
+    }
 
     # 4) Build graph
     G = nx.Graph()
@@ -84,54 +64,24 @@ def plot_certification_cooccurrence_network(
         return
 
     # 5) Compute 2D spring layout
-    pos = nx.spring_layout(G, k=spring_k, iterations=spring_iterations, seed=42)
-
-    # Build edge traces (x,y with None separators) and a separate parallel list for widths
-    edge_x = []
-    edge_y = []
-    edge_widths = []
-    for u, v, data in G.edges(data=True):
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        edge_widths.append(data["weight"])
+    pos = pooled_spring_layout(G, k=spring_k, iterations=spring_iterations, seed=42,
+                               cache_dir=corpus.cache_dir)
 
-    # To draw varying widths, we need multiple segments. Simplest: draw each edge separately.
-    edge_traces = []
-    for u, v, data in G.edges(data=True):
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        w = data["weight"]
-        trace = go.Scatter(
-            x=[x0, x1],
-            y=[y0, y1],
-            mode="lines",
-            line=dict(width=max(1, 0.3 * w), color="lightgray"),
-            hoverinfo="none",
-            showlegend=False
-        )
-        edge_traces.append(trace)
+    # Edge traces: NaN-separated segments, edges bucketed into a few line widths
+    nodes, coords, u, v, weights = graph_arrays(G, pos)
+    edge_lines = edge_traces(coords, u, v, np.maximum(1, 0.3 * weights), color="lightgray")
 
     # Build node trace
-    node_x = []
-    node_y = []
-    node_size = []
-    node_text = []
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        freq = G.nodes[node]["freq"]
-        node_size.append(20 + freq * 2)  # node size scales with freq
-        node_text.append(f"{node.upper()}<br>#Postings: {freq}")
+    freqs = np.array([G.nodes[node]["freq"] for node in nodes])
+    node_size = 20 + freqs * 2  # node size scales with freq
+    node_text = [f"{node.upper()}<br>#Postings: {freq}" for node, freq in zip(nodes, freqs.tolist())]
 
     node_trace = go.Scatter(
-        x=node_x,
-        y=node_y,
+        x=coords[:, 0],
+        y=coords[:, 1],
         mode="markers+text",
         marker=dict(size=node_size, color="gold", line=dict(width=1, color="black")),
-        text=[n.upper() for n in G.nodes()],
+        text=[n.upper() for n in nodes],
         textposition="bottom center",
         hovertext=node_text,
         hoverinfo="text",
@@ -139,7 +89,7 @@ def plot_certification_cooccurrence_network(
     )
 
     # 6) Compose figure
-    fig = go.Figure(data=edge_traces + [node_trace])
+    fig = go.Figure(data=edge_lines + [node_trace])
     fig.update_layout(
         title=(
             f"Certification Co-Occurrence Network\n"
@@ -152,6 +102,7 @@ def plot_certification_cooccurrence_network(
     )
 
     out_file = "certification_cooccurrence_network.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved network graph to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -160,4 +111,5 @@ def plot_certification_cooccurrence_network(
 
 if __name__ == "__main__":
     # Example standalone call
-    plot_certification_cooccurrence_network()
+    from data_loader import load_corpus
+    plot_certification_cooccurrence_network(load_corpus())
@@ -1,41 +1,24 @@
 # charts/plot_certification_distribution.py
 
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import os
 import webbrowser
+from task_scheduler import check_cancelled
 
-def plot_certification_distribution(db_path="preview_jobs.db"):
+def plot_certification_distribution(corpus):
     """
-    1) Read the `certifications` table (columns: job_id, name, required).
-    2) Count frequency of each `name` value.
+    1) Take the job×certification matrix from the shared corpus.
+    2) Count how many postings mention each certification.
     3) Plot the top 15 certifications (by count) as a horizontal bar chart.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # ‘name’ holds the certification string
-        df = pd.read_sql_query(
-            "SELECT name FROM certifications",
-            conn
-        )
-    except Exception as e:
-        print("ERROR reading from 'certifications' table:", e)
-        conn.close()
-        return
-    conn.close()
-
-    if df.empty:
+    counts = corpus.cert_counts()
+    if counts.sum() == 0:
         print("No rows found in 'certifications' table.")
         return
 
     # Count frequency of each certification name
-    cert_counts = df["name"].value_counts().reset_index()
-    cert_counts.columns = ["certification", "count"]
+    cert_counts = pd.DataFrame({"certification": corpus.certs.strings, "count": counts})
 
     # Take top 15
     topN = cert_counts.nlargest(15, "count")
@@ -56,10 +39,12 @@ def plot_certification_distribution(db_path="preview_jobs.db"):
     )
 
     out_file = "certification_distribution.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
     webbrowser.open(f"file://{abs_path}")
 
 if __name__ == "__main__":
-    plot_certification_distribution()
+    from data_loader import load_corpus
+    plot_certification_distribution(load_corpus())
@@ -1,26 +1,28 @@
 # charts/plot_certification_presence_by_skill_cluster.py
 
 import os
-import sqlite3
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import networkx as nx
-from networkx.algorithms import community as nx_community
+from scipy import sparse
 import webbrowser
-from itertools import combinations
+
+from communities import skill_communities
+from compute_pool import run
+from task_scheduler import check_cancelled
 
 def plot_certification_presence_by_skill_cluster(
-    db_path="preview_jobs.db",
+    corpus,
     min_edge_weight=3,
     min_skill_degree=1,
     top_n_certs_per_cluster=10
 ):
     """
-    1) Read job_id→skill from `skills` table.
-    2) Build a skill‐cooccurrence graph (edges ≥ min_edge_weight).
-    3) Detect communities (skill clusters) via greedy modularity.
+    1) Take job→skill from the shared corpus.
+    2) Build a skill‐cooccurrence graph (Xᵀ·X, edges ≥ min_edge_weight).
+    3) Detect communities (skill clusters) via Louvain (cached, see communities.py).
     4) Assign each job to the cluster containing the largest number of its skills.
-    5) Read job_id→certification name from `certifications` table.
+    5) Take job→certification from the shared corpus.
     6) For each (cluster, certification), compute:
          • count = #jobs in that cluster requiring that cert
          • cluster_size = total #jobs assigned to that cluster
@@ -28,112 +30,62 @@ def plot_certification_presence_by_skill_cluster(
     7) Optionally, keep only the top N certifications per cluster.
     8) Plot a faceted bar chart (one facet per cluster) showing % penetration by cert.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # (1) Load job_id + skill
-        skills_df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-        # (5) Load job_id + certification name
-        certs_df = pd.read_sql_query("SELECT job_id, name AS certification FROM certifications", conn)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # (1) job×skill (all mentions), (5) job×certification
+    X = corpus.skill_indicator()
+    C = corpus.cert_indicator()
 
-    if skills_df.empty:
+    if X.nnz == 0:
         print("No rows in 'skills' table.")
         return
-    if certs_df.empty:
+    if C.nnz == 0:
         print("No rows in 'certifications' table.")
         return
 
-    # (1b) Aggregate all skills per job_id into a comma‐separated string
-    skills_df["skill"] = skills_df["skill"].str.strip().str.lower()
-    skills_agg = (
-        skills_df
-        .groupby("job_id")["skill"]
-        .agg(lambda vals: ",".join(vals))
-        .reset_index()
-        .rename(columns={"skill": "skills_str"})
+    # (2)–(3) Skill clusters: Louvain communities of the co-occurrence graph,
+    #         shared with the other cluster charts and cached across sessions
+    skill_to_cluster = run(
+        skill_communities, corpus, required_only=False, min_weight=min_edge_weight, min_degree=min_skill_degree
     )
-
-    # (2) Build skill co-occurrence counts across all jobs
-    co_occ = {}
-    for skills_str in skills_agg["skills_str"]:
-        sl = [s.strip() for s in skills_str.split(",") if s.strip()]
-        for i in range(len(sl)):
-            for j in range(i + 1, len(sl)):
-                edge = tuple(sorted([sl[i], sl[j]]))
-                co_occ[edge] = co_occ.get(edge, 0) + 1
-
-    # (2b) Build graph G where nodes are skills, edges weighted by co-occurrence
-    G = nx.Graph()
-    for (a, b), w in co_occ.items():
-        if w >= min_edge_weight:
-            G.add_edge(a, b, weight=w)
-
-    # Remove isolated nodes whose degree < min_skill_degree
-    isolates = [n for n, d in G.degree() if d < min_skill_degree]
-    G.remove_nodes_from(isolates)
-
-    if G.number_of_nodes() == 0:
-        print(f"No skills remain with degree ≥ {min_skill_degree}.")
+    if (skill_to_cluster < 0).all():
+        print(f"No skills with ≥ {min_skill_degree} co-occurrence edge(s) of weight ≥ {min_edge_weight}.")
         return
-    if G.number_of_edges() == 0:
-        print(f"No edges with weight ≥ {min_edge_weight}.")
-        return
-
-    # (3) Detect communities (each community = one “skill cluster”)
-    comms = list(nx_community.greedy_modularity_communities(G, weight="weight"))
-    skill_to_cluster = {}
-    for idx, comm in enumerate(comms):
-        for skill in comm:
-            skill_to_cluster[skill] = idx
-
-    # (4) Assign each job a “primary” cluster (the cluster containing most of its skills)
-    def primary_cluster(skills_str: str):
-        if not isinstance(skills_str, str) or not skills_str.strip():
-            return None
-        sl = [s.strip() for s in skills_str.split(",") if s.strip()]
-        cluster_counts = {}
-        for s in sl:
-            c = skill_to_cluster.get(s)
-            if c is not None:
-                cluster_counts[c] = cluster_counts.get(c, 0) + 1
-        if not cluster_counts:
-            return None
-        return max(cluster_counts, key=lambda k: cluster_counts[k])
-
-    skills_agg["cluster"] = skills_agg["skills_str"].apply(primary_cluster)
+    n_comms = int(skill_to_cluster.max()) + 1
+
+    # (4) Assign each job a “primary” cluster (the cluster containing most of its
+    #     skills): X · (skill→cluster one-hot) counts each job's skills per cluster.
+    clustered = np.flatnonzero(skill_to_cluster >= 0)
+    skill_cluster_onehot = sparse.csr_matrix(
+        (np.ones(len(clustered), dtype=np.int32), (clustered, skill_to_cluster[clustered])),
+        shape=(corpus.n_skills, n_comms)
+    )
+    per_cluster = (X @ skill_cluster_onehot).toarray()
+    job_rows = np.flatnonzero(per_cluster.max(axis=1) > 0)
 
     # Drop any jobs without a cluster assignment
-    skills_agg = skills_agg.dropna(subset=["cluster"])
-    if skills_agg.empty:
+    if len(job_rows) == 0:
         print("No jobs could be assigned to any skill cluster.")
         return
+    job_cluster = per_cluster[job_rows].argmax(axis=1)
 
-    # (5b) Join certifications to the cluster assignment
-    # merged: job_id, skills_str, cluster, certification
-    merged = skills_agg.merge(certs_df, on="job_id", how="inner")
-    if merged.empty:
+    # (5b)–(6) Count how many jobs in each (cluster, certification)
+    job_cluster_onehot = sparse.csr_matrix(
+        (np.ones(len(job_rows), dtype=np.int32), (job_rows, job_cluster)),
+        shape=(corpus.n_jobs, n_comms)
+    )
+    counts = (job_cluster_onehot.T @ C).tocoo()
+    if counts.nnz == 0:
         print("No job has any certification in the database.")
         return
 
-    # (6) Count how many jobs in each (cluster, certification)
-    cc = (
-        merged
-        .groupby(["cluster", "certification"])
-        .size()
-        .reset_index(name="count")
-    )
+    cc = pd.DataFrame({
+        "cluster": counts.row,
+        "certification": np.asarray(corpus.certs.strings, dtype=object)[counts.col],
+        "count": counts.data,
+    })
 
     # Determine cluster_size = total number of distinct jobs in that cluster
-    cluster_sizes = skills_agg["cluster"].value_counts().to_dict()
-    cc["cluster_size"] = cc["cluster"].map(cluster_sizes)
+    cluster_sizes = np.bincount(job_cluster, minlength=n_comms)
+    cc["cluster_size"] = cluster_sizes[cc["cluster"]]
     cc["pct_of_cluster"] = cc["count"] / cc["cluster_size"] * 100
 
     # (7) Optionally filter to top_n_certs_per_cluster by frequency
@@ -159,6 +111,7 @@ def plot_certification_presence_by_skill_cluster(
     fig.update_layout(template="plotly_dark", height=600, showlegend=False)
 
     out_file = "certs_by_skill_cluster.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -166,4 +119,5 @@ def plot_certification_presence_by_skill_cluster(
 
 
 if __name__ == "__main__":
-    plot_certification_presence_by_skill_cluster()
+    from data_loader import load_corpus
+    plot_certification_presence_by_skill_cluster(load_corpus())
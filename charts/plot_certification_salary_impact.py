@@ -1,49 +1,31 @@
 # charts/plot_certification_salary_impact.py
 
-import sqlite3
-import pandas as pd
 import plotly.express as px
 import os
 import webbrowser
 from scipy.stats import ttest_ind
+from task_scheduler import check_cancelled
 
-def plot_certification_salary_impact(db_path="preview_jobs.db"):
+def plot_certification_salary_impact(corpus):
     """
-    1) Read job_id → salary_avg from jobs, and job_id → certification name from certifications.
+    1) Take job → salary_avg and job → certification name from the shared corpus.
     2) For each certification, compute average salary, std, and count of postings requiring that cert.
     3) For jobs with no certification, collect their salaries as the “no‐cert” group.
     4) Perform a t‐test comparing each cert’s salary distribution to the no‐cert distribution.
     5) Filter to certifications appearing in ≥20 postings, sort by avg_salary, and plot a horizontal bar chart
        with error bars (std). Hover shows count and p‐value.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # (1a) Load job_id, salary_avg from jobs
-        jobs_df = pd.read_sql_query(
-            "SELECT job_id, salary_avg FROM jobs WHERE salary_avg IS NOT NULL",
-            conn
-        )
-        # (1b) Load job_id, name from certifications
-        certs_df = pd.read_sql_query(
-            "SELECT job_id, name AS certification FROM certifications",
-            conn
-        )
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # (1a) job_row, salary_avg for jobs with a salary
+    jobs_df = corpus.job_frame()[["job_row", "salary_avg"]].dropna(subset=["salary_avg"])
+    # (1b) job_row, certification
+    certs_df = corpus.cert_frame()[["job_row", "certification"]]
 
     if jobs_df.empty:
         print("No salary data found in 'jobs' table.")
         return
 
     # Merge salary with certifications
-    merged = jobs_df.merge(certs_df, on="job_id", how="left")
+    merged = jobs_df.merge(certs_df, on="job_row", how="left")
     # Now 'certification' is NaN for jobs with no certification.
 
     # (2) Compute stats for each certification
@@ -104,6 +86,7 @@ def plot_certification_salary_impact(db_path="preview_jobs.db"):
     )
 
     out_file = "certification_salary_impact.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -111,4 +94,5 @@ def plot_certification_salary_impact(db_path="preview_jobs.db"):
 
 
 if __name__ == "__main__":
-    plot_certification_salary_impact()
+    from data_loader import load_corpus
+    plot_certification_salary_impact(load_corpus())
@@ -1,81 +1,51 @@
 # charts/plot_company_skill_cluster_sankey.py
 
 import os
-import sqlite3
-import pandas as pd
-import numpy as np
 import webbrowser
 
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import normalize
 import plotly.graph_objects as go
 
-def plot_company_skill_cluster_sankey(
-    db_path="preview_jobs.db",
-    n_skill_clusters=10,
-    min_jobs_per_company=5,
-    top_skills_per_cluster=5
-):
+from compute_pool import run
+from task_scheduler import check_cancelled
+
+
+def compute_company_skill_clusters(corpus, n_skill_clusters=10, min_jobs_per_company=5, top_skills_per_cluster=5):
     """
-    1) Load job_id→company from jobs and job_id→skill from skills.
-    2) Filter out companies with fewer than min_jobs_per_company postings.
-    3) Build a skill×job binary matrix, cluster each skill into n_skill_clusters.
-    4) For each cluster:
-         • Gather all skills assigned to that cluster.
-         • Rank them by # of jobs they appear in (descending).
-         • Keep top_skills_per_cluster for the cluster's label.
-    5) For each (company, cluster), count distinct job_ids where any skill in that cluster appears.
-    6) Build and render a Sankey diagram where:
-         • source = company (left nodes)
-         • target = “Cluster <i>: top_skill1, top_skill2, …” (right nodes)
-         • value = # of postings at that company needing at least one skill in that cluster
-    7) Save as “company_skill_cluster_sankey.html” and open in browser.
+    Compute phase (steps 1–5 of plot_company_skill_cluster_sankey; runs in
+    the process pool): (company_cluster_counts, cluster_labels), or None.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # (1) Read job↔company and job↔skill tables
-        jobs_df = pd.read_sql_query(
-            "SELECT job_id, company FROM jobs WHERE company IS NOT NULL",
-            conn
-        )
-        skills_df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # (1) job↔company and job↔skill from the shared corpus
+    jobs_df = corpus.job_frame()[["job_row", "company"]].dropna(subset=["company"])
+    skills_df = corpus.skill_frame()[["job_row", "skill"]]
 
     if jobs_df.empty or skills_df.empty:
         print("No data found in jobs or skills tables.")
-        return
+        return None
 
     # (2) Filter companies with at least min_jobs_per_company postings
     job_counts = jobs_df["company"].value_counts()
     keep_companies = job_counts[job_counts >= min_jobs_per_company].index.tolist()
     jobs_df = jobs_df[jobs_df["company"].isin(keep_companies)].copy()
-    valid_jobs = set(jobs_df["job_id"])
+    valid_jobs = set(jobs_df["job_row"])
 
     # Filter skills to only those jobs we kept
-    skills_df = skills_df[skills_df["job_id"].isin(valid_jobs)].copy()
-    skills_df["skill"] = skills_df["skill"].str.strip().str.lower()
+    skills_df = skills_df[skills_df["job_row"].isin(valid_jobs)].copy()
 
     if skills_df.empty:
         print("No skill data after filtering to kept jobs.")
-        return
+        return None
 
     # (3) Build skill×job binary matrix
-    #    Rows = skill, Cols = job_id. Entry = 1 if that skill appears in that job.
+    #    Rows = skill, Cols = job_row. Entry = 1 if that skill appears in that job.
     skill_job_ct = (
         skills_df
-        .drop_duplicates(["job_id", "skill"])
-        .groupby(["skill", "job_id"])
+        .drop_duplicates(["job_row", "skill"])
+        .groupby(["skill", "job_row"])
         .size()
         .unstack(fill_value=0)
-    )  # DataFrame: index=skill, columns=job_id
+    )  # DataFrame: index=skill, columns=job_row
 
     skill_list = skill_job_ct.index.tolist()
     job_cols = skill_job_ct.columns.tolist()
@@ -117,16 +87,16 @@ def plot_company_skill_cluster_sankey(
         label = f"Cluster {cid}:\n" + "\n".join(top_n)
         cluster_labels[cid] = label
 
-    # (5) For each (company, cluster), count distinct job_ids:
+    # (5) For each (company, cluster), count distinct jobs:
     #    Map each row in skills_df to its cluster_id via skill_to_cluster.
     skills_df["cluster_id"] = skills_df["skill"].map(skill_to_cluster)
 
     # Merge in company from jobs_df
-    merged = skills_df.merge(jobs_df, on="job_id", how="inner")
-    # Drop duplicates of (job_id, company, cluster_id)
-    merged_unique = merged[["job_id", "company", "cluster_id"]].drop_duplicates()
+    merged = skills_df.merge(jobs_df, on="job_row", how="inner")
+    # Drop duplicates of (job_row, company, cluster_id)
+    merged_unique = merged[["job_row", "company", "cluster_id"]].drop_duplicates()
 
-    # Group by (company, cluster_id) to count distinct job_ids
+    # Group by (company, cluster_id) to count distinct jobs
     company_cluster_counts = (
         merged_unique
         .groupby(["company", "cluster_id"])
@@ -136,7 +106,41 @@ def plot_company_skill_cluster_sankey(
 
     if company_cluster_counts.empty:
         print("No company↔cluster counts to plot.")
+        return None
+
+    return company_cluster_counts, cluster_labels
+
+
+def plot_company_skill_cluster_sankey(
+    corpus,
+    n_skill_clusters=10,
+    min_jobs_per_company=5,
+    top_skills_per_cluster=5
+):
+    """
+    1) Take job→company and job→skill from the shared corpus.
+    2) Filter out companies with fewer than min_jobs_per_company postings.
+    3) Build a skill×job binary matrix, cluster each skill into n_skill_clusters.
+    4) For each cluster:
+         • Gather all skills assigned to that cluster.
+         • Rank them by # of jobs they appear in (descending).
+         • Keep top_skills_per_cluster for the cluster's label.
+    5) For each (company, cluster), count distinct jobs where any skill in that cluster appears.
+    6) Build and render a Sankey diagram where:
+         • source = company (left nodes)
+         • target = “Cluster <i>: top_skill1, top_skill2, …” (right nodes)
+         • value = # of postings at that company needing at least one skill in that cluster
+    7) Save as “company_skill_cluster_sankey.html” and open in browser.
+    Steps 1–5 (incl. KMeans) are compute_company_skill_clusters, run in the
+    compute pool; only the counts and labels come back.
+    """
+    # (1)–(5) Compute phase in the process pool (compute_company_skill_clusters)
+    result = run(
+        compute_company_skill_clusters, corpus, n_skill_clusters, min_jobs_per_company, top_skills_per_cluster
+    )
+    if result is None:
         return
+    company_cluster_counts, cluster_labels = result
 
     # (6) Build Sankey nodes and links
     # Left nodes = companies, right nodes = clusters (with human‐readable labels)
@@ -186,6 +190,7 @@ def plot_company_skill_cluster_sankey(
     )
 
     out_file = "company_skill_cluster_sankey.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved Sankey to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -193,4 +198,5 @@ def plot_company_skill_cluster_sankey(
 
 
 if __name__ == "__main__":
-    plot_company_skill_cluster_sankey()
+    from data_loader import load_corpus
+    plot_company_skill_cluster_sankey(load_corpus())
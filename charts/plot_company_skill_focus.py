@@ -1,45 +1,31 @@
 # charts/plot_company_skill_focus.py
 
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import os
 import webbrowser
+from task_scheduler import check_cancelled
 
-def plot_company_skill_focus(user_skills, db_path="preview_jobs.db", top_n_companies=5, top_n_skills=10):
+def plot_company_skill_focus(corpus, user_skills, top_n_companies=5, top_n_skills=10):
     """
     1) user_skills: list of skills the user already has (lower/upper case doesn’t matter).
-    2) Connect to preview_jobs.db.
-    3) SELECT job_id, company from jobs; SELECT job_id, name AS skill from skills.
+    2) corpus: the shared JobCorpus.
+    3) Take job→company and job→skill from the corpus.
     4) Exclude any skill in user_skills from consideration.
     5) Identify top_n_companies by number of postings.
     6) For each of those companies, count frequencies of missing skills, then keep top_n_skills.
     7) Render a grouped bar chart and open it in the browser.
     """
-    # Normalize user_skills to lowercase
-    user_set = set(s.strip().lower() for s in user_skills)
-
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # 3) Read job_id→company and job_id→skill
-        job_comp = pd.read_sql_query("SELECT job_id, company FROM jobs WHERE company IS NOT NULL", conn)
-        skill_df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # 3) job→company and job→skill from the shared corpus
+    job_comp = corpus.job_frame()[["job_row", "company"]].dropna(subset=["company"])
+    skill_df = corpus.skill_frame()[["job_row", "skill"]]
 
     if job_comp.empty or skill_df.empty:
         print("No data found in jobs/skills tables.")
         return
 
     # 4) Filter out any skill that the user already has
-    skill_df['skill'] = skill_df['skill'].str.strip().str.lower()
+    user_set = corpus.skill_names(corpus.skill_ids(user_skills))
     mask = ~skill_df['skill'].isin(user_set)
     skill_df = skill_df[mask].copy()
 
@@ -48,7 +34,7 @@ def plot_company_skill_focus(user_skills, db_path="preview_jobs.db", top_n_compa
 
     # 6) Filter skill_df to only include postings from those top companies
     #    First, merge job_comp into skill_df to get company for each row
-    merged = skill_df.merge(job_comp, on="job_id", how="inner")
+    merged = skill_df.merge(job_comp, on="job_row", how="inner")
     merged = merged[merged['company'].isin(top_companies)].copy()
 
     # Count skill frequencies within each of those companies
@@ -78,6 +64,7 @@ def plot_company_skill_focus(user_skills, db_path="preview_jobs.db", top_n_compa
     fig.update_layout(template='plotly_dark', xaxis_tickangle=-45)
 
     out_file = "company_skill_focus.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -86,4 +73,5 @@ def plot_company_skill_focus(user_skills, db_path="preview_jobs.db", top_n_compa
 
 if __name__ == "__main__":
     # Example standalone call, replace with actual user skills
-    plot_company_skill_focus(["python", "sql"])
+    from data_loader import load_corpus
+    plot_company_skill_focus(load_corpus(), ["python", "sql"])
@@ -1,8 +1,7 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 
-def plot_cumulative_line(all_skills, top_n=50):
-    skill_counts = pd.Series(all_skills).value_counts().nlargest(top_n)[::1]
+def plot_cumulative_line(corpus, exclude_skills=(), top_n=50):
+    skill_counts = corpus.skill_count_series(exclude=exclude_skills).head(top_n)[::1]
     cumulative = skill_counts.cumsum()
     total = skill_counts.sum()
 
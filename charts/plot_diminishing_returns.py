@@ -1,17 +1,16 @@
-from collections import defaultdict
 import matplotlib.pyplot as plt
-from data_loader import load_job_skill_map
-
-def plot_diminishing_returns(user_skills: list[str]):
-    job_skill_map, _ = load_job_skill_map()
 
+def plot_diminishing_returns(corpus, user_skills: list[str]):
     # -------------------------------------------
-    # Build skill-to-job mapping
+    # Build skill-to-job mapping (columns of the required-skill matrix)
     # -------------------------------------------
-    skill_to_jobs = defaultdict(set)
-    for job_id, skills in job_skill_map.items():
-        for skill in skills:
-            skill_to_jobs[skill.lower()].add(job_id)
+    X = corpus.skill_indicator(required_only=True).tocsc()
+    names = corpus.skill_names()
+    skill_to_jobs = {
+        names[col]: set(X.indices[X.indptr[col]:X.indptr[col + 1]].tolist())
+        for col in range(X.shape[1])
+        if X.indptr[col + 1] > X.indptr[col]
+    }
 
     # -------------------------------------------
     # Filter out user skills
@@ -40,7 +39,7 @@ def plot_diminishing_returns(user_skills: list[str]):
         x.append(i)
         y.append(len(seen_jobs))
 
-    total_jobs = len(job_skill_map)
+    total_jobs = int(corpus.jobs_with_skills(required_only=True).sum())
     y_percent = [round(100 * count / total_jobs, 2) for count in y]
 
     # -------------------------------------------
@@ -1,11 +1,17 @@
-def compute_greedy_unlock_data(job_skill_map, user_skills=None, max_skills=30, progress_callback=None):
-    total_jobs = len(job_skill_map)
-    skill_to_jobs = {}
-    for job_id, skills in job_skill_map.items():
-        for skill in skills:
-            skill_to_jobs.setdefault(skill.lower(), set()).add(job_id)
-
-    uncovered_jobs = set(job_skill_map.keys())
+def compute_greedy_unlock_data(corpus, user_skills=None, max_skills=30, progress_callback=None):
+    import numpy as np
+
+    has_skills = corpus.jobs_with_skills(required_only=True)
+    total_jobs = int(has_skills.sum())
+    X = corpus.skill_indicator(required_only=True).tocsc()
+    names = corpus.skill_names()
+    skill_to_jobs = {
+        names[col]: set(X.indices[X.indptr[col]:X.indptr[col + 1]].tolist())
+        for col in range(X.shape[1])
+        if X.indptr[col + 1] > X.indptr[col]
+    }
+
+    uncovered_jobs = set(np.flatnonzero(has_skills).tolist())
     coverage_progress = []
 
     normalized_user_skills = set(s.lower() for s in user_skills or [])
@@ -1,8 +1,7 @@
-def plot_pareto_chart(all_skills, top_n=50):
+def plot_pareto_chart(corpus, exclude_skills=(), top_n=50):
     import matplotlib.pyplot as plt
-    import pandas as pd
 
-    skill_counts = pd.Series(all_skills).value_counts().nlargest(top_n)
+    skill_counts = corpus.skill_count_series(exclude=exclude_skills).head(top_n)
     cumulative = skill_counts.cumsum()
     total = cumulative.iloc[-1]
     cumulative_percent = cumulative / total
@@ -1,34 +1,20 @@
 # plot_remote_vs_onsite.py
 
-import sqlite3
-import pandas as pd
 import plotly.express as px
 import os
 import webbrowser
+from task_scheduler import check_cancelled
 
-def plot_remote_vs_onsite(db_path="preview_jobs.db"):
+def plot_remote_vs_onsite(corpus):
     """
-    1) Connects to preview_jobs.db
-    2) SELECT job_id, location FROM jobs
+    1) Takes the shared JobCorpus
+    2) Reads the job_id / location columns
     3) Classifies each row as Remote / Hybrid / On-Site
     4) Builds a pie chart showing overall percentages
     5) Saves to 'remote_vs_onsite_pie.html' and opens it in the browser
     """
 
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database file not found: {db_path}")
-        return
-
-    conn = sqlite3.connect(db_path)
-
-    try:
-        df = pd.read_sql_query("SELECT job_id, location FROM jobs", conn)
-    except Exception as e:
-        print("ERROR reading from 'jobs' table:", e)
-        conn.close()
-        return
-
-    conn.close()
+    df = corpus.job_frame()[["job_id", "location"]]
 
     if df.empty:
         print("No rows found in the 'jobs' table.")
@@ -59,6 +45,7 @@ def plot_remote_vs_onsite(db_path="preview_jobs.db"):
     )
     fig.update_traces(textposition='inside', textinfo='percent+label')
     out_file = "remote_vs_onsite_pie.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved pie chart to '{out_file}'")
 
@@ -68,4 +55,5 @@ def plot_remote_vs_onsite(db_path="preview_jobs.db"):
 
 
 if __name__ == "__main__":
-    plot_remote_vs_onsite()
+    from data_loader import load_corpus
+    plot_remote_vs_onsite(load_corpus())
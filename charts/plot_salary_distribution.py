@@ -1,13 +1,16 @@
 # plot_salary_distribution.py
 
-import sqlite3
-import pandas as pd
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 
+from charts.webgl import level_of_detail, lod_sample, use_webgl, write_html
+from task_scheduler import check_cancelled
 
-def plot_salary_distribution(db_path="preview_jobs.db", group_by="skill"):
+
+def plot_salary_distribution(corpus, group_by="skill", render="auto"):
     """
-    Connects to the SQLite file (with cleaned salary columns), pulls:
+    Uses the shared corpus (with cleaned salary columns), pulls:
       - job_id
       - salary_avg  (already numeric, USD/year)
       - skill
@@ -16,37 +19,24 @@ def plot_salary_distribution(db_path="preview_jobs.db", group_by="skill"):
       - groups by skill (top 5), or
       - groups by city.
     Finally, generates a Plotly violin plot in 'salary_distribution.html'.
+    render: "webgl", "svg" or "auto" (WebGL for many postings). With WebGL the
+    individual salaries are one WebGL scatter beside the violins, sampled
+    down to LOD_POINTS until you zoom in.
     """
 
-    # 1) Open connection and join jobs ↔ skills
-    conn = sqlite3.connect(db_path)
-
-    sql = """
-        SELECT
-            j.job_id,
-            j.salary_avg AS salary_val,
-            s.name        AS skill,
-            j.location_details AS city
-        FROM jobs AS j
-        INNER JOIN skills AS s
-            ON j.job_id = s.job_id
-        WHERE 
-            j.salary_avg IS NOT NULL
-            AND j.salary_avg <= 200000
-            AND j.salary_avg >= 25000
-
-    """
-
-    df = pd.read_sql_query(sql, conn)
-    conn.close()
+    # 1) Join jobs ↔ skills from the shared corpus
+    jobs = corpus.job_frame()
+    jobs = jobs[(jobs["salary_avg"] <= 200000) & (jobs["salary_avg"] >= 25000)]
+    df = (
+        corpus.skill_frame()[["job_row", "skill"]]
+        .merge(jobs[["job_row", "job_id", "salary_avg", "city"]], on="job_row", how="inner")
+        .rename(columns={"salary_avg": "salary_val"})
+    )
 
     # 2) Now df.salary_val is already numeric (USD/year). No parsing required.
 
     # 3) Decide grouping logic
     if group_by == "skill":
-        # Normalize skill text:
-        df['skill'] = df['skill'].str.strip().str.lower()
-
         # Pick top 5 skills by frequency
         top5 = df['skill'].value_counts().nlargest(15).index.tolist()
         df = df[df['skill'].isin(top5)]
@@ -61,16 +51,20 @@ def plot_salary_distribution(db_path="preview_jobs.db", group_by="skill"):
         xaxis = "city"
 
     # 4) Build a Plotly violin plot using numeric salary_val
-    fig = px.violin(
-        df,
-        x=xaxis,
-        y="salary_val",
-        box=True,
-        points="all",
-        color=xaxis,
-        hover_data=['job_id'],
-        title=title
-    )
+    layers = {}
+    if use_webgl(render, len(df)):
+        fig, layers = _webgl_violin(df, xaxis, title)
+    else:
+        fig = px.violin(
+            df,
+            x=xaxis,
+            y="salary_val",
+            box=True,
+            points="all",
+            color=xaxis,
+            hover_data=['job_id'],
+            title=title
+        )
 
     fig.update_layout(
         template="plotly_dark",
@@ -78,9 +72,44 @@ def plot_salary_distribution(db_path="preview_jobs.db", group_by="skill"):
     )
 
     # 5) Write out the HTML and auto-open in your browser
-    fig.write_html("salary_distribution.html", auto_open=True)
+    check_cancelled()
+    write_html(fig, "salary_distribution.html", layers, auto_open=True)
+
+
+def _webgl_violin(df, xaxis, title):
+    """
+    Violins (box inside) at x = 0, 1, 2 … with every salary as one jittered
+    Scattergl point to the left of its violin; the points are cut down to a
+    level-of-detail sample. Returns (figure, LOD layers).
+    """
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    groups = []
+    for i, (group, salaries) in enumerate(df.groupby(xaxis, sort=False)["salary_val"]):  # first-appearance order, like px
+        groups.append(group)
+        fig.add_trace(go.Violin(
+            x0=i, y=salaries, name=str(group),
+            side="positive", box_visible=True, points=False, line_color=palette[i % len(palette)]
+        ))
+
+    codes = df[xaxis].map({group: i for i, group in enumerate(groups)}).to_numpy()
+    jitter = np.random.default_rng(0).uniform(0.05, 0.4, size=len(df))
+    fig.add_trace(go.Scattergl(
+        x=codes - jitter,
+        y=df["salary_val"].to_numpy(),
+        mode="markers",
+        marker=dict(size=3, opacity=0.5, color=np.array(palette, dtype=object)[codes % len(palette)]),
+        customdata=df["job_id"].to_numpy(),
+        hovertemplate="job_id=%{customdata}<br>salary=%{y}<extra></extra>",
+        showlegend=False
+    ))
+    fig.update_layout(title=title, xaxis=dict(tickvals=list(range(len(groups))), ticktext=[str(g) for g in groups]))
+
+    points = len(fig.data) - 1
+    return fig, {points: level_of_detail(fig, points, lod_sample(len(df)))}
 
 
 if __name__ == "__main__":
     # Choose group_by="skill" or group_by="city"
-    plot_salary_distribution(group_by="skill")
+    from data_loader import load_corpus
+    plot_salary_distribution(load_corpus(), group_by="skill")
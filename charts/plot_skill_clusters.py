@@ -1,51 +1,27 @@
 import plotly.graph_objects as go
-import networkx as nx
 import numpy as np
 from pathlib import Path
 
-def plot_skill_clusters(job_skill_map, max_skills=1000, min_edge_weight=3):
+from backbone import DEFAULT_EDGE_BUDGET
+from charts.layout_cache import pooled_spring_layout
+from cooccurrence import cooccurrence_graph
+from task_scheduler import check_cancelled
+
+def plot_skill_clusters(corpus, max_skills=None, min_edge_weight=3, max_edges=DEFAULT_EDGE_BUDGET):
     print("Launching 3D skill cluster visualization...")
 
-    # Build co-occurrence graph
-    co_occurrence = {}
-    for skills in job_skill_map.values():
-        skills = list(skills)
-        for i in range(len(skills)):
-            for j in range(i + 1, len(skills)):
-                a, b = skills[i].lower(), skills[j].lower()
-                edge = tuple(sorted([a, b]))
-                co_occurrence[edge] = co_occurrence.get(edge, 0) + 1
-
-    G = nx.Graph()
-    for (a, b), weight in co_occurrence.items():
-        if weight >= min_edge_weight:
-            G.add_edge(a, b, weight=weight)
-
-    if len(G.nodes) > max_skills:
+    # Build co-occurrence graph (its backbone of at most max_edges edges)
+    G = cooccurrence_graph(corpus, required_only=True, min_weight=min_edge_weight, max_edges=max_edges)
+
+    if max_skills and len(G.nodes) > max_skills:
         top_nodes = sorted(G.degree, key=lambda x: x[1], reverse=True)[:max_skills]
         G = G.subgraph([n for n, _ in top_nodes]).copy()
 
-    pos = nx.spring_layout(G, dim=3, weight="weight", seed=42)
+    pos = pooled_spring_layout(G, dim=3, weight="weight", seed=42, cache_dir=corpus.cache_dir)
     coords = np.array([pos[n] for n in G.nodes()])
     labels = list(G.nodes())
     degrees = np.array([G.degree[n] for n in labels])
 
-    # Build edge map for JS
-    edge_segments = {}
-    edge_x_all, edge_y_all, edge_z_all = [], [], []
-
-    for i, (a, b) in enumerate(G.edges()):
-        x0, y0, z0 = pos[a]
-        x1, y1, z1 = pos[b]
-        
-        edge_segments.setdefault(a, []).append([x0, x1, None])
-        edge_segments.setdefault(b, []).append([x0, x1, None])
-        edge_segments.setdefault(a + "_y", []).append([y0, y1, None])
-        edge_segments.setdefault(b + "_y", []).append([y0, y1, None])
-        edge_segments.setdefault(a + "_z", []).append([z0, z1, None])
-        edge_segments.setdefault(b + "_z", []).append([z0, z1, None])
-
-
     # Initially blank edge trace
     edge_trace = go.Scatter3d(
         x=[],
@@ -128,4 +104,5 @@ def plot_skill_clusters(job_skill_map, max_skills=1000, min_edge_weight=3):
 
     # Final figure
     fig = go.Figure(data=[edge_trace, trace], layout=layout)
+    check_cancelled()
     fig.write_html("skill_clusters_3d.html", auto_open=True, include_plotlyjs='cdn', full_html=True)
\ No newline at end of file
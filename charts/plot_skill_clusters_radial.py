@@ -1,10 +1,15 @@
-import networkx as nx
 import numpy as np
 import plotly.graph_objects as go
 from sklearn.manifold import SpectralEmbedding
-from networkx.algorithms import community as nx_community
 
-def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1):
+from backbone import DEFAULT_EDGE_BUDGET
+from charts.trace_utils import graph_arrays, line_trace
+from communities import skill_communities
+from compute_pool import run
+from cooccurrence import cooccurrence_graph, top_neighbors
+from task_scheduler import check_cancelled
+
+def plot_skill_clusters_radial(corpus, max_skills=1000, min_edge_weight=1, max_edges=DEFAULT_EDGE_BUDGET):
     """
     Draw a 2D radial layout in which:
       - Each detected community is assigned its own wedge of the circle.
@@ -13,35 +18,21 @@ def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1
         ones near the rim.
       - Node color = community ID.
       - Hover text remains the skill name + top co‐occurring neighbors.
+      - Edges: the disparity-filter backbone, at most max_edges of them.
     """
     # ─── 1. Build co‐occurrence graph (same as before) ───────────────────────
-    co_occurrence = {}
-    for skills in job_skill_map.values():
-        skill_list = [s.lower() for s in skills]
-        for i in range(len(skill_list)):
-            for j in range(i + 1, len(skill_list)):
-                a, b = skill_list[i], skill_list[j]
-                edge = tuple(sorted([a, b]))
-                co_occurrence[edge] = co_occurrence.get(edge, 0) + 1
-
-    G = nx.Graph()
-    for (a, b), weight in co_occurrence.items():
-        if weight >= min_edge_weight:
-            G.add_edge(a, b, weight=weight)
+    G = cooccurrence_graph(corpus, required_only=True, min_weight=min_edge_weight, max_edges=max_edges)
 
     # ─── 1b. Ensure every skill (even with zero edges) is added as a node ─
-    all_skills = {s.lower() for skills in job_skill_map.values() for s in skills}
+    all_skills = corpus.skill_names(np.flatnonzero(corpus.skill_counts(required_only=True)))
     G.add_nodes_from(all_skills)
     
      # ─── Remove any skill‐node that has degree=0 (i.e. no “heavy” co‐occurrence) ──
     isolates = [node for node, deg in G.degree() if deg == 0]
     
-    from collections import Counter
-
-    flat_skills = [s.lower() for skills in job_skill_map.values() for s in skills]
-    freq = Counter(flat_skills)
+    freq = corpus.skill_counts(required_only=True)
     for iso in isolates:
-        print(f"{iso!r} appears in {freq[iso]} listing(s)")
+        print(f"{iso!r} appears in {freq[corpus.skills.get(iso)]} listing(s)")
 
     if isolates:
         #print(isolates)
@@ -56,11 +47,15 @@ def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1
         
         
 
-    # ─── 2. Detect communities ────────────────────────────────────────────────
-    try:
-        communities = list(nx_community.greedy_modularity_communities(G, weight="weight"))
-    except Exception:
-        communities = [set(G.nodes())]
+    # ─── 2. Communities: the shared (cached) Louvain clustering, restricted to G;
+    #        skills it leaves unclustered share one extra wedge
+    skill_labels = run(skill_communities, corpus)
+    node_labels = skill_labels[[corpus.skills.get(node) for node in G.nodes()]]
+    node_labels[node_labels < 0] = skill_labels.max() + 1
+    communities = [set() for _ in range(int(node_labels.max(initial=-1)) + 1)]
+    for node, label in zip(G.nodes(), node_labels.tolist()):
+        communities[label].add(node)
+    communities = [comm for comm in communities if comm]
 
     # Map each node → its community index
     node_to_comm = {}
@@ -95,11 +90,11 @@ def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1
     node_comm_ids = np.array([node_to_comm[n] for n in labels], dtype=int)
 
     hover_texts = []
+    neighbors = top_neighbors(corpus, k=10, required_only=True, min_weight=min_edge_weight)
     for node in labels:
         # Build hover text showing top neighbors
-        nbrs = [(nbr, G[node][nbr]["weight"]) for nbr in G.neighbors(node)]
-        nbrs_sorted = sorted(nbrs, key=lambda x: x[1], reverse=True)
-        lines = [f"{nbr} ({w})" for nbr, w in nbrs_sorted[:10]]
+        nbr_ids, weights = neighbors[corpus.skills.get(node)]
+        lines = [f"{nbr} ({w})" for nbr, w in zip(corpus.skill_names(nbr_ids), weights.tolist())]
         hover_texts.append(f"<b>{node}</b><br>" + "<br>".join(lines))
 
     # Precompute: for each community, sort its nodes by degree descending
@@ -132,25 +127,10 @@ def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1
         coords[i, 1] = y
 
     # ─── 6. Build edge‐lines (optional, but helpful to see strong co‐occurrences) ─
-    edge_x, edge_y = [], []
-    for u, v, data in G.edges(data=True):
-        i_u = labels.index(u)
-        i_v = labels.index(v)
-        # only draw if weight ≥ some threshold (e.g. ≥ 2 * min_edge_weight)
-        if data["weight"] >= min_edge_weight * 2:
-            x0, y0 = coords[i_u]
-            x1, y1 = coords[i_v]
-            edge_x += [x0, x1, None]
-            edge_y += [y0, y1, None]
-
-    edge_trace = go.Scatter(
-        x=edge_x,
-        y=edge_y,
-        mode="lines",
-        line=dict(color="rgba(200,200,200,0.2)", width=1),
-        hoverinfo="none",
-        showlegend=False
-    )
+    #        only edges with weight ≥ 2 * min_edge_weight, as one NaN-separated trace
+    _, _, u, v, edge_weights = graph_arrays(G, {n: coords[i] for i, n in enumerate(labels)})
+    strong = edge_weights >= min_edge_weight * 2
+    edge_trace = line_trace(coords, u[strong], v[strong], line=dict(color="rgba(200,200,200,0.2)", width=1))
 
     # 7a. Define the “high‐degree” threshold
     threshold = 200
@@ -243,4 +223,5 @@ def plot_skill_clusters_radial(job_skill_map, max_skills=1000, min_edge_weight=1
     )
     fig.update_yaxes(scaleanchor="x", scaleratio=1)
 
+    check_cancelled()
     fig.write_html("skill_clusters_2d_radial.html", auto_open=True, include_plotlyjs="cdn", full_html=True)
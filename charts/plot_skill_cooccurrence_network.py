@@ -1,82 +1,81 @@
 # charts/plot_skill_cooccurrence_network.py
 
-import sqlite3
-import pandas as pd
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
 import os
 import webbrowser
 
+from charts.layout_cache import pooled_spring_layout
+from charts.trace_utils import graph_arrays, line_trace
+from backbone import DEFAULT_EDGE_BUDGET
+from charts.webgl import level_of_detail, lod_sample, use_webgl, write_html
+from cooccurrence import approximate_pairs, cooccurrence_graph
+
 def plot_skill_cooccurrence_network(
+    corpus,
     user_selected_skills,
-    db_path="preview_jobs.db",
     min_edge_weight=5,
     min_node_degree=3,
     min_skill_degree_for_edges=50,
     spring_k=0.40,
-    spring_iterations=150
+    spring_iterations=150,
+    approximate=False,
+    render="auto",
+    max_edges=DEFAULT_EDGE_BUDGET
 ):
     """
     1) user_selected_skills: list of skill strings to exclude (already owned by the user)
-    2) Connects to preview_jobs.db
-    3) SELECT job_id, name FROM skills
+    2) corpus: the shared JobCorpus
+    3) Takes every job's skills from the corpus
     4) Build co-occurrence counts, then:
          • Keep only edges with weight ≥ min_edge_weight
-         • Remove nodes whose degree < min_node_degree
+         • max_edges set: cut the graph to its disparity-filter backbone of
+           at most that many edges (every skill keeps its heaviest edge)
+         • max_edges=None: remove nodes whose degree < min_node_degree
          • Remove any node in user_selected_skills
     5) Compute spring layout with k=spring_k
-    6) While drawing edges, skip any edge if either endpoint has degree < min_skill_degree_for_edges
+    6) max_edges=None only: while drawing edges, skip any edge if either
+       endpoint has degree < min_skill_degree_for_edges
     7) Plot nodes without on‐page labels (use hover instead)
     8) Save to 'skill_network_2d.html' and open it
+    The backbone already decides which edges of hubs and niche skills matter,
+    so the fixed degree prunes of steps 4 and 6 only apply without it.
+    approximate=True builds the graph from the sketched heavy-hitter pairs
+    (fixed memory; the error bounds are printed and shown in the title).
+    render: "webgl", "svg" or "auto" (WebGL for large graphs). With WebGL only
+    the LOD_POINTS highest-degree nodes (and their edges) are drawn until you
+    zoom in; zooming loads every node and edge in view.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
     # Normalize user_selected_skills
     excluded_set = set(s.strip().lower() for s in user_selected_skills)
 
-    conn = sqlite3.connect(db_path)
-    try:
-        df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-    except Exception as e:
-        print("ERROR reading from 'skills' table:", e)
-        conn.close()
-        return
-    conn.close()
-
-    if df.empty:
+    if corpus.skill_matrix.nnz == 0:
         print("No data found in 'skills' table.")
         return
 
-    # 1) Build co‐occurrence counts (skill pairs)
-    co_occ = {}
-    grouped = df.groupby("job_id")["skill"].apply(
-        lambda s: [x.strip().lower() for x in s.tolist()]
+    # 1–2) Co‐occurrence graph of skill pairs with weight ≥ min_edge_weight
+    G = cooccurrence_graph(
+        corpus, required_only=False, min_weight=min_edge_weight, approximate=approximate, max_edges=max_edges
     )
-    for slist in grouped:
-        for i in range(len(slist)):
-            for j in range(i + 1, len(slist)):
-                a, b = sorted([slist[i], slist[j]])
-                co_occ[(a, b)] = co_occ.get((a, b), 0) + 1
-
-    # 2) Build graph, but only add edges whose weight ≥ min_edge_weight
-    G = nx.Graph()
-    for (a, b), w in co_occ.items():
-        if w >= min_edge_weight:
-            G.add_edge(a, b, weight=w)
+    approx_note = ""
+    if approximate:
+        summary = approximate_pairs(corpus, required_only=False).summary()
+        print(summary)
+        approx_note = f"<br><sup>{summary}</sup>"
 
     if G.number_of_edges() == 0:
         print(f"No edges with weight ≥ {min_edge_weight}. Try lowering min_edge_weight.")
         return
 
-    # 3) Remove nodes whose degree < min_node_degree
-    low_deg_nodes = [n for n, d in G.degree() if d < min_node_degree]
-    G.remove_nodes_from(low_deg_nodes)
+    # 3) Without a backbone: remove nodes whose degree < min_node_degree
+    if max_edges is None:
+        low_deg_nodes = [n for n, d in G.degree() if d < min_node_degree]
+        G.remove_nodes_from(low_deg_nodes)
 
-    if G.number_of_nodes() == 0:
-        print(f"No nodes with degree ≥ {min_node_degree}. Try lowering min_node_degree.")
-        return
+        if G.number_of_nodes() == 0:
+            print(f"No nodes with degree ≥ {min_node_degree}. Try lowering min_node_degree.")
+            return
 
     # 4) Remove any nodes that the user has already selected
     G.remove_nodes_from(excluded_set.intersection(G.nodes()))
@@ -87,46 +86,35 @@ def plot_skill_cooccurrence_network(
 
     # 5) Recompute degrees (after removal) for edge filtering and sizes
     deg = dict(G.degree())
-    # 6) Compute spring layout
-    pos = nx.spring_layout(G, k=spring_k, iterations=spring_iterations)
+    # 6) Compute spring layout (cached; warm-started from the previous one)
+    pos = pooled_spring_layout(G, k=spring_k, iterations=spring_iterations, cache_dir=corpus.cache_dir)
     # pos = nx.kamada_kawai_layout(G)
 
 
-    # 7) Build edge traces, skipping edges where either node's degree < min_skill_degree_for_edges
-    edge_x, edge_y = [], []
-    for u, v, data in G.edges(data=True):
-        if deg[u] < min_skill_degree_for_edges or deg[v] < min_skill_degree_for_edges:
-            continue
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-
-    edge_trace = go.Scatter(
-        x=edge_x,
-        y=edge_y,
-        mode="lines",
-        line=dict(width=0.5, color="gray"),
-        hoverinfo="none"
-    )
+    # 7) Build edge trace (one NaN-separated segment array); without a
+    #    backbone, skip edges where either node's degree < min_skill_degree_for_edges
+    nodes, coords, u, v, edge_weights = graph_arrays(G, pos)
+    node_deg = np.array([deg[n] for n in nodes])
+    if max_edges is None:
+        shown = (node_deg[u] >= min_skill_degree_for_edges) & (node_deg[v] >= min_skill_degree_for_edges)
+        u, v, edge_weights = u[shown], v[shown], edge_weights[shown]
+    webgl = use_webgl(render, len(nodes) + len(u))
+    edge_trace = line_trace(coords, u, v, webgl, line=dict(width=0.5, color="gray"), showlegend=True)
 
     # 8) Build node trace (no on‐page labels, use hover)
-    nodes = list(G.nodes())
-    node_x = [pos[n][0] for n in nodes]
-    node_y = [pos[n][1] for n in nodes]
-    node_deg = [deg[n] for n in nodes]
     hover_text = [f"{n} (degree={deg[n]})" for n in nodes]
 
-    node_trace = go.Scatter(
-        x=node_x,
-        y=node_y,
+    scatter = go.Scattergl if webgl else go.Scatter
+    node_trace = scatter(
+        x=coords[:, 0],
+        y=coords[:, 1],
         mode="markers",
         marker=dict(
-            size=[3 + d * 0.3 for d in node_deg],
+            size=3 + node_deg * 0.3,
             color=node_deg,
             colorscale="Bluered",
             cmin=0,
-            cmax=max(node_deg),
+            cmax=node_deg.max(),
             line_width=0.5
         ),
         hovertext=hover_text,
@@ -136,11 +124,28 @@ def plot_skill_cooccurrence_network(
 
     # 9) Create figure
     fig = go.Figure(data=[edge_trace, node_trace])
+    layers = {}
+    if webgl:
+        # Level of detail: highest-degree nodes and the heaviest edges among them first
+        top_nodes = lod_sample(len(nodes), priority=node_deg)
+        in_top = np.zeros(len(nodes), dtype=bool)
+        in_top[top_nodes] = True
+        top_edges = np.flatnonzero(in_top[u] & in_top[v])
+        top_edges = top_edges[lod_sample(len(top_edges), priority=edge_weights[top_edges])]
+        layers = {
+            0: level_of_detail(fig, 0, top_edges, stride=3),
+            1: level_of_detail(fig, 1, top_nodes),
+        }
     fig.update_layout(
         title=(
             "Skill Co‐occurrence Network (2D Force‐Directed)<br>"
-            f"(Edges≥{min_edge_weight}, Nodes≥deg{min_node_degree}, "
-            f"Edges drawn only if both endpoints ≥ deg{min_skill_degree_for_edges})"
+            + (
+                f"(Edges≥{min_edge_weight}, Nodes≥deg{min_node_degree}, "
+                f"Edges drawn only if both endpoints ≥ deg{min_skill_degree_for_edges})"
+                if max_edges is None else
+                f"(Edges≥{min_edge_weight}, disparity backbone of ≤{max_edges:,} edges)"
+            )
+            + approx_note
         ),
         xaxis=dict(showgrid=False, zeroline=False, visible=False),
         yaxis=dict(showgrid=False, zeroline=False, visible=False),
@@ -150,7 +155,7 @@ def plot_skill_cooccurrence_network(
 
     # 10) Save & open HTML
     out_file = "skill_network_2d.html"
-    fig.write_html(out_file, auto_open=False)
+    write_html(fig, out_file, layers, auto_open=False)
     print(f"Saved network graph to '{out_file}'")
     abs_path = os.path.abspath(out_file)
     webbrowser.open(f"file://{abs_path}")
@@ -158,4 +163,5 @@ def plot_skill_cooccurrence_network(
 
 if __name__ == "__main__":
     # Example standalone usage; exclude no skills:
-    plot_skill_cooccurrence_network(user_selected_skills=[]) 
+    from data_loader import load_corpus
+    plot_skill_cooccurrence_network(load_corpus(), user_selected_skills=[])
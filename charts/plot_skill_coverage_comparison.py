@@ -1,53 +1,40 @@
-from collections import defaultdict
+import numpy as np
 import matplotlib.pyplot as plt
 
-def plot_skill_coverage_comparison(job_skill_map, user_skills: list[str]):
-    user_skills = set(skill.lower() for skill in user_skills)
+def plot_skill_coverage_comparison(corpus, user_skills: list[str]):
+    X = corpus.skill_indicator(required_only=True)
+    has_skills = corpus.jobs_with_skills(required_only=True)
+    user_mask = corpus.skill_mask(user_skills)
 
-    # Build reverse mapping: skill -> set of jobs
-    skill_to_jobs = defaultdict(set)
-    for job_id, skills in job_skill_map.items():
-        for skill in skills:
-            skill_to_jobs[skill.lower()].add(job_id)
+    # Missing required skills per job = row size − required skills the user has
+    def missing_per_job(skill_mask):
+        return np.diff(X.indptr) - X @ skill_mask.astype(np.int32)
 
     # Determine fully matched jobs with current user skills
-    fully_matched_jobs = set()
-    for job_id, skills in job_skill_map.items():
-        if set(skill.lower() for skill in skills).issubset(user_skills):
-            fully_matched_jobs.add(job_id)
+    missing = missing_per_job(user_mask)
+    fully_matched_jobs = has_skills & (missing == 0)
 
-    # Now simulate adding one skill at a time to see how many *new* jobs it unlocks
-    remaining_skills = set(skill_to_jobs.keys()) - user_skills
-    seen_jobs = fully_matched_jobs.copy()
-    unlock_recommendations = []
+    # A job is unlocked by adding one skill exactly when it's missing only that
+    # skill, so count the missing skill of every job that's one short.
+    one_short = has_skills & (missing == 1) & ~fully_matched_jobs
+    unlock_counts = np.asarray(X[one_short].sum(axis=0)).ravel()
+    unlock_counts[user_mask] = 0
 
-    for skill in remaining_skills:
-        unlocked_jobs = set()
-        test_skills = user_skills | {skill}
-        for job_id, skills in job_skill_map.items():
-            skill_set = set(skill.lower() for skill in skills)
-            if skill_set.issubset(test_skills) and job_id not in seen_jobs:
-                unlocked_jobs.add(job_id)
-        if unlocked_jobs:
-            unlock_recommendations.append((skill, len(unlocked_jobs)))
-    
     # Sort by most jobs newly unlocked
-    unlock_recommendations.sort(key=lambda x: x[1], reverse=True)
-    top_unlocks = unlock_recommendations[:10]
+    order = np.argsort(-unlock_counts, kind="stable")
+    order = order[unlock_counts[order] > 0][:10]
+    top_unlocks = list(zip(corpus.skill_names(order).tolist(), unlock_counts[order].tolist()))
 
     # Prepare chart: 2 lines – current vs optimal unlock
-    total_jobs = len(job_skill_map)
-    current_skills = user_skills.copy()
-    current_coverage = [len(fully_matched_jobs) / total_jobs * 100]
+    total_jobs = int(has_skills.sum())
+    current_mask = user_mask.copy()
+    current_coverage = [fully_matched_jobs.sum() / total_jobs * 100]
     added_skills = []
 
-    for skill, _ in top_unlocks:
+    for skill_id, (skill, _) in zip(order, top_unlocks):
         added_skills.append(skill)
-        current_skills.add(skill)
-        matched = 0
-        for job_id, skills in job_skill_map.items():
-            if set(skill.lower() for skill in skills).issubset(current_skills):
-                matched += 1
+        current_mask[skill_id] = True
+        matched = int((has_skills & (missing_per_job(current_mask) == 0)).sum())
         current_coverage.append(matched / total_jobs * 100)
 
     # X-axis: 0 skills, 1 skill, ..., N skills
@@ -77,6 +64,6 @@ def plot_skill_coverage_comparison(job_skill_map, user_skills: list[str]):
     )
 
     plt.tight_layout()
-    plt.subplots_adjust(right=0.85)  
+    plt.subplots_adjust(right=0.85)
     plt.show()
 
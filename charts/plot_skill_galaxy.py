@@ -1,36 +1,29 @@
 import plotly.graph_objects as go
-import networkx as nx
 import numpy as np
 
-def plot_skill_galaxy(job_skill_map, show_edges=True):
-    # Step 1: Build co-occurrence graph
-    co_occurrence = {}
-    for skills in job_skill_map.values():
-        skills = list(skills)
-        for i in range(len(skills)):
-            for j in range(i + 1, len(skills)):
-                a, b = skills[i].lower(), skills[j].lower()
-                edge = tuple(sorted([a, b]))
-                co_occurrence[edge] = co_occurrence.get(edge, 0) + 1
-
-    G = nx.Graph()
-    for (a, b), weight in co_occurrence.items():
-        if weight >= 3:
-            G.add_edge(a, b, weight=weight)
+from backbone import DEFAULT_EDGE_BUDGET
+from charts.layout_cache import pooled_spring_layout
+from charts.trace_utils import graph_arrays, line_trace
+from cooccurrence import approximate_pairs, cooccurrence_graph
+from task_scheduler import check_cancelled
+
+def plot_skill_galaxy(corpus, show_edges=True, approximate=False, max_edges=DEFAULT_EDGE_BUDGET):
+    # Step 1: Build co-occurrence graph (approximate: sketched heavy-hitter pairs only),
+    #         cut to its backbone of at most max_edges edges
+    G = cooccurrence_graph(corpus, required_only=True, min_weight=3, approximate=approximate, max_edges=max_edges)
+    title = "Skill Galaxy (3D)"
+    if approximate:
+        summary = approximate_pairs(corpus, required_only=True).summary()
+        print(summary)
+        title += f"<br><sup>{summary}</sup>"
 
     # 3D spring layout
-    pos = nx.spring_layout(G, dim=3, seed=42, weight='weight')
-    node_x, node_y, node_z, node_labels = [], [], [], []
-    for node in G.nodes():
-        x, y, z = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_z.append(z)
-        node_labels.append(node)
+    pos = pooled_spring_layout(G, dim=3, seed=42, weight='weight', cache_dir=corpus.cache_dir)
+    node_labels, coords, u, v, _ = graph_arrays(G, pos, dim=3)
 
     # Plot nodes
     node_trace = go.Scatter3d(
-        x=node_x, y=node_y, z=node_z,
+        x=coords[:, 0], y=coords[:, 1], z=coords[:, 2],
         mode='markers+text',
         text=node_labels,
         textposition='top center',
@@ -42,34 +35,12 @@ def plot_skill_galaxy(job_skill_map, show_edges=True):
         )
     )
 
-    # Plot edges
-    edge_x, edge_y, edge_z, edge_colors = [], [], [], []
-    weights = [d['weight'] for _, _, d in G.edges(data=True)]
-    min_w, max_w = min(weights, default=1), max(weights, default=10)
-
-    def weight_to_color(w):
-        norm = (w - min_w) / (max_w - min_w + 1e-5)
-        return f"rgb({int(255 * norm)}, 0, {int(255 * (1 - norm))})"  # red to blue
-
-    for a, b, data in G.edges(data=True):
-        x0, y0, z0 = pos[a]
-        x1, y1, z1 = pos[b]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        edge_z += [z0, z1, None]
-        edge_colors.append(weight_to_color(data['weight']))
-
-    edge_trace = go.Scatter3d(
-        x=edge_x, y=edge_y, z=edge_z,
-        mode='lines',
-        line=dict(width=1, color='gray'),
-        hoverinfo='none',
-        opacity=0.5
-    )
+    # Plot edges (one NaN-separated segment array)
+    edge_trace = line_trace(coords, u, v, line=dict(width=1, color='gray'), opacity=0.5)
 
     fig = go.Figure(data=[edge_trace, node_trace])
     fig.update_layout(
-        title="Skill Galaxy (3D)",
+        title=title,
         title_font_size=20,
         showlegend=False,
         margin=dict(l=0, r=0, b=0, t=40),
@@ -82,4 +53,5 @@ def plot_skill_galaxy(job_skill_map, show_edges=True):
         )
     )
 
+    check_cancelled()
     fig.show()
@@ -1,57 +1,35 @@
 # plot_skill_gap_analysis.py
 
-import sqlite3
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import sys
 
-def plot_skill_gap_analysis(user_skills, db_path="preview_jobs.db"):
-    # Normalize the user's skills into a lowercase set
-    user_set = set(s.strip().lower() for s in user_skills)
-
-    conn = sqlite3.connect(db_path)
-
+def plot_skill_gap_analysis(corpus, user_skills):
     # ─── STEP 1 ───
-    # Pull every (job_id, skill_name) pair from the 'skills' table.
-    # If you also want to filter by salary_avg <= 200k, you can join jobs here.
-    sql = """
-        SELECT 
-            s.job_id,
-            s.name AS skill
-        FROM skills AS s
-        INNER JOIN jobs AS j
-            ON s.job_id = j.job_id
-        WHERE j.salary_avg IS NOT NULL
-          AND j.salary_avg <= 200000
-    """
-    df = pd.read_sql_query(sql, conn)
-    conn.close()
+    # Every (job, skill) pair of postings with salary_avg <= 200k.
+    X = corpus.skill_indicator()
+    salary_ok = corpus.listed & (corpus.salary_avg <= 200000)
+    user_mask = corpus.skill_mask(user_skills)
 
     # ─── STEP 2 ───
-    # df now has columns ['job_id', 'skill'], one row per skill usage.
-    df['skill'] = df['skill'].str.strip().str.lower()
-
-    # Build each posting's skill set as a Python set
-    posting_sets = df.groupby('job_id')['skill'].apply(set).to_dict()
+    # For each job, count which skills you’re missing (req_set − user_set).
+    missing = np.diff(X.indptr) - X @ user_mask.astype(np.int32)
 
     # ─── STEP 3 ───
-    # For each job, compute which skills you’re missing (req_set − user_set).
     # Only count jobs where you’re missing at most 3 skills (tune threshold as desired).
-    missing_counts = {}
-    for job_id, req_set in posting_sets.items():
-        missing = req_set - user_set
-        if 0 < len(missing) <= 3:  # tune this “≤ 3” threshold if you like
-            for skill in missing:
-                missing_counts[skill] = missing_counts.get(skill, 0) + 1
+    rows = salary_ok & (missing > 0) & (missing <= 3)
+    missing_counts = np.asarray(X[rows].sum(axis=0)).ravel()
+    missing_counts[user_mask] = 0
 
     # ─── STEP 4 ───
-    # Convert to a DataFrame and keep only the top 10 “most‐frequently missing” skills.
-    gap_df = (
-        pd.DataFrame.from_dict(missing_counts, orient='index', columns=['frequency'])
-          .nlargest(10, 'frequency')
-          .reset_index()
-          .rename(columns={'index': 'skill'})
-    )
+    # Keep only the top 10 “most‐frequently missing” skills.
+    top = np.argsort(-missing_counts, kind="stable")[:10]
+    top = top[missing_counts[top] > 0]
+    gap_df = pd.DataFrame({
+        'skill': corpus.skill_names(top),
+        'frequency': missing_counts[top],
+    })
 
     # ─── STEP 5 ───
     # Plot a horizontal bar chart of “top 10 missing skills you’d need to add.”
@@ -74,4 +52,5 @@ def plot_skill_gap_analysis(user_skills, db_path="preview_jobs.db"):
 if __name__ == "__main__":
     # Usage: python plot_skill_gap_analysis.py "python,sql,power bi"
     user_skills = sys.argv[1].split(',') if len(sys.argv) > 1 else ["python", "sql"]
-    plot_skill_gap_analysis(user_skills)
+    from data_loader import load_corpus
+    plot_skill_gap_analysis(load_corpus(), user_skills)
@@ -1,81 +1,68 @@
 # charts/plot_skill_gap_similarity_matrix.py
 
-import sqlite3
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import os
 import webbrowser
-from collections import Counter
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+from task_scheduler import check_cancelled
 
-def plot_skill_gap_similarity_matrix(user_skills, db_path="preview_jobs.db"):
+def missing_skill_cooccurrence(corpus, user_skills, top_n=20):
     """
-    1) user_skills: list of skills the user already has (e.g. ["python","sql"])
-    2) Connect to preview_jobs.db
-    3) SELECT job_id, name AS skill FROM skills
-    4) Build each job’s full skill set, subtract user_skills → missing‐skill sets
-    5) Identify top 20 most frequent missing skills
-    6) Build a co‐occurrence matrix among those top 20 missing skills
-    7) Plot a heatmap and open it in the browser
+    (top skill IDs, top_n×top_n count matrix) of the most frequent skills the
+    user lacks: M is the job×skill indicator restricted to those columns, and
+    the matrix is the single sparse product Mᵀ·M (diagonal = skill counts).
     """
-    # 1) Normalize user_skills
-    user_set = set(s.strip().lower() for s in user_skills)
+    X = corpus.skill_indicator(required_only=False)
+    counts = np.bincount(X.indices, minlength=corpus.n_skills)
+    counts[corpus.skill_mask(user_skills)] = 0
+    candidates = np.flatnonzero(counts)
+    top_ids = candidates[np.lexsort((candidates, -counts[candidates]))[:top_n]]
+    M = X.tocsc()[:, top_ids].astype(np.int64)
+    return top_ids, (M.T @ M).toarray()
 
-    # 2) Validate database file
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
 
-    conn = sqlite3.connect(db_path)
-    try:
-        # 3) Read every (job_id, skill) pair from the 'skills' table
-        df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-    except Exception as e:
-        print("ERROR reading from 'skills' table:", e)
-        conn.close()
-        return
-    conn.close()
+def cluster_order(mat):
+    """Leaf order of an average-linkage clustering on Jaccard distance between skills."""
+    if len(mat) < 3:
+        return np.arange(len(mat))
+    counts = np.diag(mat).astype(float)
+    union = counts[:, None] + counts[None, :] - mat
+    distance = 1.0 - np.divide(mat, union, out=np.zeros_like(union), where=union > 0)
+    np.fill_diagonal(distance, 0.0)
+    return leaves_list(linkage(squareform(distance, checks=False), method="average"))
 
-    if df.empty:
+
+def plot_skill_gap_similarity_matrix(corpus, user_skills, top_n=20, cluster=True):
+    """
+    1) user_skills: list of skills the user already has (e.g. ["python","sql"])
+    2) corpus: the shared JobCorpus
+    3) Drop the user's skills from the job×skill indicator matrix → missing skills
+    4) Identify the top_n most frequent missing skills (hundreds are fine)
+    5) Co‐occurrence matrix among them as one sparse Mᵀ·M product
+    6) cluster=True: order rows/columns by hierarchical clustering so related
+       skills form blocks along the diagonal
+    7) Plot a heatmap and open it in the browser
+    """
+    if corpus.skill_matrix.nnz == 0:
         print("No data found in 'skills' table.")
         return
 
-    # 4) Build per‐job skill sets
-    df['skill'] = df['skill'].str.strip().str.lower()
-    posting_skills = df.groupby("job_id")["skill"].apply(set).to_dict()
-
-    # 5) Build a list of missing‐skill sets per job
-    missing_list = []
-    for job_id, req_set in posting_skills.items():
-        missing = req_set - user_set
-        if missing:
-            missing_list.append(missing)
+    # 3–5) Top missing skills and their co‐occurrence counts
+    top_ids, mat = missing_skill_cooccurrence(corpus, user_skills, top_n)
 
-    if not missing_list:
+    if not len(top_ids):
         print("No missing skills found (maybe you already have every skill?).")
         return
 
-    # 6) Count frequencies of each missing skill
-    counter = Counter()
-    for missing in missing_list:
-        counter.update(missing)
-    top_missing = [skill for skill, _ in counter.most_common(20)]
-
-    if not top_missing:
-        print("No missing skills appear more than once.")
-        return
-
-    # 7) Build co‐occurrence matrix among top_missing
-    n = len(top_missing)
-    mat = np.zeros((n, n), dtype=int)
-    for missing in missing_list:
-        relevant = [s for s in missing if s in top_missing]
-        for i, s1 in enumerate(top_missing):
-            for j, s2 in enumerate(top_missing):
-                if s1 in relevant and s2 in relevant:
-                    mat[i, j] += 1
+    # 6) Clustered ordering
+    if cluster:
+        order = cluster_order(mat)
+        top_ids, mat = top_ids[order], mat[np.ix_(order, order)]
+    top_missing = corpus.skill_names(top_ids).tolist()
 
-    # 8) Plot heatmap
+    # 7) Plot heatmap
     fig = px.imshow(
         mat,
         x=top_missing,
@@ -85,7 +72,11 @@ def plot_skill_gap_similarity_matrix(user_skills, db_path="preview_jobs.db"):
         title="Missing‐Skill Co‐Occurrence (Given Your Current Skills)"
     )
     fig.update_layout(template="plotly_dark")
+    if len(top_missing) > 60:
+        fig.update_xaxes(showticklabels=False)
+        fig.update_yaxes(showticklabels=False)
     out_file = "skill_gap_similarity_matrix.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved heatmap to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -94,4 +85,5 @@ def plot_skill_gap_similarity_matrix(user_skills, db_path="preview_jobs.db"):
 
 if __name__ == "__main__":
     # Example standalone call; replace with actual user skills
-    plot_skill_gap_similarity_matrix(["python", "sql"])
+    from data_loader import load_corpus
+    plot_skill_gap_similarity_matrix(load_corpus(), ["python", "sql"])
@@ -1,41 +1,52 @@
 # plot_skill_network.py
-from collections import defaultdict
-from itertools import combinations
 import networkx as nx
 import matplotlib.pyplot as plt
 
-def compute_skill_edges(job_skill_map):
+from charts.layout_cache import pooled_spring_layout
+from cooccurrence import edge_dict
+
+def compute_skill_edges(corpus):
     """
     Computes weighted edges between skills based on co-occurrence in job postings.
 
     Args:
-        job_skill_map (dict): job_id → set of skills
+        corpus (JobCorpus): shared corpus; only required skills are paired
 
     Returns:
         dict: (skill1, skill2) → count of co-occurrences
     """
-    edge_weights = defaultdict(int)
-    for skills in job_skill_map.values():
-        skill_list = [s.lower() for s in skills]
-        for skill1, skill2 in combinations(set(skill_list), 2):
-            key = tuple(sorted([skill1, skill2]))
-            edge_weights[key] += 1
-    return edge_weights
+    return edge_dict(corpus, required_only=True)
 
-def plot_skill_network(edge_weights, min_weight=5):
+def skill_network_layout(edge_weights, min_weight=5, cache_dir=None):
     """
-    Plots a network graph of skills where edge thickness = co-occurrence frequency.
+    Builds the skill graph and its layout (the expensive part; safe to run
+    off the Tk thread).
 
     Args:
         edge_weights (dict): (skill1, skill2) → weight
         min_weight (int): minimum weight for edge to be shown
+        cache_dir (str): layout cache directory (corpus.cache_dir); None disables caching
+
+    Returns:
+        (nx.Graph, dict): the graph and its node positions
     """
     G = nx.Graph()
     for (skill1, skill2), weight in edge_weights.items():
         if weight >= min_weight:
             G.add_edge(skill1, skill2, weight=weight)
 
-    pos = nx.spring_layout(G, k=0.3, iterations=50)
+    pos = pooled_spring_layout(G, k=0.3, iterations=50, cache_dir=cache_dir)
+    return G, pos
+
+def compute_skill_network(corpus, min_weight=5):
+    """Edges and layout of the corpus' skill network: (G, pos) for draw_skill_network."""
+    return skill_network_layout(compute_skill_edges(corpus), min_weight, corpus.cache_dir)
+
+def draw_skill_network(G, pos):
+    """
+    Draws a laid-out skill graph with matplotlib (edge thickness =
+    co-occurrence frequency); must run on the GUI thread.
+    """
     edges = G.edges(data=True)
     weights = [d["weight"] for (_, _, d) in edges]
 
@@ -52,3 +63,14 @@ def plot_skill_network(edge_weights, min_weight=5):
     plt.title("Skill Co-Occurrence Network")
     plt.tight_layout()
     plt.show()
+
+def plot_skill_network(edge_weights, min_weight=5, cache_dir=None):
+    """
+    Plots a network graph of skills where edge thickness = co-occurrence frequency.
+
+    Args:
+        edge_weights (dict): (skill1, skill2) → weight
+        min_weight (int): minimum weight for edge to be shown
+        cache_dir (str): layout cache directory (corpus.cache_dir); None disables caching
+    """
+    draw_skill_network(*skill_network_layout(edge_weights, min_weight, cache_dir))
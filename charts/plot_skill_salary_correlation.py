@@ -1,60 +1,40 @@
 # charts/plot_skill_salary_correlation.py
 
-import sqlite3
 import pandas as pd
 import numpy as np
 import plotly.express as px
 from scipy.stats import pearsonr
 import os
 import webbrowser
+from task_scheduler import check_cancelled
 
-def plot_skill_salary_correlation(db_path="preview_jobs.db"):
+def plot_skill_salary_correlation(corpus):
     """
-    1) Connect to preview_jobs.db
-    2) SELECT job_id, salary_avg, skill_name FROM jobs ↔ skills
+    1) Take the shared JobCorpus
+    2) Join job salary_avg ↔ skill names
     3) Build a one‐hot matrix of skills per job, join salary_avg
     4) Compute Pearson correlation (skill presence vs. salary)
     5) Plot top 20 positive correlations
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        # 2) Grab job_id, numeric salary (salary_avg), and skill name
-        sql = """
-            SELECT
-                j.job_id,
-                j.salary_avg AS salary_val,
-                s.name       AS skill
-            FROM jobs AS j
-            INNER JOIN skills AS s
-                ON j.job_id = s.job_id
-            WHERE j.salary_avg IS NOT NULL
-                AND j.salary_avg <= 200000
-                AND j.salary_avg >= 25000
-        """
-        df = pd.read_sql_query(sql, conn)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # 2) job_row, numeric salary (salary_avg), and skill name
+    jobs = corpus.job_frame()
+    jobs = jobs[(jobs["salary_avg"] <= 200000) & (jobs["salary_avg"] >= 25000)]
+    df = (
+        corpus.skill_frame()[["job_row", "skill"]]
+        .merge(jobs[["job_row", "salary_avg"]], on="job_row", how="inner")
+        .rename(columns={"salary_avg": "salary_val"})
+    )
 
     if df.empty:
         print("No salary/skill data found.")
         return
 
     # 3) Build one‐hot matrix of skills per job
-    #    First, ensure lowercase/stripped skills
-    df['skill'] = df['skill'].str.strip().str.lower()
-
     #    Use crosstab to get 1 if skill present in job, 0 otherwise
-    one_hot = pd.crosstab(df['job_id'], df['skill']).astype(int)
+    one_hot = pd.crosstab(df['job_row'], df['skill']).astype(int)
 
-    #    Now bring in salary_val per job_id
-    salary_map = df[['job_id', 'salary_val']].drop_duplicates().set_index('job_id')['salary_val']
+    #    Now bring in salary_val per job
+    salary_map = df[['job_row', 'salary_val']].drop_duplicates().set_index('job_row')['salary_val']
     data = one_hot.join(salary_map, how='inner')
 
     # 4) Compute Pearson r for each skill
@@ -92,6 +72,7 @@ def plot_skill_salary_correlation(db_path="preview_jobs.db"):
     )
 
     out_file = "skill_salary_correlation.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -99,4 +80,5 @@ def plot_skill_salary_correlation(db_path="preview_jobs.db"):
 
 
 if __name__ == "__main__":
-    plot_skill_salary_correlation()
+    from data_loader import load_corpus
+    plot_skill_salary_correlation(load_corpus())
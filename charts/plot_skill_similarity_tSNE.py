@@ -1,74 +1,54 @@
 import os
-import sqlite3
-import pandas as pd
-import numpy as np
 import webbrowser
 import warnings
 
-# ── Prevent loky from spawning WMIC subprocess on Windows ─────────────────────
-os.environ["LOKY_MAX_CPU_COUNT"] = "1"
+# ── Prevent loky from spawning WMIC subprocess on Windows (without capping it to one core)
+os.environ.setdefault("LOKY_MAX_CPU_COUNT", str(os.cpu_count() or 1))
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.manifold import TSNE
 import plotly.express as px
 
+from charts.webgl import level_of_detail, lod_sample, use_webgl, write_html
+from compute_pool import run
+from task_scheduler import check_cancelled
 
-def plot_skill_similarity_tSNE(db_path="preview_jobs.db", perplexity=30, max_iter=500):
+
+def compute_skill_tsne(corpus, perplexity=30, max_iter=500):
     """
-    1) Load job_id, job_title, company, salary_avg from jobs, and skill name from skills.
-    2) Build a 'skill_doc' per job by joining all its skills into one string.
-    3) Compute TF-IDF vectors on these skill-documents.
-    4) Run t-SNE (with warnings suppressed) to reduce TF-IDF vectors to 2D.
-    5) Plot a scatter where each point is a job:
-         • x = tsne_x
-         • y = tsne_y
-         • color = salary_avg
-         • hover shows job_title, company, salary_avg
+    Compute phase (steps 1–4 below; runs in the process pool): a DataFrame
+    of job_title, company, salary_avg, tsne_x, tsne_y per job, or None.
     """
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    # 1) Load jobs and skills
-    conn = sqlite3.connect(db_path)
-    try:
-        job_df = pd.read_sql_query(
-            "SELECT job_id, title AS job_title, company, salary_avg FROM jobs",
-            conn
-        )
-        skill_df = pd.read_sql_query("SELECT job_id, name AS skill FROM skills", conn)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # 1) Jobs and skills from the shared corpus
+    job_df = corpus.job_frame()[["job_row", "title", "company", "salary_avg"]]
+    job_df = job_df.rename(columns={"title": "job_title"})
+    skill_df = corpus.skill_frame()[["job_row", "skill"]]
 
     if job_df.empty or skill_df.empty:
         print("No data found in jobs or skills tables.")
-        return
+        return None
 
     # Only keep jobs that already have a numeric salary_avg
     job_df = job_df.dropna(subset=["salary_avg"])
-    valid_ids = set(job_df["job_id"])
+    valid_rows = set(job_df["job_row"])
 
-    # Filter skills to only those valid job_ids
-    skill_df = skill_df[skill_df["job_id"].isin(valid_ids)].copy()
-    skill_df["skill"] = skill_df["skill"].str.strip().str.lower()
+    # Filter skills to only those valid jobs
+    skill_df = skill_df[skill_df["job_row"].isin(valid_rows)]
 
     # 2) Aggregate skills per job into a single 'skill_doc' column
     skill_docs = (
         skill_df
-        .groupby("job_id")["skill"]
+        .groupby("job_row")["skill"]
         .agg(" ".join)
         .reset_index()
         .rename(columns={"skill": "skill_doc"})
     )
 
     # Merge with job_df to get job_title, company, salary_avg, and skill_doc
-    merged = job_df.merge(skill_docs, on="job_id", how="inner")
+    merged = job_df.merge(skill_docs, on="job_row", how="inner")
     if merged.empty:
         print("No jobs with both salary and skills.")
-        return
+        return None
 
     # 3) Compute TF-IDF on 'skill_doc'
     vectorizer = TfidfVectorizer()
@@ -82,8 +62,32 @@ def plot_skill_similarity_tSNE(db_path="preview_jobs.db", perplexity=30, max_ite
 
     merged["tsne_x"] = embeddings[:, 0]
     merged["tsne_y"] = embeddings[:, 1]
+    return merged[["job_title", "company", "salary_avg", "tsne_x", "tsne_y"]]
+
+
+def plot_skill_similarity_tSNE(corpus, perplexity=30, max_iter=500, render="auto"):
+    """
+    1) Take job_title, company, salary_avg and skill names from the shared corpus.
+    2) Build a 'skill_doc' per job by joining all its skills into one string.
+    3) Compute TF-IDF vectors on these skill-documents.
+    4) Run t-SNE (with warnings suppressed) to reduce TF-IDF vectors to 2D.
+    5) Plot a scatter where each point is a job:
+         • x = tsne_x
+         • y = tsne_y
+         • color = salary_avg
+         • hover shows job_title, company, salary_avg
+    render: "webgl", "svg" or "auto" (WebGL for large corpora). With WebGL a
+    sample of LOD_POINTS jobs is drawn until you zoom in.
+    Steps 1–4 are compute_skill_tsne, run in the compute pool; only the
+    embedding comes back for step 5.
+    """
+    # 1)–4) Compute phase in the process pool (compute_skill_tsne)
+    merged = run(compute_skill_tsne, corpus, perplexity, max_iter)
+    if merged is None:
+        return
 
     # 5) Plot with Plotly
+    webgl = use_webgl(render, len(merged))
     fig = px.scatter(
         merged,
         x="tsne_x",
@@ -92,16 +96,23 @@ def plot_skill_similarity_tSNE(db_path="preview_jobs.db", perplexity=30, max_ite
         size_max=8,
         hover_data=["job_title", "company", "salary_avg"],
         color_continuous_scale="Viridis",
-        title="t-SNE of Jobs by Skill TF-IDF (Colored by Salary)"
+        title="t-SNE of Jobs by Skill TF-IDF (Colored by Salary)",
+        render_mode="webgl" if webgl else "svg"
     )
     fig.update_layout(template="plotly_dark")
+    layers = {}
+    if webgl:
+        # Level of detail: a random sample of jobs until the user zooms in
+        layers = {i: level_of_detail(fig, i, lod_sample(len(trace.x))) for i, trace in enumerate(fig.data)}
 
     out_file = "skill_similarity_tsne.html"
-    fig.write_html(out_file, auto_open=False)
+    check_cancelled()
+    write_html(fig, out_file, layers, auto_open=False)
     print(f"Saved t-SNE plot to '{out_file}'")
     abs_path = os.path.abspath(out_file)
     webbrowser.open(f"file://{abs_path}")
 
 
 if __name__ == "__main__":
-    plot_skill_similarity_tSNE()
+    from data_loader import load_corpus
+    plot_skill_similarity_tSNE(load_corpus())
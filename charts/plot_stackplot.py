@@ -1,10 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 
-def plot_stackplot(all_skills, top_n=50):
+def plot_stackplot(corpus, exclude_skills=(), top_n=50):
     # Count frequencies (and reverse for visual clarity)
-    skill_counts = pd.Series(all_skills).value_counts().nlargest(top_n)[::-1]
+    skill_counts = corpus.skill_count_series(exclude=exclude_skills).head(top_n)[::-1]
 
     # Compute cumulative sums
     cumulative = skill_counts.cumsum()
@@ -1,11 +1,10 @@
 # charts/plot_title_salary_bubble_chart.py
 
-import sqlite3
-import pandas as pd
 import plotly.express as px
 import re
 import os
 import webbrowser
+from task_scheduler import check_cancelled
 
 def parse_salary(sal_str):
     """
@@ -54,10 +53,10 @@ def parse_salary(sal_str):
     return (lo + hi) / 2.0
 
 
-def plot_title_salary_bubble_chart(db_path="preview_jobs.db"):
+def plot_title_salary_bubble_chart(corpus):
     """
-    1) Connect to preview_jobs.db
-    2) SELECT job_id, title, salary FROM jobs
+    1) Take the shared JobCorpus
+    2) Read the job_id, title and raw salary columns
     3) Parse salary → salary_val (USD/year)
     4) Drop rows with missing salary_val
     5) Group by title → avg_salary, count (# postings)
@@ -65,21 +64,7 @@ def plot_title_salary_bubble_chart(db_path="preview_jobs.db"):
     7) Plot bubble chart: x=avg_salary, y=count, size=count, color=avg_salary
     """
 
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-    try:
-        df = pd.read_sql_query(
-            "SELECT job_id, title AS job_title, salary FROM jobs",
-            conn
-        )
-    except Exception as e:
-        print("ERROR reading from 'jobs' table:", e)
-        conn.close()
-        return
-    conn.close()
+    df = corpus.job_frame()[["job_id", "title", "salary"]].rename(columns={"title": "job_title"})
 
     if df.empty:
         print("No rows found in 'jobs' table.")
@@ -130,6 +115,7 @@ def plot_title_salary_bubble_chart(db_path="preview_jobs.db"):
     fig.update_layout(template="plotly_dark")
 
     out_file = "title_salary_bubble.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved bubble chart to '{out_file}'")
     abs_path = os.path.abspath(out_file)
@@ -137,4 +123,5 @@ def plot_title_salary_bubble_chart(db_path="preview_jobs.db"):
 
 
 if __name__ == "__main__":
-    plot_title_salary_bubble_chart()
+    from data_loader import load_corpus
+    plot_title_salary_bubble_chart(load_corpus())
@@ -1,22 +1,19 @@
 # charts/plot_top_companies_by_skill.py
 
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import os
 import webbrowser
 
-def plot_top_companies_by_skill(selected_skills, db_path="preview_jobs.db"):
+from skill_query import SkillIndex
+from task_scheduler import check_cancelled
+
+def plot_top_companies_by_skill(corpus, selected_skills):
     """
     selected_skills: a list of skill‐strings (e.g. ["python", "sql"]).
     This will show the top 10 companies hiring for ANY of those skills.
     """
 
-    # 1) Validate that the database file exists
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database not found at '{db_path}'")
-        return
-
     # If no skills were selected, do nothing
     if not selected_skills:
         print("No skill selected.")
@@ -28,35 +25,24 @@ def plot_top_companies_by_skill(selected_skills, db_path="preview_jobs.db"):
         print("No valid skill names after stripping.")
         return
 
-    # Build an SQL clause like: (LOWER(s.name) LIKE '%python%' OR LOWER(s.name) LIKE '%sql%' ...)
-    where_clauses = " OR ".join(["LOWER(s.name) LIKE '%' || ? || '%'" for _ in normalized])
-    params = tuple(normalized)
-
-    conn = sqlite3.connect(db_path)
-
-    sql = f"""
-        SELECT j.company
-        FROM jobs AS j
-        INNER JOIN skills AS s
-          ON j.job_id = s.job_id
-        WHERE ({where_clauses})
-          AND j.company IS NOT NULL
-    """
-    try:
-        df = pd.read_sql_query(sql, conn, params=params)
-    except Exception as e:
-        print("ERROR reading from database:", e)
-        conn.close()
-        return
-    conn.close()
+    # 1) Substring match against the interned skill names (same semantics as
+    #    the old LOWER(name) LIKE '%term%'), then union their posting lists to
+    #    get every posting that mentions any matching skill.
+    matching = [
+        skill_id for skill_id, name in enumerate(corpus.skills.strings)
+        if any(term in name for term in normalized)
+    ]
+    job_rows = SkillIndex.for_corpus(corpus, required_only=False).any_of(matching)
+    companies = corpus.company_id[job_rows]
+    companies = companies[companies >= 0]
 
     # If no matching rows, inform the user
-    if df.empty:
+    if companies.size == 0:
         print(f"No postings found requiring any of {normalized}.")
         return
 
     # 2) Count top 10 companies
-    vc = df["company"].value_counts().nlargest(10)
+    vc = pd.Series(corpus.companies.lookup(companies)).value_counts().nlargest(10)
     top_companies = vc.reset_index()
     top_companies.columns = ["company", "count"]  # ensure unique column names
 
@@ -81,6 +67,7 @@ def plot_top_companies_by_skill(selected_skills, db_path="preview_jobs.db"):
     # 5) Save and open
     slug = "_".join([s.replace(" ", "_") for s in normalized])
     out_file = f"top_companies_{slug}.html"
+    check_cancelled()
     fig.write_html(out_file, auto_open=False)
     print(f"Saved bar chart to '{out_file}'")
 
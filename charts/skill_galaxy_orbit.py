@@ -1,6 +1,10 @@
 from pythreejs import (
     BufferGeometry,
     BufferAttribute,
+    Group,
+    LineBasicMaterial,
+    LineSegments,
+    Picker,
     Points,
     PointsMaterial,
     Scene,
@@ -10,71 +14,146 @@ from pythreejs import (
     DirectionalLight,
     OrbitControls
 )
-from IPython.display import display, HTML, Javascript
+from ipywidgets import HTML, HBox
+from IPython.display import display
+from scipy.spatial import cKDTree
+import asyncio
+import html
 import numpy as np
-import networkx as nx
-import uuid
-import json
-
-def launch_skill_galaxy_orbit(job_skill_map, max_skills=2000, min_edge_weight=0):
-    # Step 1: Co-occurrence graph
-    co_occurrence = {}
-    for skills in job_skill_map.values():
-        skills = list(skills)
-        for i in range(len(skills)):
-            for j in range(i + 1, len(skills)):
-                a, b = skills[i].lower(), skills[j].lower()
-                edge = tuple(sorted([a, b]))
-                co_occurrence[edge] = co_occurrence.get(edge, 0) + 1
-
-    G = nx.Graph()
-    for (a, b), weight in co_occurrence.items():
-        if weight >= min_edge_weight:
-            G.add_edge(a, b, weight=weight)
+
+from backbone import DEFAULT_EDGE_BUDGET
+from charts.layout_cache import cached_spring_layout
+from charts.trace_utils import graph_arrays
+from cooccurrence import approximate_pairs, cooccurrence_graph
+
+CHUNK_NODES = 4096           # stars per Points object (one typed-array message each)
+CHUNK_EDGES = 8192           # edges per LineSegments object
+CHUNK_DELAY = 0.05           # seconds between streamed chunks
+PICK_NEIGHBORS = 8           # strongest neighbours listed for a picked star
+
+
+def galaxy_arrays(G, pos):
+    """
+    Everything the orbit view streams, as float32 / int arrays ordered by
+    importance (weighted degree, strongest first):
+    (labels, coords (n×3), colors (n×3), strength, edge_u, edge_v, edge_level)
+    where edge_level[i] is the node chunk after which edge i can be drawn
+    (both endpoints loaded); edges are sorted by level, then heaviest first.
+    """
+    labels, coords, u, v, weights = graph_arrays(G, pos, dim=3)
+    strength = (np.bincount(u, weights=weights, minlength=len(labels))
+                + np.bincount(v, weights=weights, minlength=len(labels)))
+    order = np.argsort(-strength, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    coords = coords[order].astype(np.float64)
+    coords -= coords.mean(axis=0)
+    coords /= coords.std() or 1.0
+    coords[:, 2] *= 2.5  # boost z-depth
+
+    # Color by degree: blue (few neighbours) → red (hubs)
+    degree = np.bincount(np.concatenate([u, v]), minlength=len(labels))[order]
+    heat = degree / max(degree.max(initial=0), 1)
+    colors = np.stack([heat, np.full_like(heat, 0.3), 1 - heat], axis=1)
+
+    u, v = rank[u], rank[v]
+    edge_level = np.maximum(u, v) // CHUNK_NODES
+    edge_order = np.lexsort((-weights, edge_level))
+    return (
+        [labels[i] for i in order], coords.astype(np.float32), colors.astype(np.float32),
+        strength[order], u[edge_order], v[edge_order], edge_level[edge_order],
+    )
+
+
+def _points(coords, colors, material):
+    geometry = BufferGeometry(attributes={
+        'position': BufferAttribute(coords),
+        'color': BufferAttribute(colors),
+    })
+    return Points(geometry=geometry, material=material)
+
+
+def _segments(coords, colors, u, v, material):
+    ends = np.stack([u, v], axis=1).ravel()
+    geometry = BufferGeometry(attributes={
+        'position': BufferAttribute(coords[ends]),
+        'color': BufferAttribute(colors[ends] * 0.6),
+    })
+    return LineSegments(geometry=geometry, material=material)
+
+
+def _chunks(coords, colors, edge_u, edge_v, edge_level, point_material, line_material):
+    """Points / LineSegments objects in streaming order: each node chunk, then the edges it completes."""
+    for level, lo in enumerate(range(0, len(coords), CHUNK_NODES)):
+        yield _points(coords[lo:lo + CHUNK_NODES], colors[lo:lo + CHUNK_NODES], point_material)
+        first, last = np.searchsorted(edge_level, [level, level + 1])
+        for e in range(first, last, CHUNK_EDGES):
+            stop = min(e + CHUNK_EDGES, last)
+            yield _segments(coords, colors, edge_u[e:stop], edge_v[e:stop], line_material)
+
+
+def _stream(group, chunks):
+    """Show the first chunk now and append the rest one by one without blocking the kernel."""
+    group.children = (next(chunks),)
+
+    async def run():
+        for chunk in chunks:
+            await asyncio.sleep(CHUNK_DELAY)
+            group.children = group.children + (chunk,)
+
+    try:
+        asyncio.get_running_loop().create_task(run())
+    except RuntimeError:  # no event loop (plain script): add everything at once
+        group.children = group.children + tuple(chunks)
+
+
+def launch_skill_galaxy_orbit(corpus, max_skills=None, min_edge_weight=0, approximate=False,
+                              max_edges=DEFAULT_EDGE_BUDGET, show_edges=True):
+    """
+    Interactive 3D skill galaxy for Jupyter (pythreejs).
+    Positions, colors and edge segments go to the browser as float32 typed
+    arrays in chunks of CHUNK_NODES stars / CHUNK_EDGES edges, strongest
+    skills first, so the core of the galaxy appears at once and the rest
+    streams in. Hovering picks the nearest star through a k-d tree in the
+    kernel; names never travel to the browser in bulk.
+    """
+    # Step 1: Co-occurrence graph (approximate: sketched heavy-hitter pairs only),
+    #         cut to its backbone of at most max_edges edges
+    G = cooccurrence_graph(
+        corpus, required_only=True, min_weight=min_edge_weight, approximate=approximate, max_edges=max_edges
+    )
+    if approximate:
+        print(approximate_pairs(corpus, required_only=True).summary())
 
     if not G:
         print("⚠️ Not enough edges to build a galaxy graph.")
         return
 
     # Step 2: Limit nodes by degree
-    if len(G.nodes) > max_skills:
+    if max_skills and len(G.nodes) > max_skills:
         top_nodes = sorted(G.degree, key=lambda x: x[1], reverse=True)[:max_skills]
         G = G.subgraph([n for n, _ in top_nodes]).copy()
 
-    # Step 3: Layout
-    pos = nx.spring_layout(G, dim=3, weight="weight", seed=42)
-    labels = list(G.nodes())
-    coords = np.array([pos[n] for n in labels])
-    coords -= coords.mean(axis=0)
-    coords /= coords.std()
-    coords[:, 2] *= 2.5  # boost z-depth
-
-    # Step 4: Color nodes by degree
-    degrees = dict(G.degree)
-    max_deg = max(degrees.values()) or 1
-    colors = np.array([
-        [(degrees[n] / max_deg), 0.3, (1 - degrees[n] / max_deg)]
-        for n in labels
-    ])
+    # Step 3: Layout (cached) → importance-ordered typed arrays
+    pos = cached_spring_layout(G, dim=3, weight="weight", seed=42, cache_dir=corpus.cache_dir)
+    labels, coords, colors, strength, edge_u, edge_v, edge_level = galaxy_arrays(G, pos)
+    if not show_edges:
+        edge_u, edge_v, edge_level = edge_u[:0], edge_v[:0], edge_level[:0]
 
-    geometry = BufferGeometry(attributes={
-        'position': BufferAttribute(coords.astype(np.float32)),
-        'color': BufferAttribute(colors.astype(np.float32))
-    })
-
-    material = PointsMaterial(
+    # Step 4: Scene; stars and edges stream into one group
+    point_material = PointsMaterial(
         size=0.08,
         vertexColors='VertexColors',
         sizeAttenuation=True,
         transparent=True,
         opacity=0.7
     )
-    points = Points(geometry=geometry, material=material)
-
-    # Scene with dark background
+    line_material = LineBasicMaterial(vertexColors='VertexColors', transparent=True, opacity=0.15)
+    galaxy = Group()
     scene = Scene(
         children=[
-            points,
+            galaxy,
             AmbientLight(intensity=0.6),
             DirectionalLight(position=[3, 5, 1], intensity=0.5)
         ],
@@ -85,74 +164,34 @@ def launch_skill_galaxy_orbit(job_skill_map, max_skills=2000, min_edge_weight=0)
     camera = PerspectiveCamera(position=[0, 0, 4], fov=70)
     controls = OrbitControls(controlling=camera)
 
-    # Unique ID
-    container_id = "skillgalaxy-" + str(uuid.uuid4())
-    labels_json = json.dumps(labels)
-    coords_2d = coords[:, :2].tolist()
-
+    # Step 5: Picking — the browser reports the hit point, the k-d tree finds the star
+    picker = Picker(controlling=galaxy, event='mousemove')
+    tree = cKDTree(coords)
+    info = HTML(value="<i>Hover a star</i>", layout={"width": "260px"})
+
+    def on_pick(change):
+        point = change["new"]
+        if not point or not any(point):
+            return
+        _, i = tree.query(point)
+        name = labels[i]
+        neighbours = sorted(G[name].items(), key=lambda kv: -kv[1].get("weight", 1))[:PICK_NEIGHBORS]
+        info.value = (
+            f"<b>{html.escape(name)}</b> (strength {int(strength[i])})<br>"
+            + "<br>".join(f"{html.escape(n)} ({d.get('weight', 1)})" for n, d in neighbours)
+        )
+
+    picker.observe(on_pick, names=["point"])
 
     renderer = Renderer(
         camera=camera,
         scene=scene,
-        controls=[controls],
+        controls=[controls, picker],
         width=900,
         height=700,
         antialias=True,
-        alpha=False,
-        container_id=container_id
+        alpha=False
     )
 
-    display(renderer)
-    display(HTML(f"""
-    <script type="module">
-    (async function () {{
-        // Wait for the canvas and THREE to load
-        const tryGetCanvas = () => document.querySelector("#{container_id} canvas");
-        while (!window.THREE || !tryGetCanvas()) await new Promise(r => setTimeout(r, 200));
-
-        const labels = {json.dumps(labels)};
-        const tooltip = document.createElement('div');
-        Object.assign(tooltip.style, {{
-            position: 'fixed',
-            background: 'rgba(0,0,0,0.8)',
-            color: '#fff',
-            padding: '4px 8px',
-            borderRadius: '5px',
-            fontFamily: 'monospace',
-            fontSize: '12px',
-            pointerEvents: 'none',
-            display: 'none',
-            zIndex: 10000
-        }});
-        document.body.appendChild(tooltip);
-
-        const canvas = tryGetCanvas();
-        const rendererEl = Object.values(window).find(v => v?.domElement === canvas);
-        const camera = rendererEl?.camera;
-        const scene = rendererEl?.scene;
-        const points = scene.children.find(c => c.isPoints);
-
-        const raycaster = new THREE.Raycaster();
-        const mouse = new THREE.Vector2();
-
-        canvas.addEventListener('mousemove', e => {{
-            const rect = canvas.getBoundingClientRect();
-            mouse.x = ((e.clientX - rect.left) / rect.width) * 2 - 1;
-            mouse.y = -((e.clientY - rect.top) / rect.height) * 2 + 1;
-
-            raycaster.setFromCamera(mouse, camera);
-            const intersects = raycaster.intersectObject(points);
-
-            if (intersects.length > 0) {{
-                const index = intersects[0].index;
-                tooltip.textContent = labels[index];
-                tooltip.style.left = (e.clientX + 10) + 'px';
-                tooltip.style.top = (e.clientY + 10) + 'px';
-                tooltip.style.display = 'block';
-            }} else {{
-                tooltip.style.display = 'none';
-            }}
-        }});
-    }})();
-    </script>
-    """))
+    display(HBox([renderer, info]))
+    _stream(galaxy, _chunks(coords, colors, edge_u, edge_v, edge_level, point_material, line_material))
@@ -0,0 +1,102 @@
+# charts/trace_utils.py
+
+"""
+Vectorized Plotly trace builders shared by the network charts.
+
+1) graph_arrays(G, pos) turns a graph plus a layout into a node coordinate
+   array and edge endpoint index arrays (one dict lookup per node, none per
+   edge afterwards).
+2) edge_segments(coords, u, v) gathers both endpoints of every edge with
+   fancy indexing and interleaves a NaN after each one, so one line trace
+   draws every edge (Plotly breaks the line at NaN).
+3) edge_traces(…) does the same with edges bucketed by weight into a handful
+   of line widths: a few traces instead of one per edge, however many
+   edges there are.
+Coordinates are float32, which Plotly writes as compact typed arrays.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+WIDTH_BUCKETS = 5            # line widths (= traces) used for weighted edges
+
+
+def graph_arrays(G, pos, weight="weight", dim=None):
+    """
+    (nodes, coords, u, v, weights): node list in G order, their positions
+    (n × dim float32; dim defaults to the layout's), endpoint indices of every
+    edge into `nodes`, and the edge weights (1 where missing).
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    if dim is None:
+        dim = len(next(iter(pos.values()))) if pos else 2
+    coords = np.array([pos[n] for n in nodes], dtype=np.float32).reshape(len(nodes), dim)
+    n_edges = G.number_of_edges()
+    ends = np.fromiter(
+        (index[n] for edge in G.edges() for n in edge), dtype=np.int64, count=2 * n_edges
+    ).reshape(n_edges, 2)
+    weights = np.fromiter(
+        (d.get(weight, 1) for _, _, d in G.edges(data=True)), dtype=float, count=n_edges
+    )
+    return nodes, coords, ends[:, 0], ends[:, 1], weights
+
+
+def edge_segments(coords, u, v):
+    """
+    Per-axis arrays [x_u0, x_v0, NaN, x_u1, x_v1, NaN, …] for the edges
+    (u[i], v[i]); returns a tuple with one array per column of `coords`.
+    """
+    u, v = np.asarray(u, dtype=np.int64), np.asarray(v, dtype=np.int64)
+    segments = np.full((len(u), 3, coords.shape[1]), np.nan, dtype=np.float32)
+    segments[:, 0] = coords[u]
+    segments[:, 1] = coords[v]
+    return tuple(segments.reshape(-1, coords.shape[1]).T)
+
+
+def line_trace(coords, u, v, webgl=False, **kwargs):
+    """
+    One Scatter (2D; Scattergl if `webgl`) or Scatter3d (3D) trace drawing
+    every edge (u[i], v[i]).
+    """
+    axes = edge_segments(coords, u, v)
+    kwargs.setdefault("mode", "lines")
+    kwargs.setdefault("hoverinfo", "none")
+    kwargs.setdefault("showlegend", False)
+    if len(axes) == 3:
+        return go.Scatter3d(x=axes[0], y=axes[1], z=axes[2], **kwargs)
+    scatter = go.Scattergl if webgl else go.Scatter
+    return scatter(x=axes[0], y=axes[1], **kwargs)
+
+
+def width_buckets(widths, n_buckets=WIDTH_BUCKETS):
+    """
+    (bucket per edge, representative width per bucket): widths are split at
+    their quantiles so each bucket holds a similar number of edges; each
+    bucket is drawn at its mean width.
+    """
+    widths = np.asarray(widths, dtype=float)
+    if not len(widths):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    edges = np.unique(np.quantile(widths, np.linspace(0, 1, n_buckets + 1)[1:-1]))
+    bucket = np.searchsorted(edges, widths, side="right")
+    totals = np.bincount(bucket, weights=widths, minlength=len(edges) + 1)
+    sizes = np.bincount(bucket, minlength=len(edges) + 1)
+    return bucket, totals / np.maximum(sizes, 1)
+
+
+def edge_traces(coords, u, v, widths, n_buckets=WIDTH_BUCKETS, color="lightgray", webgl=False, **kwargs):
+    """
+    Line traces for edges whose drawn width varies: one trace per width
+    bucket (see width_buckets), thinnest first so heavy edges draw on top.
+    """
+    u, v = np.asarray(u), np.asarray(v)
+    bucket, bucket_widths = width_buckets(widths, n_buckets)
+    traces = []
+    for b, width in enumerate(bucket_widths):
+        members = bucket == b
+        if members.any():
+            traces.append(line_trace(
+                coords, u[members], v[members], webgl, line=dict(width=float(width), color=color), **kwargs
+            ))
+    return traces
@@ -0,0 +1,136 @@
+# charts/webgl.py
+
+"""
+WebGL rendering and level of detail (LOD) for charts with many marks.
+
+1) use_webgl(render, n) resolves a chart's `render` option: "webgl",
+   "svg", or "auto" (WebGL once the chart has ≥ WEBGL_MIN_MARKS marks).
+2) level_of_detail(fig, i, keep) cuts trace i down to the marks in `keep`
+   (the top nodes, or a sample from lod_sample) and returns the full
+   per-point arrays as a "layer".
+3) write_html(fig, out_file, layers) saves the figure with a small script:
+   zooming in reloads every mark of each layer that lies in view (up to
+   VIEW_MAX_POINTS), and resetting the axes goes back to the initial subset.
+   The browser only ever draws what is on screen.
+"""
+
+import json
+
+import numpy as np
+
+RENDER_MODES = ("auto", "webgl", "svg")
+WEBGL_MIN_MARKS = 5_000      # "auto" switches to WebGL traces at this many marks
+LOD_POINTS = 5_000           # marks drawn per layer before zooming in
+VIEW_MAX_POINTS = 100_000    # marks drawn per layer when zoomed in
+
+# Trace attributes that can hold one value per mark
+PER_POINT = ("x", "y", "text", "hovertext", "customdata", "ids", "marker.color", "marker.size", "marker.symbol")
+
+_LOD_SCRIPT = """
+var gd = document.getElementById('{plot_id}');
+var layers = %(layers)s;
+var maxPoints = %(max_points)d;
+function show(index, layer, groups) {
+    var update = {};
+    Object.keys(layer.attrs).forEach(function (key) {
+        var full = layer.attrs[key], part = [];
+        groups.forEach(function (g) {
+            for (var j = g * layer.stride; j < (g + 1) * layer.stride; j++) part.push(full[j]);
+        });
+        update[key] = [part];
+    });
+    Plotly.restyle(gd, update, [index]);
+}
+gd.on('plotly_relayout', function (ev) {
+    var reset = ev['xaxis.autorange'] || ev['yaxis.autorange'];
+    var zoomed = Object.keys(ev).some(function (k) { return /^[xy]axis\\.range/.test(k); });
+    if (!reset && !zoomed) return;
+    var xr = gd._fullLayout.xaxis.range, yr = gd._fullLayout.yaxis.range;
+    Object.keys(layers).forEach(function (key) {
+        var layer = layers[key];
+        if (reset) { show(+key, layer, layer.initial); return; }
+        var xs = layer.attrs.x, ys = layer.attrs.y, groups = [];
+        for (var g = 0; g < xs.length / layer.stride; g++) {
+            for (var j = g * layer.stride; j < (g + 1) * layer.stride; j++) {
+                if (xs[j] >= xr[0] && xs[j] <= xr[1] && ys[j] >= yr[0] && ys[j] <= yr[1]) { groups.push(g); break; }
+            }
+        }
+        if (groups.length > maxPoints) {
+            var step = groups.length / maxPoints, thinned = [];
+            for (var t = 0; t < maxPoints; t++) thinned.push(groups[Math.floor(t * step)]);
+            groups = thinned;
+        }
+        show(+key, layer, groups);
+    });
+});
+"""
+
+
+def use_webgl(render, n_marks):
+    """True when a chart with `n_marks` marks should use WebGL traces."""
+    if render not in RENDER_MODES:
+        raise ValueError(f"render must be one of {RENDER_MODES}, got {render!r}")
+    return render == "webgl" or (render == "auto" and n_marks >= WEBGL_MIN_MARKS)
+
+
+def lod_sample(n, k=LOD_POINTS, priority=None, seed=0):
+    """
+    Sorted indices of the k marks shown before zooming: the k highest
+    `priority` values if given, else a uniform random sample.
+    """
+    if n <= k:
+        return np.arange(n)
+    if priority is not None:
+        keep = np.argpartition(-np.asarray(priority), k - 1)[:k]
+    else:
+        keep = np.random.default_rng(seed).choice(n, size=k, replace=False)
+    return np.sort(keep)
+
+
+def _json_values(values):
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        return np.round(values.astype(float), 6).tolist()
+    return values.tolist()
+
+
+def _json_scalar(value):
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+
+def level_of_detail(fig, index, keep, stride=1):
+    """
+    Cut fig.data[index] down to the mark groups `keep` (a group is `stride`
+    consecutive points, e.g. 3 for NaN-separated edge segments) and return
+    the layer write_html needs to restore the rest on zoom. Numeric marker
+    colors keep the full data's color range.
+    """
+    trace = fig.data[index]
+    n_points = len(trace.x)
+    keep = np.asarray(keep, dtype=np.int64)
+    rows = (keep[:, None] * stride + np.arange(stride)).ravel()
+
+    colors = trace["marker.color"] if "marker" in trace else None
+    if colors is not None and np.ndim(colors) and len(colors) == n_points and np.asarray(colors).dtype.kind in "iuf":
+        coloraxis = trace.marker.coloraxis
+        bounds = fig.layout[coloraxis] if coloraxis else trace.marker
+        if bounds.cmin is None and bounds.cmax is None:
+            bounds.update(cmin=float(np.nanmin(colors)), cmax=float(np.nanmax(colors)))
+
+    attrs = {}
+    for path in PER_POINT:
+        value = trace[path] if path.split(".")[0] in trace else None
+        if value is None or isinstance(value, str) or not np.ndim(value) or len(value) != n_points:
+            continue
+        value = np.asarray(value, dtype=object if path == "customdata" else None)
+        attrs[path] = _json_values(value)
+        trace[path] = value[rows]
+    return {"stride": stride, "initial": keep.tolist(), "attrs": attrs}
+
+
+def write_html(fig, out_file, layers=None, max_points=VIEW_MAX_POINTS, **kwargs):
+    """fig.write_html(out_file, **kwargs), plus zoom-driven LOD for {trace index: layer}."""
+    if layers:
+        data = json.dumps({str(i): layer for i, layer in layers.items()}, default=_json_scalar).replace("</", "<\\/")
+        kwargs["post_script"] = _LOD_SCRIPT % {"layers": data, "max_points": max_points}
+    fig.write_html(out_file, **kwargs)
@@ -1,11 +1,10 @@
 # word_cloud_job_titles.py
 
-import sqlite3
-import pandas as pd
 from wordcloud import WordCloud, STOPWORDS
 import matplotlib.pyplot as plt
 import webbrowser
 import os
+from task_scheduler import check_cancelled
 
 
 def make_word_cloud(text, filename):
@@ -30,30 +29,16 @@ def make_word_cloud(text, filename):
     plt.close()
 
 
-def run_word_clouds(db_path="preview_jobs.db"):
+def run_word_clouds(corpus):
     """
-    1) Connect to preview_jobs.db
-    2) SELECT all job titles from the 'jobs' table
+    1) Take the shared JobCorpus
+    2) Read all job titles from its title column
     3) Combine them into one large text blob
     4) Call make_word_cloud(...) to produce 'wc_job_titles.png'
     5) Open the PNG in your default image viewer
     """
-    # 1) Connect to SQLite
-    if not os.path.exists(db_path):
-        print(f"ERROR: Database file not found at '{db_path}'")
-        return
-
-    conn = sqlite3.connect(db_path)
-
-    try:
-        # 2) Read every title from jobs
-        df = pd.read_sql_query("SELECT title FROM jobs WHERE title IS NOT NULL", conn)
-    except Exception as e:
-        print("ERROR reading from 'jobs' table:", e)
-        conn.close()
-        return
-
-    conn.close()
+    # 1–2) Every title from the shared corpus
+    df = corpus.job_frame()[["title"]].dropna()
 
     if df.empty:
         print("No job titles found in the 'jobs' table.")
@@ -64,6 +49,7 @@ def run_word_clouds(db_path="preview_jobs.db"):
 
     # 4) Generate and save the word cloud
     output_filename = "wc_job_titles.png"
+    check_cancelled()
     make_word_cloud(combined_text, output_filename)
     print(f"✅  Saved word cloud to '{output_filename}'")
 
@@ -73,4 +59,5 @@ def run_word_clouds(db_path="preview_jobs.db"):
 
 
 if __name__ == "__main__":
-    run_word_clouds()
+    from data_loader import load_corpus
+    run_word_clouds(load_corpus())
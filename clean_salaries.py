@@ -4,9 +4,25 @@ import sqlite3
 import re
 from datetime import datetime
 
+from db_pool import write_connection
+
 DB_PATH = "preview_jobs.db"
 LOG_PATH = "salary_clean_log.txt"
 
+SELECT_SALARY_COLUMNS_SQL = """
+    SELECT salary_min, salary_max, salary_avg, salary_period
+      FROM jobs
+     WHERE job_id = ?
+"""
+UPDATE_SALARY_COLUMNS_SQL = """
+    UPDATE jobs
+       SET salary_min = ?,
+           salary_max = ?,
+           salary_avg = ?,
+           salary_period = ?
+     WHERE job_id = ?
+"""
+
 
 def parse_salary_string(sal_str):
     """
@@ -95,7 +111,7 @@ def main():
     with open(LOG_PATH, "w", encoding="utf-8") as log:
         log.write(f"--- Salary Cleaning Log: {datetime.now()} ---\n\n")
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = write_connection(DB_PATH)
     cur = conn.cursor()
 
     # 1) Add four new columns if they don’t already exist; log each attempt.
@@ -137,23 +153,12 @@ def main():
         lo, hi, avg, period = parse_salary_string(raw_salary)
 
         # Fetch old values (should be NULL on first run)
-        old_vals = cur.execute("""
-            SELECT salary_min, salary_max, salary_avg, salary_period
-              FROM jobs
-             WHERE job_id = ?
-        """, (job_id,)).fetchone()
+        old_vals = cur.execute(SELECT_SALARY_COLUMNS_SQL, (job_id,)).fetchone()
 
         old_min, old_max, old_avg, old_period = old_vals
 
         # Update new columns
-        cur.execute("""
-            UPDATE jobs
-               SET salary_min = ?,
-                   salary_max = ?,
-                   salary_avg = ?,
-                   salary_period = ?
-             WHERE job_id = ?
-        """, (lo, hi, avg, period, job_id))
+        cur.execute(UPDATE_SALARY_COLUMNS_SQL, (lo, hi, avg, period, job_id))
 
         # Log before vs after
         with open(LOG_PATH, "a", encoding="utf-8") as log:
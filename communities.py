@@ -0,0 +1,210 @@
+# communities.py
+
+"""
+Skill communities (clusters) shared by every chart that groups skills.
+
+• louvain(A) runs Louvain modularity optimisation on a symmetric weighted CSR
+  adjacency: local moving of single nodes, then aggregation of communities
+  into super-nodes, repeated until nothing moves.
+• skill_communities(corpus, …) builds the skill co-occurrence graph, clusters
+  it and returns one community label per skill ID. Results are memoized on
+  the corpus and persisted in the corpus cache directory under a hash of the
+  graph itself, so every consumer (and the next session) reuses the same
+  clustering until the data behind it changes.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+from scipy import sparse
+
+from cooccurrence import skill_pairs
+from corpus_cache import _atomic_write, cache_lock
+
+ALGORITHM_VERSION = 1        # bump when the clustering output changes
+KEEP_ENTRIES = 8             # newest persisted clusterings kept
+MAX_PASSES = 50              # local-moving sweeps per level
+MIN_GAIN = 1e-12
+
+# The shared clustering: skill pairs over all mentions with weight ≥ 3
+DEFAULT_REQUIRED_ONLY = False
+DEFAULT_MIN_WEIGHT = 3
+
+
+# ─── Louvain ─────────────────────────────────────────────────────────────────
+def _local_moves(A, resolution, total, rng):
+    """One Louvain level: community per node of A and whether any node moved."""
+    n = A.shape[0]
+    # Plain lists: the per-node work is a handful of neighbours, where Python
+    # indexing beats numpy call overhead
+    degree = np.asarray(A.sum(axis=1)).ravel().tolist()
+    indptr, indices, data = A.indptr.tolist(), A.indices.tolist(), A.data.tolist()
+    comm = list(range(n))
+    comm_degree = list(degree)
+    scale = resolution / total
+    moved_any = False
+    for _ in range(MAX_PASSES):
+        moved = 0
+        for i in rng.permutation(n).tolist():
+            k_i, current = degree[i], comm[i]
+            comm_degree[current] -= k_i
+            links = {}
+            for pos in range(indptr[i], indptr[i + 1]):
+                j = indices[pos]
+                if j != i:
+                    c = comm[j]
+                    links[c] = links.get(c, 0.0) + data[pos]
+            best = current
+            best_gain = links.get(current, 0.0) - scale * comm_degree[current] * k_i
+            for c, weight in links.items():
+                gain = weight - scale * comm_degree[c] * k_i
+                if gain > best_gain + MIN_GAIN:
+                    best, best_gain = c, gain
+            if best != current:
+                comm[i] = best
+                moved += 1
+            comm_degree[best] += k_i
+        if not moved:
+            break
+        moved_any = True
+    return np.array(comm), moved_any
+
+
+def louvain(A, resolution=1.0, seed=0):
+    """
+    Community label (0 … c-1, largest community first) of every node of the
+    symmetric weighted adjacency matrix A.
+    """
+    A = sparse.csr_matrix(A, dtype=float)
+    n = A.shape[0]
+    labels = np.arange(n)
+    total = A.sum()
+    if n == 0 or total == 0:
+        return _by_size(labels)
+    rng = np.random.default_rng(seed)
+    while True:
+        comm, moved = _local_moves(A, resolution, total, rng)
+        if not moved:
+            break
+        _, comm = np.unique(comm, return_inverse=True)
+        labels = comm[labels]
+        n_comm = comm.max() + 1
+        P = sparse.csr_matrix((np.ones(len(comm)), (np.arange(len(comm)), comm)), shape=(len(comm), n_comm))
+        A = (P.T @ A @ P).tocsr()
+        if n_comm == len(comm):
+            break
+    return _by_size(labels)
+
+
+def _by_size(labels):
+    """Relabel so community 0 is the largest (ties: lowest member index)."""
+    _, labels = np.unique(labels, return_inverse=True)
+    sizes = np.bincount(labels)
+    first = np.full(len(sizes), len(labels))
+    np.minimum.at(first, labels, np.arange(len(labels)))
+    rank = np.empty(len(sizes), dtype=np.int64)
+    rank[np.lexsort((first, -sizes))] = np.arange(len(sizes))
+    return rank[labels]
+
+
+def modularity(A, labels, resolution=1.0):
+    """Newman modularity of a labelling of the symmetric weighted adjacency A."""
+    A = sparse.csr_matrix(A, dtype=float)
+    total = A.sum()
+    if total == 0:
+        return 0.0
+    P = sparse.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)))
+    internal = (P.T @ A @ P).diagonal()
+    comm_degree = P.T @ np.asarray(A.sum(axis=1)).ravel()
+    return float((internal / total - resolution * (comm_degree / total) ** 2).sum())
+
+
+# ─── Skill communities ───────────────────────────────────────────────────────
+def skill_graph(corpus, required_only=DEFAULT_REQUIRED_ONLY, min_weight=DEFAULT_MIN_WEIGHT, min_degree=1):
+    """(skill IDs of the nodes, symmetric CSR adjacency) of the co-occurrence graph."""
+    a_ids, b_ids, weights = skill_pairs(corpus, required_only, min_weight)
+    degree = np.bincount(np.concatenate([a_ids, b_ids]), minlength=corpus.n_skills)
+    node_ids = np.flatnonzero(degree >= max(min_degree, 1))
+    keep = (degree[a_ids] >= max(min_degree, 1)) & (degree[b_ids] >= max(min_degree, 1))
+    position = np.full(corpus.n_skills, -1, dtype=np.int64)
+    position[node_ids] = np.arange(len(node_ids))
+    rows, cols = position[a_ids[keep]], position[b_ids[keep]]
+    A = sparse.csr_matrix(
+        (np.concatenate([weights[keep], weights[keep]]).astype(float),
+         (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(len(node_ids), len(node_ids))
+    )
+    return node_ids, A
+
+
+def _graph_key(names, A, resolution):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((ALGORITHM_VERSION, resolution)).encode("utf-8"))
+    h.update("\0".join(names).encode("utf-8"))
+    for array in (A.indptr, A.indices, A.data):
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, f"communities-{key}.npz")
+
+
+def _load(cache_dir, key):
+    path = _entry_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with cache_lock(cache_dir, shared=True), np.load(path, allow_pickle=False) as npz:
+            return npz["labels"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Ignoring unreadable community cache {path}: {e}")
+        return None
+
+
+def _store(cache_dir, key, labels):
+    try:
+        with cache_lock(cache_dir):
+            _atomic_write(_entry_path(cache_dir, key), lambda f: np.savez(f, labels=labels))
+            entries = [
+                os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                if name.startswith("communities-") and name.endswith(".npz")
+            ]
+            entries.sort(key=os.path.getmtime, reverse=True)
+            for path in entries[KEEP_ENTRIES:]:
+                os.remove(path)
+    except OSError as e:
+        print(f"⚠️ Could not write community cache: {e}")
+
+
+def skill_communities(corpus, required_only=DEFAULT_REQUIRED_ONLY, min_weight=DEFAULT_MIN_WEIGHT,
+                      min_degree=1, resolution=1.0, use_cache=True):
+    """
+    Community label of every skill ID (-1 for skills outside the graph);
+    community 0 is the largest. Call with the defaults to share the common
+    clustering.
+    """
+    def build():
+        node_ids, A = skill_graph(corpus, required_only, min_weight, min_degree)
+        labels = np.full(corpus.n_skills, -1, dtype=np.int64)
+        if not len(node_ids):
+            return labels
+        cache_dir = corpus.cache_dir if use_cache else None
+        key = _graph_key(corpus.skill_names(node_ids).tolist(), A, resolution)
+        node_labels = _load(cache_dir, key) if cache_dir else None
+        if node_labels is None or len(node_labels) != len(node_ids):
+            node_labels = louvain(A, resolution)
+            if cache_dir:
+                _store(cache_dir, key, node_labels)
+        labels[node_ids] = node_labels
+        return labels
+
+    return corpus.derived(("communities", required_only, min_weight, min_degree, resolution), build)
+
+
+def community_members(labels):
+    """List of skill-ID arrays, one per community in label order."""
+    clustered = np.flatnonzero(labels >= 0)
+    order = clustered[np.argsort(labels[clustered], kind="stable")]
+    return np.split(order, np.flatnonzero(np.diff(labels[order])) + 1) if len(order) else []
@@ -0,0 +1,205 @@
+# compute_pool.py
+
+"""
+Process pool for the CPU-bound steps of the charts.
+
+Chart threads share the GIL with the Tk event loop, so a t-SNE fit or a
+force layout running in one stalls the GUI and every other chart.
+run(fn, *args) executes such a step in a worker process instead:
+
+1) JobCorpus arguments are not pickled. publish() writes the corpus once per
+   version (db path, size and high-water marks) to a snapshot directory, one
+   .npy file per array plus meta.json, and workers memory-map the arrays
+   copy-on-write: all processes read the same pages and a task only carries
+   the snapshot path. Old snapshots are deleted once no queued or running
+   task refers to them.
+2) Each worker rebuilds the corpus once per snapshot and keeps it (with its
+   derived matrices) for the next tasks.
+3) Only fn's result (embeddings, labels, positions, small frames) comes
+   back; the figure is built and written by the calling thread.
+
+Until enable() is called (the GUI does so at start-up) run() just calls fn
+in-process, so the chart modules still work as plain scripts. Workers are
+spawned and import the main script as __mp_main__, so a script that enables
+the pool keeps its own start-up code under `if __name__ == "__main__":`.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from data_loader import JobCorpus
+from task_scheduler import check_cancelled
+
+KEEP_SNAPSHOTS = 2           # corpus versions kept on disk (older ones may still be mapped)
+
+_CorpusRef = namedtuple("_CorpusRef", ["path"])
+
+_pool = None
+_snapshot_root = None
+_snapshots = []              # published snapshot paths, oldest first
+_refs = {}                   # snapshot path → run() calls whose task still refers to it
+_lock = threading.Lock()
+_worker_corpus = {}          # worker side: snapshot path → JobCorpus (the latest one only)
+
+
+def enable(max_workers=None):
+    """Start the pool (one worker per core by default); run() uses it from now on."""
+    global _pool, _snapshot_root
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _snapshot_root = tempfile.mkdtemp(prefix="job-analysis-")
+
+
+def shutdown():
+    """Stop the workers and delete the corpus snapshots."""
+    global _pool, _snapshot_root
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            try:
+                shutil.rmtree(_snapshot_root)
+            except OSError as e:
+                print(f"⚠️ Could not delete corpus snapshots in {_snapshot_root}: {e}")
+        _pool, _snapshot_root = None, None
+        _snapshots.clear()
+        _refs.clear()
+
+
+def enabled():
+    return _pool is not None
+
+
+# ─── Corpus snapshots ────────────────────────────────────────────────────────
+def _version(corpus):
+    key = repr((corpus.db_path, corpus.n_jobs, sorted(corpus.hwm.items()))).encode("utf-8")
+    return hashlib.blake2b(key, digest_size=8).hexdigest()
+
+
+def publish(corpus, hold=False):
+    """
+    Directory holding a snapshot of `corpus` (written on first use of this
+    version). hold=True counts a reference that release() drops again; a
+    snapshot is only deleted once it is outside the KEEP_SNAPSHOTS newest
+    and nothing holds it.
+    """
+    path = os.path.join(_snapshot_root, f"corpus-{_version(corpus)}")
+    with _lock:
+        if hold:
+            _refs[path] = _refs.get(path, 0) + 1
+        if path in _snapshots:
+            return path
+        arrays, meta = corpus.to_state()
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name, values in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), values, allow_pickle=False)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"db_path": corpus.db_path, "state": meta}, f)
+        os.replace(tmp, path)
+        _snapshots.append(path)
+        _prune()
+    return path
+
+
+def release(paths):
+    """Drop the references publish(…, hold=True) took on `paths`."""
+    with _lock:
+        for path in paths:
+            if _refs.get(path, 0) > 1:
+                _refs[path] -= 1
+            else:
+                _refs.pop(path, None)
+        _prune()
+
+
+def _prune():
+    """Delete unreferenced snapshots older than the KEEP_SNAPSHOTS newest (caller holds _lock)."""
+    for old in _snapshots[:-KEEP_SNAPSHOTS]:
+        if _refs.get(old):
+            continue
+        try:
+            shutil.rmtree(old)
+        except FileNotFoundError:
+            pass
+        except OSError as e:  # e.g. still memory-mapped by a worker on Windows: retried on the next prune
+            print(f"⚠️ Could not delete corpus snapshot {old}, will retry: {e}")
+            continue
+        _snapshots.remove(old)
+
+
+def _load_array(path):
+    try:
+        return np.load(path, mmap_mode="c", allow_pickle=False)
+    except ValueError:  # empty arrays cannot be mapped
+        return np.load(path, allow_pickle=False)
+
+
+def _open_snapshot(path):
+    """Worker side: the corpus stored at `path`, rebuilt once per snapshot."""
+    if path not in _worker_corpus:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {
+            name[:-4]: _load_array(os.path.join(path, name))
+            for name in os.listdir(path) if name.endswith(".npy")
+        }
+        _worker_corpus.clear()
+        _worker_corpus[path] = JobCorpus.from_state(meta["db_path"], arrays, meta["state"])
+    return _worker_corpus[path]
+
+
+# ─── Running tasks ───────────────────────────────────────────────────────────
+def _pack(value, held):
+    if not isinstance(value, JobCorpus):
+        return value
+    path = publish(value, hold=True)
+    held.append(path)
+    return _CorpusRef(path)
+
+
+def _unpack(value):
+    return _open_snapshot(value.path) if isinstance(value, _CorpusRef) else value
+
+
+def _call(fn, args, kwargs):
+    args = [_unpack(a) for a in args]
+    kwargs = {name: _unpack(value) for name, value in kwargs.items()}
+    return fn(*args, **kwargs)
+
+
+def run(fn, *args, **kwargs):
+    """
+    fn(*args, **kwargs) in a worker process, blocking only the calling
+    thread; in-process when the pool is not enabled. fn must be importable
+    (a module-level function) and its result picklable. A cancelled
+    scheduler task stops before and after the step.
+    """
+    check_cancelled()
+    pool = _pool
+    if pool is None:
+        result = fn(*args, **kwargs)
+        check_cancelled()
+        return result
+    held = []
+    try:
+        args = [_pack(a, held) for a in args]
+        kwargs = {name: _pack(value, held) for name, value in kwargs.items()}
+        result = pool.submit(_call, fn, args, kwargs).result()
+    finally:
+        release(held)  # the snapshots stay until no queued or running task refers to them
+    check_cancelled()
+    return result
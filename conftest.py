@@ -0,0 +1,85 @@
+# conftest.py
+
+"""
+Shared pytest fixtures: a small synthetic jobs database with the schema the
+scrapers write (jobs / skills / certifications), and the corpus loaded from it.
+"""
+
+import random
+import sqlite3
+
+import pytest
+
+from data_loader import load_corpus
+
+TEST_SKILLS = [
+    "Python", "sql", "Excel", "tableau", "R", "power bi", "communication", "leadership",
+    "problem solving", "project management", "vba", "java", "c++", "hadoop", "spark",
+    "aws", "gcp", "azure", "docker", "kubernetes",
+] + [f"skill{i}" for i in range(60)]
+TEST_CERTS = ["PMP", "CISSP", "AWS Certified", "Security+", "CPA", "CCNA"]
+TEST_JOBS = 400
+
+
+def create_jobs_db(path, n_jobs=TEST_JOBS, seed=1, first_job_id=1):
+    """Write a random jobs database to `path` (skill names sometimes padded / duplicated)."""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id INTEGER PRIMARY KEY, title TEXT, company TEXT, location TEXT,
+            location_details TEXT, salary TEXT, salary_min REAL, salary_max REAL,
+            salary_avg REAL, salary_period TEXT
+        );
+        CREATE TABLE IF NOT EXISTS skills (job_id INTEGER, name TEXT, required INTEGER);
+        CREATE TABLE IF NOT EXISTS certifications (job_id INTEGER, name TEXT, required INTEGER);
+    """)
+    add_jobs(conn, range(first_job_id, first_job_id + n_jobs), rng)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_jobs(conn, job_ids, rng):
+    """Insert random postings with the given job_ids (no commit)."""
+    for job_id in job_ids:
+        salary = rng.choice([None, 30000, 50000, 80000, 120000])
+        conn.execute(
+            "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, rng.choice(["Data Analyst", "Engineer", "Manager"]),
+             rng.choice(["Acme", "Globex", "Initech", None]), rng.choice(["Remote", "Boston, MA"]),
+             rng.choice(["boston", None]), f"${salary} a year" if salary else "n/a",
+             salary, salary, salary, "yearly" if salary else None)
+        )
+        names = rng.sample(TEST_SKILLS[:20] if rng.random() < 0.8 else TEST_SKILLS, rng.randint(1, 7))
+        if rng.random() < 0.1:
+            names.append(names[0])  # listed twice for the same job
+        for name in names:
+            conn.execute(
+                "INSERT INTO skills (job_id, name, required) VALUES (?, ?, ?)",
+                (job_id, f" {name.upper()} " if rng.random() < 0.1 else name, int(rng.random() < 0.7))
+            )
+        for cert in rng.sample(TEST_CERTS, rng.randint(0, 2)):
+            conn.execute("INSERT INTO certifications (job_id, name, required) VALUES (?, ?, ?)", (job_id, cert, int(rng.random() < 0.5)))
+
+
+def read_postings(db_path, table="skills", required_only=False):
+    """{job_id: {normalized name, …}} straight from SQLite (the brute-force reference)."""
+    conn = sqlite3.connect(db_path)
+    where = " WHERE required = 1" if required_only else ""
+    postings = {}
+    for job_id, name in conn.execute(f"SELECT job_id, name FROM {table}{where}"):
+        if name and name.strip():
+            postings.setdefault(job_id, set()).add(name.strip().lower())
+    conn.close()
+    return postings
+
+
+@pytest.fixture
+def jobs_db(tmp_path):
+    return create_jobs_db(str(tmp_path / "jobs.db"))
+
+
+@pytest.fixture
+def corpus(jobs_db):
+    return load_corpus(jobs_db, use_cache=False)
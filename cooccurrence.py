@@ -0,0 +1,179 @@
+# cooccurrence.py
+
+"""
+Skill co-occurrence engine shared by the network / cluster charts.
+
+The skill×skill count matrix is the sparse product Xᵀ·X of the job×skill
+indicator matrix X (see JobCorpus.cooccurrence), so every pair count comes
+from one sparse matmul instead of a Python loop over all skill pairs of every
+job. Helpers below turn it into pair lists, legacy edge dicts, top-K
+neighbor lists or a networkx graph.
+
+When the database carries an up-to-date `skill_pairs` table (maintained by
+db_setup.update_skill_pairs), skill_pairs() reads the edges from it with one
+indexed `WHERE weight >= ?` query instead. With approximate=True the edges
+are the heaviest APPROX_TOP_PAIRS pairs found by the fixed-memory sketches in
+sketches.py (weights are upper-bound estimates; see approximate_pairs()).
+backbone_pairs() / cooccurrence_graph(max_edges=…) cut the edges down to a
+statistically chosen backbone of bounded size (see backbone.py).
+"""
+
+import sqlite3
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+import sketches
+from backbone import backbone_mask
+from data_loader import canonical_name_norm
+from db_pool import read_snapshot
+
+PAIRS_TABLE = "skill_pairs"
+PAIRS_BASIS_TABLE = "skill_pairs_basis"
+PAIRS_STATE_TABLE = "skill_pairs_state"
+APPROX_TOP_PAIRS = 2000
+
+
+def cooccurrence_matrix(corpus, required_only=True):
+    """Symmetric skill×skill count matrix (CSR); the diagonal holds skill counts."""
+    return corpus.cooccurrence(required_only)
+
+
+def _upper_pairs(corpus, required_only):
+    """(rows, cols, weights) of every co-occurring pair with row < col, cached on the corpus."""
+    def build():
+        upper = sparse.triu(corpus.cooccurrence(required_only), k=1).tocoo()
+        return upper.row.astype(np.int32), upper.col.astype(np.int32), upper.data.astype(np.int64)
+    return corpus.derived(("cooccurrence_pairs", required_only), build)
+
+
+def stored_pairs_sql(required_only=True):
+    column = "required_weight" if required_only else "weight"
+    return f"SELECT skill_a, skill_b, {column} FROM {PAIRS_TABLE} WHERE {column} >= ?"
+
+
+def _read_stored_pairs(corpus, required_only, min_weight):
+    """
+    Edges from the skill_pairs table, or None if the corpus isn't a single
+    database or the table wasn't updated for exactly the rows the corpus holds.
+    Stored names are ASCII-folded by the triggers; after mapping them to the
+    corpus' skill IDs, spellings that land on the same pair are summed (and
+    self-loops dropped) before min_weight is applied.
+    """
+    if not isinstance(corpus.db_path, str) or "skills" not in corpus.hwm:
+        return None
+    try:
+        with read_snapshot(corpus.db_path) as conn:
+            state = dict(conn.execute(f"SELECT name, value FROM {PAIRS_STATE_TABLE}"))
+            if (state.get("skills") != corpus.hwm["skills"]
+                    or state.get("row_changes", 0) != corpus.hwm.get("row_changes", 0)):
+                return None
+            rows = conn.execute(stored_pairs_sql(required_only), (1,)).fetchall()
+    except sqlite3.OperationalError:  # no skill_pairs tables (db_setup not run)
+        return None
+
+    a_ids = np.fromiter((corpus.skills.get(canonical_name_norm(a)) for a, _, _ in rows), dtype=np.int64, count=len(rows))
+    b_ids = np.fromiter((corpus.skills.get(canonical_name_norm(b)) for _, b, _ in rows), dtype=np.int64, count=len(rows))
+    weights = np.fromiter((w for _, _, w in rows), dtype=np.int64, count=len(rows))
+    keep = (a_ids >= 0) & (b_ids >= 0) & (a_ids != b_ids)
+    lo = np.minimum(a_ids[keep], b_ids[keep])
+    hi = np.maximum(a_ids[keep], b_ids[keep])
+    keys, inverse = np.unique(sketches.pair_keys(lo, hi), return_inverse=True)
+    summed = np.zeros(len(keys), dtype=np.int64)
+    np.add.at(summed, inverse, weights[keep])
+    keep = summed >= max(min_weight, 1)
+    a_ids, b_ids = sketches.split_pair_keys(keys[keep])
+    return a_ids, b_ids, summed[keep]
+
+
+def approximate_pairs(corpus, required_only=True, k=APPROX_TOP_PAIRS):
+    """sketches.HeavyHitters of the k heaviest pairs (cached on the corpus); .summary() gives the error bounds."""
+    return corpus.derived(
+        ("approx_pairs", required_only, k),
+        lambda: sketches.top_pairs(corpus, k, required_only)
+    )
+
+
+def skill_pairs(corpus, required_only=True, min_weight=1, approximate=False):
+    """
+    Co-occurring skill pairs as parallel arrays (a_ids, b_ids, weights) with
+    weight ≥ min_weight (each pair once). Read from the stored skill_pairs
+    table when it's current, otherwise taken from Xᵀ·X; approximate=True
+    returns the sketched heavy hitters instead.
+    """
+    if approximate:
+        hh = approximate_pairs(corpus, required_only)
+        keep = hh.estimates >= max(min_weight, 1)
+        a_ids, b_ids = sketches.split_pair_keys(hh.keys[keep])
+        return a_ids, b_ids, hh.estimates[keep]
+    stored = corpus.derived(
+        ("stored_pairs", required_only, min_weight),
+        lambda: _read_stored_pairs(corpus, required_only, min_weight)
+    )
+    if stored is not None:
+        return stored
+    rows, cols, weights = _upper_pairs(corpus, required_only)
+    keep = weights >= max(min_weight, 1)
+    return rows[keep], cols[keep], weights[keep]
+
+
+def edge_dict(corpus, required_only=True, min_weight=1, approximate=False):
+    """Legacy {(skill_a, skill_b): count} with each pair's names in sorted order."""
+    names = corpus.skills.strings
+    out = {}
+    for a, b, w in zip(*(arr.tolist() for arr in skill_pairs(corpus, required_only, min_weight, approximate))):
+        a, b = names[a], names[b]
+        out[(a, b) if a < b else (b, a)] = w
+    return out
+
+
+def top_neighbors(corpus, k=10, required_only=True, min_weight=1):
+    """
+    Top-k co-occurring skills of every skill: a list indexed by skill ID of
+    (neighbor_ids, weights) arrays, heaviest first (ties by skill ID).
+    """
+    C = corpus.cooccurrence(required_only).tocsr()
+    out = []
+    for skill_id in range(C.shape[0]):
+        lo, hi = C.indptr[skill_id], C.indptr[skill_id + 1]
+        ids, weights = C.indices[lo:hi], C.data[lo:hi]
+        keep = (ids != skill_id) & (weights >= max(min_weight, 1))
+        ids, weights = ids[keep], weights[keep]
+        if len(ids) > k:
+            part = np.argpartition(-weights, k - 1)[:k]
+            ids, weights = ids[part], weights[part]
+        order = np.lexsort((ids, -weights))
+        out.append((ids[order], weights[order]))
+    return out
+
+
+def backbone_pairs(corpus, required_only=True, min_weight=1, approximate=False,
+                   method="disparity", max_edges=None, alpha=None, k=None):
+    """skill_pairs() cut down to their backbone (see backbone.backbone_mask), cached on the corpus."""
+    def build():
+        a_ids, b_ids, weights = skill_pairs(corpus, required_only, min_weight, approximate)
+        keep = backbone_mask(a_ids, b_ids, weights, method, max_edges, alpha, k)
+        return a_ids[keep], b_ids[keep], weights[keep]
+    return corpus.derived(
+        ("backbone_pairs", required_only, min_weight, approximate, method, max_edges, alpha, k), build
+    )
+
+
+def cooccurrence_graph(corpus, required_only=True, min_weight=1, approximate=False,
+                       max_edges=None, backbone="disparity"):
+    """
+    networkx Graph of skill names with a `weight` attribute per co-occurring
+    pair ≥ min_weight. With max_edges only the `backbone` ("disparity" or
+    "topk") of at most that many edges is kept.
+    """
+    names = corpus.skills.strings
+    if max_edges is None:
+        a_ids, b_ids, weights = skill_pairs(corpus, required_only, min_weight, approximate)
+    else:
+        a_ids, b_ids, weights = backbone_pairs(corpus, required_only, min_weight, approximate, backbone, max_edges)
+    G = nx.Graph()
+    G.add_weighted_edges_from(
+        (names[a], names[b], w) for a, b, w in zip(a_ids.tolist(), b_ids.tolist(), weights.tolist())
+    )
+    return G
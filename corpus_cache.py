@@ -0,0 +1,186 @@
+# corpus_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from db_pool import read_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_DIR_NAME = ".job_analysis_cache"
+CACHE_FORMAT = 2          # bump whenever the stored layout changes
+KEEP_ENTRIES = 4          # newest cache entries kept per directory
+HASHED_TABLES = ("jobs", "skills", "certifications")
+
+
+def cache_dir_for(db_path):
+    """Cache directory that lives next to the database file."""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), CACHE_DIR_NAME)
+
+
+# ─── Locking ─────────────────────────────────────────────────────────────────
+@contextmanager
+def cache_lock(cache_dir, shared=False):
+    """
+    Advisory lock on the cache directory so the GUI and CLI scripts can share
+    it: readers take a shared lock, writers an exclusive one (Windows only has
+    exclusive locks, so readers serialize there).
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fd = os.open(os.path.join(cache_dir, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def _atomic_write(path, write):
+    """Call write(file) on a temp file in the same directory, then os.replace it."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# ─── Fingerprinting ──────────────────────────────────────────────────────────
+def _stat_key(db_path):
+    """Size + mtime of the database and its WAL file (cheap, no SQLite access)."""
+    parts = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+    return f"v{CACHE_FORMAT}|" + "|".join(parts)
+
+
+def content_hash(db_path):
+    """Hash of every row (and rowid) of the jobs, skills and certifications tables."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"v{CACHE_FORMAT}".encode())
+    with read_snapshot(db_path) as conn:
+        cursor = conn.cursor()
+        existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table in HASHED_TABLES:
+            if table not in existing:
+                continue
+            h.update(table.encode())
+            cursor.execute(f"SELECT rowid, * FROM {table}")
+            for rows in iter(lambda: cursor.fetchmany(10000), []):
+                h.update(repr(rows).encode())
+    return h.hexdigest()
+
+
+def _manifest_path(cache_dir, db_path):
+    return os.path.join(cache_dir, os.path.basename(db_path) + ".manifest.json")
+
+
+def fingerprint(db_path):
+    """
+    Cache key of a database.
+
+    The content hash only has to be recomputed when the file's size/mtime
+    changed since the last run; otherwise it comes from a small manifest, so a
+    warm start never opens SQLite.
+    """
+    cache_dir = cache_dir_for(db_path)
+    stat_key = _stat_key(db_path)
+    manifest_path = _manifest_path(cache_dir, db_path)
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("stat") == stat_key:
+            return manifest["hash"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = content_hash(db_path)
+    try:
+        with cache_lock(cache_dir):
+            payload = json.dumps({"stat": stat_key, "hash": digest}).encode("utf-8")
+            _atomic_write(manifest_path, lambda f: f.write(payload))
+    except OSError as e:
+        print(f"⚠️ Could not update corpus cache manifest: {e}")
+    return digest
+
+
+# ─── Entries ─────────────────────────────────────────────────────────────────
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, f"corpus-{key}.npz")
+
+
+def load(db_path, key):
+    """
+    Stored state for `key` as (arrays, meta), or None on a miss.
+    `arrays` maps names to numpy arrays, `meta` is the JSON-able part.
+    """
+    cache_dir = cache_dir_for(db_path)
+    path = _entry_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        with cache_lock(cache_dir, shared=True), np.load(path, allow_pickle=False) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable corpus cache {path}: {e}")
+        return None
+    meta = json.loads(arrays.pop("__meta__").tobytes().decode("utf-8"))
+    return arrays, meta
+
+
+def store(db_path, key, arrays, meta):
+    """Write a cache entry atomically and prune old ones. Failures only warn."""
+    cache_dir = cache_dir_for(db_path)
+    payload = dict(arrays)
+    payload["__meta__"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    try:
+        with cache_lock(cache_dir):
+            _atomic_write(_entry_path(cache_dir, key), lambda f: np.savez(f, **payload))
+            _prune(cache_dir)
+    except OSError as e:
+        print(f"⚠️ Could not write corpus cache: {e}")
+
+
+def _prune(cache_dir):
+    entries = [
+        os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+        if name.startswith("corpus-") and name.endswith(".npz")
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[KEEP_ENTRIES:]:
+        os.remove(path)
+
+
+def clear(db_path):
+    """Delete every cache entry and manifest next to `db_path`."""
+    cache_dir = cache_dir_for(db_path)
+    if not os.path.isdir(cache_dir):
+        return
+    with cache_lock(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name != ".lock":
+                os.remove(os.path.join(cache_dir, name))
@@ -1,47 +1,977 @@
-import sqlite3
-from collections import defaultdict, Counter
+import copy
+import glob
+import multiprocessing
+import os
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
-def load_skills(db_path='preview_jobs.db'):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM skills")
-    skills_data = cursor.fetchall()
-    conn.close()
-    return [s[0].strip().lower() for s in skills_data if s[0]]
+import numpy as np
+import pandas as pd
+from scipy import sparse
 
+import corpus_cache
+from db_pool import read_snapshot
 
-def load_job_skill_map(db_path='preview_jobs.db'):
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+DEFAULT_DB_PATH = "preview_jobs.db"
 
-    cursor.execute("SELECT job_id, name FROM skills WHERE required=1")
-    skills_data = cursor.fetchall()
 
-    cursor.execute("SELECT job_id, title, company FROM jobs")
-    jobs_data = cursor.fetchall()
-    conn.close()
+def normalize_name(name):
+    """Canonical form of a skill / certification name ("  Power BI " → "power bi")."""
+    return name.strip().lower() if name else ""
 
-    # Group required skills per job
-    job_skill_map = defaultdict(set)
-    for job_id, skill in skills_data:
-        job_skill_map[job_id].add(skill.strip().lower())
 
-    # Lookup for job_id → title, company
-    job_info_map = {job_id: (title, company) for job_id, title, company in jobs_data}
+def canonical_name_norm(name_norm):
+    """
+    A stored `name_norm` value as normalize_name() would produce it. The
+    db_setup triggers only fold ASCII, so non-ASCII values they wrote are
+    normalized again here; ASCII ones are already exact.
+    """
+    return name_norm if not name_norm or name_norm.isascii() else normalize_name(name_norm)
+
+
+class Vocabulary:
+    """
+    Interns strings to dense integer IDs (0 … len-1).
+    Missing values (None / empty strings) map to -1.
+    """
+
+    def __init__(self, strings=()):
+        self.strings = []
+        self.index = {}
+        for s in strings:
+            self.intern(s)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, idx):
+        return self.strings[idx]
+
+    def __contains__(self, s):
+        return s in self.index
+
+    def intern(self, s):
+        if s is None or s == "":
+            return -1
+        idx = self.index.get(s)
+        if idx is None:
+            idx = len(self.strings)
+            self.index[s] = idx
+            self.strings.append(s)
+        return idx
+
+    def intern_many(self, values):
+        return np.fromiter((self.intern(v) for v in values), dtype=np.int32, count=len(values))
+
+    def get(self, s, default=-1):
+        return self.index.get(s, default)
+
+    def copy(self):
+        other = Vocabulary()
+        other.strings = list(self.strings)
+        other.index = dict(self.index)
+        return other
+
+    def lookup(self, ids):
+        """Map an array of IDs back to strings (None where id == -1)."""
+        table = np.asarray(self.strings + [None], dtype=object)
+        ids = np.asarray(ids, dtype=np.int64)
+        return table[np.where(ids < 0, len(self.strings), ids)]
+
+
+def _build_flag_matrix(rows, cols, flags, shape):
+    """
+    Build a CSR matrix with one entry per (row, col) pair whose stored value is
+    the `required` flag. Duplicate mentions collapse to the max flag, and
+    optional mentions are kept as explicit zeros so the sparsity pattern still
+    records them.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    flags = np.asarray(flags, dtype=np.int8)
+
+    keys = rows * max(shape[1], 1) + cols
+    order = np.lexsort((-flags, keys))
+    keys, flags = keys[order], flags[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    keys, flags = keys[first], flags[first]
+
+    row_of = keys // max(shape[1], 1)
+    indices = (keys % max(shape[1], 1)).astype(np.int32)
+    indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_of, minlength=shape[0]), out=indptr[1:])
+    return sparse.csr_matrix((flags, indices, indptr), shape=shape)
+
+
+def _indicator(flag_matrix, required_only):
+    """0/1 int32 copy of a flag matrix (optionally keeping required entries only)."""
+    X = flag_matrix
+    if required_only:
+        X = X.copy()
+        X.eliminate_zeros()
+    return sparse.csr_matrix(
+        (np.ones(X.nnz, dtype=np.int32), X.indices.copy(), X.indptr.copy()),
+        shape=X.shape
+    )
+
+
+def _column_counts(flag_matrix, required_only, minlength):
+    """# of rows per column of a flag matrix (required entries only if asked)."""
+    indices = flag_matrix.indices[flag_matrix.data != 0] if required_only else flag_matrix.indices
+    return np.bincount(indices, minlength=minlength)
+
+
+def _splice_rows(X, rows, replacement, shape):
+    """
+    Copy of CSR `X` grown to `shape` with rows[i] replaced by row i of
+    `replacement`. Untouched rows are moved with vectorized copies; when only
+    new rows are appended this is a plain concatenation.
+    """
+    n_old = X.shape[0]
+    if len(rows) and rows.min() >= n_old and np.array_equal(rows, np.arange(n_old, n_old + len(rows))):
+        return sparse.csr_matrix((
+            np.concatenate([X.data, replacement.data]),
+            np.concatenate([X.indices, replacement.indices]),
+            np.concatenate([X.indptr, X.indptr[-1] + replacement.indptr[1:]]),
+        ), shape=shape)
+
+    lengths = np.zeros(shape[0], dtype=np.int64)
+    lengths[:n_old] = np.diff(X.indptr)
+    lengths[rows] = np.diff(replacement.indptr)
+    indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    data = np.empty(indptr[-1], dtype=X.data.dtype)
+    indices = np.empty(indptr[-1], dtype=np.int32)
+
+    keep_row = np.ones(n_old, dtype=bool)
+    keep_row[rows[rows < n_old]] = False
+    row_of = np.repeat(np.arange(n_old), np.diff(X.indptr))
+    keep = keep_row[row_of]
+    dest = indptr[row_of[keep]] + (np.arange(X.nnz) - X.indptr[row_of])[keep]
+    data[dest], indices[dest] = X.data[keep], X.indices[keep]
+
+    rep_row_of = np.repeat(np.arange(len(rows)), np.diff(replacement.indptr))
+    dest = indptr[rows[rep_row_of]] + np.arange(replacement.nnz) - replacement.indptr[rep_row_of]
+    data[dest], indices[dest] = replacement.data, replacement.indices
+    return sparse.csr_matrix((data, indices, indptr), shape=shape)
+
+
+def _cooccurrence(indicator):
+    X = indicator.astype(np.int64)
+    return (X.T @ X).tocsr()
+
+
+def _job_id_array(ids):
+    """Integer array of job_ids, or an object array if they aren't all ints."""
+    job_ids = np.array(ids)
+    if job_ids.dtype.kind not in "iu":
+        job_ids = np.array(ids, dtype=object)
+    return job_ids
+
+
+class JobCorpus:
+    """
+    In-memory, preprocessed view of preview_jobs.db shared by every chart.
+
+    • Skill, certification, company and title strings are interned to integer IDs.
+    • job→skill and job→certification are CSR matrices (rows = jobs, columns =
+      skill / cert IDs) whose stored value is the `required` flag; optional
+      mentions are explicit zeros.
+    • Job metadata lives in numpy columns aligned with the matrix rows.
+      `listed` is False for job_ids that only appear in skills/certifications.
+    • refresh() pulls rows added/changed since load and updates it in place;
+      rows are never removed, so row numbers stay valid. refreshed() returns
+      an updated copy instead, for corpora other threads are reading.
+    """
+
+    def __init__(self, db_path, job_ids, listed, title_id, company_id, salary_avg,
+                 salary_text, location, location_details,
+                 skill_matrix, cert_matrix, skills, certs, companies, titles, hwm=None):
+        self.db_path = db_path
+        self.job_ids = job_ids
+        self.job_index = {jid: row for row, jid in enumerate(job_ids.tolist())}
+        self.listed = listed
+        self.title_id = title_id
+        self.company_id = company_id
+        self.salary_avg = salary_avg
+        self.salary_text = salary_text
+        self.location = location
+        self.location_details = location_details
+        self.skill_matrix = skill_matrix
+        self.cert_matrix = cert_matrix
+        self.skills = skills
+        self.certs = certs
+        self.companies = companies
+        self.titles = titles
+        self.hwm = dict(hwm or {})  # {table: highest rowid / change_id already loaded}
+        self._derived = {}
+
+    # ── sizes ────────────────────────────────────────────────────────────────
+    @property
+    def n_jobs(self):
+        return len(self.job_ids)
+
+    @property
+    def n_skills(self):
+        return len(self.skills)
+
+    @property
+    def cache_dir(self):
+        """Cache directory next to the (first) database file, or None for an in-memory corpus."""
+        db_path = self.db_path
+        if isinstance(db_path, (list, tuple)):
+            db_path = db_path[0] if db_path else None
+        return corpus_cache.cache_dir_for(db_path) if isinstance(db_path, str) else None
+
+    def derived(self, key, build):
+        """Memoize a value computed from the corpus until the next invalidate()."""
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def invalidate(self):
+        """Drop derived matrices/aggregates after the base arrays changed."""
+        self._derived.clear()
+
+    # ── matrices & aggregates ────────────────────────────────────────────────
+    def skill_indicator(self, required_only=False):
+        """job×skill 0/1 CSR matrix (int32)."""
+        return self.derived(("skill_ind", required_only),
+                            lambda: _indicator(self.skill_matrix, required_only))
+
+    def cert_indicator(self, required_only=False):
+        """job×certification 0/1 CSR matrix (int32)."""
+        return self.derived(("cert_ind", required_only),
+                            lambda: _indicator(self.cert_matrix, required_only))
+
+    def skill_counts(self, required_only=False):
+        """# of postings mentioning each skill ID."""
+        return self.derived(
+            ("skill_counts", required_only),
+            lambda: np.bincount(self.skill_indicator(required_only).indices,
+                                minlength=self.n_skills)
+        )
+
+    def cert_counts(self, required_only=False):
+        """# of postings mentioning each certification ID."""
+        return self.derived(
+            ("cert_counts", required_only),
+            lambda: np.bincount(self.cert_indicator(required_only).indices,
+                                minlength=len(self.certs))
+        )
+
+    def jobs_with_skills(self, required_only=True):
+        """Boolean mask of jobs that list at least one (required) skill."""
+        return self.derived(
+            ("has_skills", required_only),
+            lambda: np.diff(self.skill_indicator(required_only).indptr) > 0
+        )
+
+    def cooccurrence(self, required_only=True):
+        """skill×skill co-occurrence counts Xᵀ·X (int64 CSR; diagonal = skill counts)."""
+        return self.derived(
+            ("cooccurrence", required_only),
+            lambda: _cooccurrence(self.skill_indicator(required_only))
+        )
+
+    # ── lookups ──────────────────────────────────────────────────────────────
+    def skill_ids(self, names):
+        """IDs of the known skills among `names` (normalized; unknown names dropped)."""
+        ids = {self.skills.get(normalize_name(n)) for n in names}
+        ids.discard(-1)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def skill_mask(self, names):
+        """Boolean vector over skill IDs, True for every skill in `names`."""
+        mask = np.zeros(self.n_skills, dtype=bool)
+        mask[self.skill_ids(names)] = True
+        return mask
+
+    def skill_names(self, ids=None):
+        """Object array of skill names (optionally for the given IDs)."""
+        names = np.asarray(self.skills.strings, dtype=object)
+        return names if ids is None else names[np.asarray(ids, dtype=np.int64)]
+
+    def job_info(self, row):
+        """(title, company) for a corpus row."""
+        t, c = self.title_id[row], self.company_id[row]
+        return (self.titles[t] if t >= 0 else None,
+                self.companies[c] if c >= 0 else None)
+
+    def skill_count_series(self, required_only=False, exclude=()):
+        """pd.Series skill → # postings, sorted descending, without `exclude`."""
+        counts = self.skill_counts(required_only)
+        keep = (counts > 0) & ~self.skill_mask(exclude)
+        s = pd.Series(counts[keep], index=self.skill_names()[keep])
+        return s.sort_values(ascending=False, kind="stable")
+
+    def unique_skills(self):
+        """[(skill, share of postings that require it), …] sorted by share."""
+        total_jobs = int(self.jobs_with_skills(required_only=True).sum()) or 1
+        s = self.skill_count_series(required_only=True)
+        return [(skill, int(count) / total_jobs) for skill, count in zip(s.index, s.values)]
+
+    def job_skill_lists(self, required_only=True):
+        """Yield the list of skill names of every job that has any."""
+        X = self.skill_indicator(required_only)
+        names = self.skill_names()
+        for row in range(self.n_jobs):
+            lo, hi = X.indptr[row], X.indptr[row + 1]
+            if hi > lo:
+                yield names[X.indices[lo:hi]].tolist()
+
+    def job_skill_map(self, required_only=True):
+        """Legacy {job_id: set(skill names)} view."""
+        X = self.skill_indicator(required_only)
+        names = self.skill_names()
+        job_ids = self.job_ids.tolist()
+        out = {}
+        for row in np.flatnonzero(np.diff(X.indptr)):
+            lo, hi = X.indptr[row], X.indptr[row + 1]
+            out[job_ids[row]] = set(names[X.indices[lo:hi]])
+        return out
+
+    # ── (de)serialization used by corpus_cache ──────────────────────────────
+    _CACHED_AGGREGATES = ("skill_counts", "cert_counts")
+
+    def to_state(self):
+        """(arrays, meta) snapshot: numpy arrays plus JSON-able strings/columns."""
+        arrays = {
+            "listed": self.listed,
+            "title_id": self.title_id,
+            "company_id": self.company_id,
+            "salary_avg": self.salary_avg,
+        }
+        for name, X in (("skill", self.skill_matrix), ("cert", self.cert_matrix)):
+            arrays[f"{name}_data"] = X.data
+            arrays[f"{name}_indices"] = X.indices
+            arrays[f"{name}_indptr"] = X.indptr
+        for agg in self._CACHED_AGGREGATES:
+            for required_only in (False, True):
+                arrays[f"{agg}_{int(required_only)}"] = getattr(self, agg)(required_only)
+
+        numeric_ids = self.job_ids.dtype.kind in "iu"
+        if numeric_ids:
+            arrays["job_ids"] = self.job_ids
+        meta = {
+            "job_ids": None if numeric_ids else self.job_ids.tolist(),
+            "salary_text": self.salary_text.tolist(),
+            "location": self.location.tolist(),
+            "location_details": self.location_details.tolist(),
+            "skills": self.skills.strings,
+            "certs": self.certs.strings,
+            "companies": self.companies.strings,
+            "titles": self.titles.strings,
+            "hwm": self.hwm,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_state(cls, db_path, arrays, meta):
+        """Rebuild a corpus from to_state() output, including cached aggregates."""
+        if meta["job_ids"] is None:
+            job_ids = arrays["job_ids"]
+        else:
+            job_ids = np.array(meta["job_ids"], dtype=object)
+        n_jobs = len(job_ids)
+
+        def object_column(values):
+            col = np.empty(n_jobs, dtype=object)
+            col[:] = values
+            return col
+
+        skills, certs = Vocabulary(meta["skills"]), Vocabulary(meta["certs"])
+        matrices = [
+            sparse.csr_matrix(
+                (arrays[f"{name}_data"], arrays[f"{name}_indices"], arrays[f"{name}_indptr"]),
+                shape=(n_jobs, len(vocab))
+            )
+            for name, vocab in (("skill", skills), ("cert", certs))
+        ]
+        corpus = cls(
+            db_path, job_ids, arrays["listed"], arrays["title_id"], arrays["company_id"],
+            arrays["salary_avg"], object_column(meta["salary_text"]),
+            object_column(meta["location"]), object_column(meta["location_details"]),
+            matrices[0], matrices[1], skills, certs,
+            Vocabulary(meta["companies"]), Vocabulary(meta["titles"]), meta.get("hwm")
+        )
+        for agg in cls._CACHED_AGGREGATES:
+            for required_only in (False, True):
+                key = f"{agg}_{int(required_only)}"
+                if key in arrays:
+                    corpus._derived[(agg, required_only)] = arrays[key]
+        return corpus
+
+    # ── incremental refresh ─────────────────────────────────────────────────
+    def fetch_delta(self):
+        """Read (but don't apply) everything added/changed since the last load/refresh."""
+        if not isinstance(self.db_path, str):
+            raise ValueError("refresh() needs a single-database corpus; reload the shards instead.")
+        return read_delta(self.db_path, self.hwm)
+
+    def refresh(self):
+        """
+        Pull new/changed postings from the database and update the corpus in
+        place. Returns the number of jobs that were added or re-read.
+        """
+        return self.apply_delta(self.fetch_delta())
+
+    def refreshed(self):
+        """
+        (new corpus, number of jobs added or re-read): a copy with the new and
+        changed postings applied. This corpus is left untouched, so code still
+        reading it never sees a half-applied delta.
+        """
+        delta = self.fetch_delta()
+        updated = self.copy()
+        return updated, updated.apply_delta(delta)
+
+    def copy(self):
+        """
+        Copy that apply_delta() can update without touching this corpus: the
+        arrays and vocabularies it writes into are copied, the matrices
+        (which it replaces rather than modifies) and derived values are shared.
+        """
+        other = copy.copy(self)
+        for name in ("listed", "title_id", "company_id", "salary_avg", "salary_text", "location", "location_details"):
+            setattr(other, name, getattr(self, name).copy())
+        for name in ("skills", "certs", "companies", "titles"):
+            setattr(other, name, getattr(self, name).copy())
+        other.job_index = dict(self.job_index)
+        other.hwm = dict(self.hwm)
+        other._derived = dict(self._derived)
+        return other
+
+    def apply_delta(self, delta):
+        """
+        Apply a CorpusDelta: re-read jobs replace their old row contents, new
+        job_ids are appended as new rows, and the cached skill/cert counts are
+        adjusted by the difference instead of being recounted.
+        """
+        self.hwm.update(delta.hwm)
+        if not delta.job_ids:
+            return 0
+
+        # 1) Row numbers for the affected jobs (new ones appended at the end)
+        n_old = self.n_jobs
+        new_ids = [jid for jid in delta.job_ids if jid not in self.job_index]
+        for jid in new_ids:
+            self.job_index[jid] = len(self.job_index)
+        rows = np.array([self.job_index[jid] for jid in delta.job_ids], dtype=np.int64)
+        local_row = {jid: i for i, jid in enumerate(delta.job_ids)}
+
+        # 2) Job metadata columns: grow, reset the affected rows, refill
+        if new_ids:
+            self.job_ids = _job_id_array(self.job_ids.tolist() + new_ids)
+            grow = len(new_ids)
+            self.listed = np.concatenate([self.listed, np.zeros(grow, dtype=bool)])
+            self.title_id = np.concatenate([self.title_id, np.full(grow, -1, dtype=np.int32)])
+            self.company_id = np.concatenate([self.company_id, np.full(grow, -1, dtype=np.int32)])
+            self.salary_avg = np.concatenate([self.salary_avg, np.full(grow, np.nan)])
+            self.salary_text = np.concatenate([self.salary_text, np.full(grow, None, dtype=object)])
+            self.location = np.concatenate([self.location, np.full(grow, None, dtype=object)])
+            self.location_details = np.concatenate([self.location_details, np.full(grow, None, dtype=object)])
+        self.listed[rows] = False
+        self.title_id[rows] = -1
+        self.company_id[rows] = -1
+        self.salary_avg[rows] = np.nan
+        self.salary_text[rows] = None
+        self.location[rows] = None
+        self.location_details[rows] = None
+        for job_id, title, company, sal_avg, sal, loc, loc_details in delta.jobs_data:
+            row = self.job_index[job_id]
+            self.listed[row] = True
+            self.title_id[row] = self.titles.intern(title)
+            self.company_id[row] = self.companies.intern(company)
+            self.salary_avg[row] = np.nan if sal_avg is None else sal_avg
+            self.salary_text[row] = sal
+            self.location[row] = loc
+            self.location_details[row] = loc_details
+
+        # 3) Replace the affected matrix rows, keeping count aggregates in step
+        old_rows = rows[rows < n_old]
+        kept = {key: self._derived[key] for key in self._derived if key[0] in self._CACHED_AGGREGATES}
+        for name, agg, data, normalized, vocab in (
+            ("skill_matrix", "skill_counts", delta.skills_data, delta.skills_normalized, self.skills),
+            ("cert_matrix", "cert_counts", delta.certs_data, delta.certs_normalized, self.certs),
+        ):
+            old = getattr(self, name)
+            new_part, _ = _name_matrix(data, local_row, normalized, vocab)
+            for required_only in (False, True):
+                key = (agg, required_only)
+                if key in kept:
+                    counts = np.zeros(len(vocab), dtype=np.int64)
+                    counts[:len(kept[key])] = kept[key]
+                    counts -= _column_counts(old[old_rows], required_only, len(vocab))
+                    counts += _column_counts(new_part, required_only, len(vocab))
+                    kept[key] = counts
+            setattr(self, name, _splice_rows(old, rows, new_part, (self.n_jobs, len(vocab))))
+
+        self.invalidate()
+        self._derived.update(kept)
+        return len(delta.job_ids)
+
+    # ── long-format frames for pandas-based charts ──────────────────────────
+    def job_frame(self):
+        """One row per `jobs` row: job_row, job_id, title, company, salary_avg, salary, location, city."""
+        df = pd.DataFrame({
+            "job_row": np.arange(self.n_jobs),
+            "job_id": self.job_ids,
+            "title": self.titles.lookup(self.title_id),
+            "company": self.companies.lookup(self.company_id),
+            "salary_avg": self.salary_avg,
+            "salary": self.salary_text,
+            "location": self.location,
+            "city": self.location_details,
+        })
+        return df[self.listed]
+
+    def skill_frame(self, required_only=False):
+        """One row per (job, skill): job_row, skill, required."""
+        X = self.skill_matrix
+        rows = np.repeat(np.arange(self.n_jobs), np.diff(X.indptr))
+        df = pd.DataFrame({
+            "job_row": rows,
+            "skill": self.skill_names(X.indices),
+            "required": X.data.astype(bool),
+        })
+        return df[df["required"]] if required_only else df
+
+    def cert_frame(self):
+        """One row per (job, certification): job_row, certification, required."""
+        X = self.cert_matrix
+        rows = np.repeat(np.arange(self.n_jobs), np.diff(X.indptr))
+        return pd.DataFrame({
+            "job_row": rows,
+            "certification": np.asarray(self.certs.strings, dtype=object)[X.indices],
+            "required": X.data.astype(bool),
+        })
 
-    return job_skill_map, job_info_map
 
-def load_unique_skills():
-    job_skill_map, _ = load_job_skill_map()
-    
-    skill_counts = Counter()
-    for required_skills in job_skill_map.values():
-        for skill in required_skills:
-            skill_counts[skill.lower()] += 1
-    
-    total_jobs = len(job_skill_map)
-    return sorted(
-        [(skill, count / total_jobs) for skill, count in skill_counts.items()],
-        key=lambda x: x[1],
-        reverse=True
+def _table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+# Every query the corpus loader issues (db_setup explains these before/after indexing)
+JOB_COLUMNS = ["job_id", "title", "company", "salary_avg", "salary", "location", "location_details"]
+
+
+def select_jobs_sql(columns=JOB_COLUMNS):
+    """SELECT for the job columns, with NULL placeholders for ones the table lacks."""
+    return "SELECT " + ", ".join(c if c in columns else f"NULL AS {c}" for c in JOB_COLUMNS) + " FROM jobs"
+
+
+def select_names_sql(table, columns):
+    """
+    (sql, pre_normalized) for reading (job_id, name, required) from skills or
+    certifications. Databases migrated by db_setup carry a stored `name_norm`
+    column, which is read as-is instead of normalizing every row in Python.
+    """
+    if "name_norm" in columns:
+        return f"SELECT job_id, name_norm, required FROM {table}", True
+    return f"SELECT job_id, name, required FROM {table}", False
+
+
+def _read_names(cursor, table):
+    """(rows, pre_normalized) for a skills/certifications table ([] if it doesn't exist)."""
+    columns = _table_columns(cursor, table)
+    if not columns:
+        return [], True
+    sql, pre_normalized = select_names_sql(table, columns)
+    cursor.execute(sql)
+    return cursor.fetchall(), pre_normalized
+
+
+def _name_matrix(data, job_index, pre_normalized, vocab=None):
+    """
+    Intern the names of (job_id, name, required) rows → (flag CSR matrix,
+    Vocabulary). Rows are job_index[job_id]; pass `vocab` to extend an
+    existing vocabulary.
+    """
+    vocab = Vocabulary() if vocab is None else vocab
+    if pre_normalized:
+        cols = [vocab.intern(canonical_name_norm(name)) for _, name, _ in data]
+    else:
+        cols = [vocab.intern(normalize_name(name)) for _, name, _ in data]
+    rows = [job_index[job_id] for job_id, _, _ in data]
+    flags = [1 if req else 0 for _, _, req in data]
+    keep = [i for i, c in enumerate(cols) if c >= 0]
+    matrix = _build_flag_matrix(
+        [rows[i] for i in keep], [cols[i] for i in keep],
+        [flags[i] for i in keep], (len(job_index), len(vocab))
+    )
+    return matrix, vocab
+
+
+def _report(progress_callback, percent):
+    if progress_callback:
+        progress_callback(percent)
+
+
+def load_corpus(db_path=DEFAULT_DB_PATH, use_cache=True, progress_callback=None, max_workers=None):
+    """
+    Load one database, or merge several: `db_path` may be a list of paths or a
+    glob such as "scrapes/*.db" (see load_sharded_corpus).
+
+    progress_callback(percent) is called as loading advances (0–100).
+    """
+    paths = resolve_db_paths(db_path)
+    if len(paths) == 1 and isinstance(db_path, (str, os.PathLike)) and not glob.has_magic(os.fspath(db_path)):
+        return _load_single(paths[0], use_cache, progress_callback)
+    return load_sharded_corpus(paths, use_cache, progress_callback, max_workers)
+
+
+def _load_single(db_path, use_cache=True, progress_callback=None):
+    """
+    1) Fingerprint the database (size/mtime, then a content hash on change).
+    2) On a cache hit, rebuild the JobCorpus from .job_analysis_cache/ without
+       touching SQLite.
+    3) Otherwise read it from SQLite and store it for the next run.
+    """
+    if not use_cache:
+        corpus = read_corpus(db_path, progress_callback)
+        _report(progress_callback, 100)
+        return corpus
+
+    key = corpus_cache.fingerprint(db_path)
+    _report(progress_callback, 10)
+    state = corpus_cache.load(db_path, key)
+    if state is not None:
+        _report(progress_callback, 60)
+        corpus = JobCorpus.from_state(db_path, *state)
+        _report(progress_callback, 100)
+        return corpus
+
+    corpus = read_corpus(db_path, progress_callback)
+    corpus_cache.store(db_path, key, *corpus.to_state())
+    _report(progress_callback, 100)
+    return corpus
+
+
+def read_corpus(db_path=DEFAULT_DB_PATH, progress_callback=None):
+    """
+    1) Read jobs, skills and certifications once (stored name_norm if present).
+    2) Normalize and intern every skill / certification name, company and title.
+    3) Return a JobCorpus.
+    """
+    with read_snapshot(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(select_jobs_sql(_table_columns(cursor, "jobs")))
+        jobs_data = cursor.fetchall()
+        _report(progress_callback, 20)
+
+        skills_data, skills_normalized = _read_names(cursor, "skills")
+        certs_data, certs_normalized = _read_names(cursor, "certifications")
+        hwm = _high_water_marks(cursor)
+    _report(progress_callback, 50)
+
+    # Jobs table first, then any job_id that only appears in skills/certifications
+    job_index = {}
+    for row in jobs_data:
+        job_index.setdefault(row[0], len(job_index))
+    n_listed = len(job_index)
+    for job_id, _, _ in skills_data:
+        job_index.setdefault(job_id, len(job_index))
+    for job_id, _, _ in certs_data:
+        job_index.setdefault(job_id, len(job_index))
+    n_jobs = len(job_index)
+    listed = np.arange(n_jobs) < n_listed
+
+    job_ids = _job_id_array(list(job_index))
+
+    titles, companies = Vocabulary(), Vocabulary()
+    title_id = np.full(n_jobs, -1, dtype=np.int32)
+    company_id = np.full(n_jobs, -1, dtype=np.int32)
+    salary_avg = np.full(n_jobs, np.nan)
+    salary_text = np.full(n_jobs, None, dtype=object)
+    location = np.full(n_jobs, None, dtype=object)
+    location_details = np.full(n_jobs, None, dtype=object)
+    for job_id, title, company, sal_avg, sal, loc, loc_details in jobs_data:
+        row = job_index[job_id]
+        title_id[row] = titles.intern(title)
+        company_id[row] = companies.intern(company)
+        salary_avg[row] = np.nan if sal_avg is None else sal_avg
+        salary_text[row] = sal
+        location[row] = loc
+        location_details[row] = loc_details
+
+    _report(progress_callback, 65)
+    skill_matrix, skills = _name_matrix(skills_data, job_index, skills_normalized)
+    cert_matrix, certs = _name_matrix(certs_data, job_index, certs_normalized)
+    _report(progress_callback, 90)
+
+    return JobCorpus(
+        db_path, job_ids, listed, title_id, company_id, salary_avg, salary_text,
+        location, location_details, skill_matrix, cert_matrix,
+        skills, certs, companies, titles, hwm
+    )
+
+
+# ── Sharded loading (one database per scrape run / region) ──────────────────
+def resolve_db_paths(db_path):
+    """A path, glob pattern or list of either → list of database files (globs sorted)."""
+    specs = [db_path] if isinstance(db_path, (str, os.PathLike)) else list(db_path)
+    paths = []
+    for spec in specs:
+        spec = os.fspath(spec)
+        if glob.has_magic(spec):
+            matches = sorted(glob.glob(spec))
+            if not matches:
+                raise FileNotFoundError(f"No databases match '{spec}'")
+            paths.extend(matches)
+        else:
+            paths.append(spec)
+    if not paths:
+        raise FileNotFoundError("No database paths given")
+    return paths
+
+
+def _load_shard(db_path, use_cache=True):
+    """
+    Process-pool worker: load one shard and compute its aggregates there, so
+    the expensive per-shard work runs on every core. Returns picklable state.
+    """
+    corpus = _load_single(db_path, use_cache)
+    aggregates = {
+        ("cooccurrence", True): corpus.cooccurrence(required_only=True),
+    }
+    return corpus.to_state(), aggregates
+
+
+def load_sharded_corpus(db_paths, use_cache=True, progress_callback=None, max_workers=None):
+    """
+    1) Load every shard in a process pool (each through the on-disk cache).
+    2) Merge them into one corpus with merge_corpora (later shards win on
+       duplicate job_ids, so list snapshots oldest → newest).
+    """
+    db_paths = list(db_paths)
+    workers = min(len(db_paths), max_workers or os.cpu_count() or 1)
+    results = [None] * len(db_paths)
+    if workers <= 1:
+        for i, path in enumerate(db_paths):
+            results[i] = _load_shard(path, use_cache)
+            _report(progress_callback, int(80 * (i + 1) / len(db_paths)))
+    else:
+        # Spawned, not forked: the GUI calling this already runs Tk and worker threads
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_load_shard, path, use_cache) for path in db_paths]
+            for i, future in enumerate(futures):
+                results[i] = future.result()
+                _report(progress_callback, int(80 * (i + 1) / len(db_paths)))
+
+    corpora, shard_aggregates = [], []
+    for path, (state, aggregates) in zip(db_paths, results):
+        corpora.append(JobCorpus.from_state(path, *state))
+        shard_aggregates.append(aggregates)
+    merged = merge_corpora(corpora, shard_aggregates)
+    _report(progress_callback, 100)
+    return merged
+
+
+def _remap_counts(counts, remap, minlength):
+    out = np.zeros(minlength, dtype=np.int64)
+    np.add.at(out, remap[:len(counts)], counts)
+    return out
+
+
+def _remap_square(matrix, remap, size):
+    coo = matrix.tocoo()
+    return sparse.csr_matrix((coo.data, (remap[coo.row], remap[coo.col])), shape=(size, size))
+
+
+def merge_corpora(corpora, shard_aggregates=None):
+    """
+    Merge shard corpora into one, deduplicating by job_id.
+
+    • A job_id is taken from the last shard that lists it in `jobs` (or the
+      last shard it appears in at all), so newer snapshots replace older ones.
+    • Vocabularies are unioned and each shard's matrix columns are remapped.
+    • Per-shard aggregates (skill/cert counts, plus anything in
+      `shard_aggregates`, e.g. co-occurrence) are reduced by summing the
+      remapped shard values and subtracting the rows dropped as duplicates,
+      instead of being recounted over the merged matrix.
+    """
+    shard_aggregates = shard_aggregates or [{} for _ in corpora]
+
+    # 1) Winner shard per job_id
+    winner, winner_listed = {}, {}
+    for k, corpus in enumerate(corpora):
+        for jid, listed in zip(corpus.job_ids.tolist(), corpus.listed.tolist()):
+            if listed or not winner_listed.get(jid, False):
+                winner[jid] = k
+                winner_listed[jid] = listed
+    keep_rows = [
+        np.array([winner[jid] == k for jid in corpus.job_ids.tolist()], dtype=bool)
+        for k, corpus in enumerate(corpora)
+    ]
+
+    # 2) Unified vocabularies and per-shard remaps
+    vocabs = {name: Vocabulary() for name in ("skills", "certs", "companies", "titles")}
+    remaps = [
+        {name: np.array([vocab.intern(s) for s in getattr(corpus, name).strings] + [-1], dtype=np.int32)
+         for name, vocab in vocabs.items()}
+        for corpus in corpora
+    ]
+
+    def concat(attr):
+        return np.concatenate([getattr(c, attr)[keep] for c, keep in zip(corpora, keep_rows)])
+
+    job_ids = _job_id_array(sum((c.job_ids[keep].tolist() for c, keep in zip(corpora, keep_rows)), []))
+    title_id = np.concatenate([r["titles"][c.title_id[keep]] for c, keep, r in zip(corpora, keep_rows, remaps)])
+    company_id = np.concatenate([r["companies"][c.company_id[keep]] for c, keep, r in zip(corpora, keep_rows, remaps)])
+
+    # 3) Stack the kept matrix rows with remapped column IDs
+    matrices = {}
+    for attr, vocab_name in (("skill_matrix", "skills"), ("cert_matrix", "certs")):
+        parts = [getattr(c, attr)[keep] for c, keep in zip(corpora, keep_rows)]
+        indptr = [np.zeros(1, dtype=np.int64)]
+        offset = 0
+        for part in parts:
+            indptr.append(part.indptr[1:].astype(np.int64) + offset)
+            offset += part.nnz
+        matrices[attr] = sparse.csr_matrix((
+            np.concatenate([part.data for part in parts]),
+            np.concatenate([r[vocab_name][part.indices] for part, r in zip(parts, remaps)]).astype(np.int32),
+            np.concatenate(indptr),
+        ), shape=(len(job_ids), len(vocabs[vocab_name])))
+
+    merged = JobCorpus(
+        [c.db_path for c in corpora], job_ids, concat("listed"), title_id, company_id,
+        concat("salary_avg"), concat("salary_text"), concat("location"), concat("location_details"),
+        matrices["skill_matrix"], matrices["cert_matrix"],
+        vocabs["skills"], vocabs["certs"], vocabs["companies"], vocabs["titles"]
     )
+
+    # 4) Reduce per-shard aggregates
+    for agg, attr, vocab_name in (("skill_counts", "skill_matrix", "skills"),
+                                  ("cert_counts", "cert_matrix", "certs")):
+        size = len(vocabs[vocab_name])
+        for required_only in (False, True):
+            total = np.zeros(size, dtype=np.int64)
+            for c, keep, r in zip(corpora, keep_rows, remaps):
+                counts = getattr(c, agg)(required_only)
+                if not keep.all():
+                    counts = counts - _column_counts(getattr(c, attr)[~keep], required_only, len(counts))
+                total += _remap_counts(counts, r[vocab_name], size)
+            merged._derived[(agg, required_only)] = total
+
+    size = len(vocabs["skills"])
+    for key in set().union(*shard_aggregates):
+        if key[0] != "cooccurrence":
+            continue
+        total = sparse.csr_matrix((size, size), dtype=np.int64)
+        for c, keep, r, aggregates in zip(corpora, keep_rows, remaps, shard_aggregates):
+            C = aggregates.get(key)
+            if C is None:
+                C = c.cooccurrence(key[1])
+            if not keep.all():
+                C = C - _cooccurrence(_indicator(c.skill_matrix[~keep], key[1]))
+            total = total + _remap_square(C, r["skills"], size)
+        total.eliminate_zeros()
+        merged._derived[key] = total.tocsr()
+    return merged
+
+
+# ── Incremental refresh ──────────────────────────────────────────────────────
+# Deltas are found by rowid above the per-table high-water mark (appended
+# rows) plus the row_changes log that db_setup's triggers fill on UPDATE /
+# DELETE. Databases without the log only pick up appended rows.
+TRACKED_TABLES = ("jobs", "skills", "certifications")
+CHANGE_LOG_TABLE = "row_changes"
+SQL_PARAM_CHUNK = 500
+
+CorpusDelta = namedtuple(
+    "CorpusDelta",
+    "hwm job_ids jobs_data skills_data skills_normalized certs_data certs_normalized"
+)
+
+
+def _high_water_marks(cursor):
+    """{table: max rowid} for the tracked tables, plus the change-log position."""
+    hwm = {}
+    for table in TRACKED_TABLES:
+        if _table_columns(cursor, table):
+            hwm[table] = cursor.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+    if _table_columns(cursor, CHANGE_LOG_TABLE):
+        hwm[CHANGE_LOG_TABLE] = cursor.execute(
+            f"SELECT COALESCE(MAX(change_id), 0) FROM {CHANGE_LOG_TABLE}"
+        ).fetchone()[0]
+    return hwm
+
+
+def _fetch_for_jobs(cursor, sql, job_ids):
+    """Run `sql ... WHERE job_id IN (…)` in parameter-sized chunks."""
+    rows = []
+    for i in range(0, len(job_ids), SQL_PARAM_CHUNK):
+        chunk = job_ids[i:i + SQL_PARAM_CHUNK]
+        cursor.execute(f"{sql} WHERE job_id IN ({', '.join('?' * len(chunk))})", chunk)
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def read_delta(db_path, hwm):
+    """
+    1) Collect job_ids with rows above the high-water marks or in row_changes.
+    2) Re-read just those jobs' jobs / skills / certifications rows.
+    3) Return a CorpusDelta (apply it with JobCorpus.apply_delta).
+    """
+    with read_snapshot(db_path) as conn:
+        cursor = conn.cursor()
+        new_hwm = _high_water_marks(cursor)
+        affected = {}
+        for table in TRACKED_TABLES:
+            if table in new_hwm and new_hwm[table] > hwm.get(table, 0):
+                for (job_id,) in cursor.execute(f"SELECT job_id FROM {table} WHERE rowid > ?", (hwm.get(table, 0),)):
+                    affected.setdefault(job_id)
+        if new_hwm.get(CHANGE_LOG_TABLE, 0) > hwm.get(CHANGE_LOG_TABLE, 0):
+            for (job_id,) in cursor.execute(
+                f"SELECT job_id FROM {CHANGE_LOG_TABLE} WHERE change_id > ?", (hwm.get(CHANGE_LOG_TABLE, 0),)
+            ):
+                affected.setdefault(job_id)
+        affected.pop(None, None)
+        job_ids = list(affected)
+
+        jobs_data = _fetch_for_jobs(cursor, select_jobs_sql(_table_columns(cursor, "jobs")), job_ids)
+        names = {}
+        for table in ("skills", "certifications"):
+            columns = _table_columns(cursor, table)
+            if not columns:
+                names[table] = ([], True)
+                continue
+            sql, pre_normalized = select_names_sql(table, columns)
+            names[table] = (_fetch_for_jobs(cursor, sql, job_ids), pre_normalized)
+
+    return CorpusDelta(new_hwm, job_ids, jobs_data, *names["skills"], *names["certifications"])
+
+
+# ── Legacy helpers (kept for scripts / notebooks) ────────────────────────────
+def load_skills(db_path=DEFAULT_DB_PATH, corpus=None):
+    """
+    One normalized skill name per (job, skill) posting, grouped by skill.
+
+    Built from the corpus matrix, so a skill listed twice for the same job
+    counts once (the old per-row query counted such duplicates twice), and
+    the list is not in database row order. Counter(load_skills()) equals
+    corpus.skill_counts().
+    """
+    corpus = corpus or load_corpus(db_path)
+    counts = corpus.skill_counts(required_only=False)
+    return np.repeat(corpus.skill_names(), counts).tolist()
+
+
+def load_job_skill_map(db_path=DEFAULT_DB_PATH, corpus=None):
+    corpus = corpus or load_corpus(db_path)
+    job_skill_map = defaultdict(set, corpus.job_skill_map(required_only=True))
+
+    # Lookup for job_id → title, company
+    job_info_map = {
+        jid: corpus.job_info(row) for jid, row in corpus.job_index.items() if corpus.listed[row]
+    }
+    return job_skill_map, job_info_map
+
+
+def load_unique_skills(db_path=DEFAULT_DB_PATH, corpus=None):
+    corpus = corpus or load_corpus(db_path)
+    return corpus.unique_skills()
@@ -0,0 +1,95 @@
+# db_pool.py
+
+"""
+Shared SQLite access.
+
+• read_connection(db_path) returns this thread's pooled read-only connection
+  (URI mode=ro) with mmap / page cache / in-memory temp store tuned for the
+  large sequential reads the loader does. Connections are never shared across
+  threads, so GUI worker threads each get their own.
+• write_connection(db_path) opens a fresh writable connection and switches
+  the database to WAL, so readers and writers (clean_salaries, db_setup)
+  don't block each other.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+MMAP_SIZE = 256 * 1024 * 1024    # bytes
+CACHE_SIZE_KIB = 64 * 1024       # page cache per connection
+BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+
+
+def _apply_read_pragmas(conn):
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+
+
+def read_connection(db_path):
+    """
+    This thread's read-only connection to `db_path` (opened on first use).
+    Raises sqlite3.OperationalError if the database doesn't exist instead of
+    silently creating an empty one.
+    """
+    pool = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+    key = os.path.abspath(db_path)
+    try:
+        st = os.stat(key)
+        identity = (st.st_dev, st.st_ino)
+    except FileNotFoundError:
+        identity = None
+
+    # Reopen if the file was replaced (e.g. a freshly scraped DB renamed over it)
+    conn, opened_identity = pool.get(key, (None, None))
+    if conn is not None and opened_identity != identity:
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = sqlite3.connect(f"{Path(key).as_uri()}?mode=ro", uri=True, isolation_level=None)
+        _apply_read_pragmas(conn)
+        pool[key] = (conn, identity)
+    return conn
+
+
+@contextmanager
+def read_snapshot(db_path):
+    """
+    Pooled read-only connection inside one read transaction, so several
+    SELECTs see the same snapshot even while a writer commits (WAL mode).
+    """
+    conn = read_connection(db_path)
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
+
+
+def close_thread_connections():
+    """Close the calling thread's pooled connections."""
+    for conn, _ in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def enable_wal(conn):
+    """Switch the database to WAL journaling (persistent; a no-op if already on)."""
+    mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return mode
+
+
+def write_connection(db_path):
+    """New writable connection with WAL enabled. The caller closes it."""
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    enable_wal(conn)
+    return conn
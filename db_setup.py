@@ -0,0 +1,415 @@
+# db_setup.py
+
+"""
+Idempotent schema maintenance for the jobs database.
+
+    python db_setup.py [db_path] [--no-analyze] [--explain-only]
+
+1) Print EXPLAIN QUERY PLAN for every query the loader / cleaning scripts run.
+2) Switch the database to WAL; add and backfill the normalized `name_norm`
+   column on skills / certifications.
+3) Install the row_changes log used by JobCorpus.refresh().
+4) Create the missing covering indexes (CREATE INDEX IF NOT EXISTS).
+5) Bring the precomputed skill_pairs co-occurrence table up to date.
+6) Run ANALYZE so the planner has statistics.
+7) Print the plans again so the before/after difference is visible.
+
+    python db_setup.py [db_path] --rebuild-pairs [--workers N]   # recount skill_pairs from scratch
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from aggregate import aggregate_corpus, upper_pairs
+from clean_salaries import SELECT_SALARY_COLUMNS_SQL, UPDATE_SALARY_COLUMNS_SQL
+from cooccurrence import PAIRS_BASIS_TABLE, PAIRS_STATE_TABLE, PAIRS_TABLE, stored_pairs_sql
+from data_loader import (
+    CHANGE_LOG_TABLE, DEFAULT_DB_PATH, TRACKED_TABLES, _table_columns, normalize_name,
+    select_jobs_sql, select_names_sql,
+)
+from db_pool import read_connection, write_connection
+
+# (index name, table, columns). Column order puts the lookup/join key first and
+# the rest of the selected columns after it, so the queries below can be
+# answered from the index alone.
+INDEXES = [
+    ("idx_skills_job_name_required", "skills", ("job_id", "name", "required")),
+    ("idx_skills_name_required_job", "skills", ("name", "required", "job_id")),
+    ("idx_certifications_job_name_required", "certifications", ("job_id", "name", "required")),
+    ("idx_skills_name_norm", "skills", ("name_norm", "required", "job_id")),
+    ("idx_certifications_name_norm", "certifications", ("name_norm", "required", "job_id")),
+    ("idx_jobs_salary_avg", "jobs", ("salary_avg", "job_id")),
+    ("idx_skill_pairs_weight", PAIRS_TABLE, ("weight", "skill_a", "skill_b")),
+    ("idx_skill_pairs_required_weight", PAIRS_TABLE, ("required_weight", "skill_a", "skill_b")),
+]
+DROPPED_INDEXES = ["idx_jobs_job_id"]  # created by earlier versions; duplicated the jobs primary key
+
+
+def _tables(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+NAME_TABLES = ("skills", "certifications")
+
+# Built-in SQL stand-in for normalize_name(), used by the triggers so rows
+# inserted by tools that don't have the Python function registered still get a
+# name_norm (a trigger calling the Python function would make those inserts
+# fail). It matches normalize_name() exactly for ASCII names only: SQLite's
+# lower() and this trim list leave non-ASCII letters and whitespace alone.
+# Readers pass stored values through data_loader.canonical_name_norm(), and
+# re-running db_setup rewrites them with normalize_name().
+SQL_NORMALIZE = "lower(trim({col}, ' ' || char(9, 10, 11, 12, 13, 28, 29, 30, 31)))"
+
+
+def add_name_norm_columns(conn):
+    """
+    Add `name_norm` to skills / certifications (if missing), backfill it with
+    normalize_name(), and install triggers that keep it in sync on INSERT and
+    UPDATE OF name. Returns {table: rows (re)normalized}.
+    """
+    conn.create_function("normalize_name", 1, normalize_name, deterministic=True)
+    tables = _tables(conn)
+    updated = {}
+    for table in NAME_TABLES:
+        if table not in tables:
+            continue
+        if "name_norm" not in _table_columns(conn.cursor(), table):
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN name_norm TEXT")
+        if CHANGE_LOG_TABLE in tables:
+            # Rows whose trigger-made name_norm changes now: refresh() and
+            # skill_pairs re-read their jobs
+            conn.execute(
+                f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, job_id) "
+                f"SELECT DISTINCT '{table}', job_id FROM {table} "
+                f"WHERE name_norm IS NOT NULL AND name_norm IS NOT normalize_name(name)"
+            )
+        cur = conn.execute(
+            f"UPDATE {table} SET name_norm = normalize_name(name) "
+            f"WHERE name_norm IS NOT normalize_name(name)"
+        )
+        updated[table] = cur.rowcount
+        expr = SQL_NORMALIZE.format(col="NEW.name")
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_name_norm_insert
+            AFTER INSERT ON {table} FOR EACH ROW WHEN NEW.name_norm IS NULL
+            BEGIN
+                UPDATE {table} SET name_norm = {expr} WHERE rowid = NEW.rowid;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_name_norm_update
+            AFTER UPDATE OF name ON {table} FOR EACH ROW
+            BEGIN
+                UPDATE {table} SET name_norm = {expr} WHERE rowid = NEW.rowid;
+            END
+        """)
+    conn.commit()
+    return updated
+
+
+def install_change_log(conn):
+    """
+    Create the row_changes log and triggers that record the job_id of every
+    updated or deleted jobs / skills / certifications row (and of rows
+    inserted below the current max rowid), so JobCorpus.refresh() can re-read
+    just those jobs. Plain appends are found by rowid and aren't logged.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+            change_id  INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            job_id
+        )
+    """)
+    tables = _tables(conn)
+    for table in TRACKED_TABLES:
+        if table not in tables:
+            continue
+        log = f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, job_id) VALUES ('{table}', {{}});"
+        # skills / certifications: name_norm is maintained by its own trigger,
+        # so only watch the columns the corpus reads.
+        watched = "" if table == "jobs" else " OF job_id, name, required"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_log_update
+            AFTER UPDATE{watched} ON {table} FOR EACH ROW
+            BEGIN
+                {log.format("OLD.job_id")}
+                INSERT INTO {CHANGE_LOG_TABLE} (table_name, job_id)
+                    SELECT '{table}', NEW.job_id WHERE NEW.job_id IS NOT OLD.job_id;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_log_delete
+            AFTER DELETE ON {table} FOR EACH ROW
+            BEGIN
+                {log.format("OLD.job_id")}
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_log_insert
+            AFTER INSERT ON {table} FOR EACH ROW
+            WHEN NEW.rowid < (SELECT MAX(rowid) FROM {table})
+            BEGIN
+                {log.format("NEW.job_id")}
+            END
+        """)
+    conn.commit()
+
+
+def create_skill_pairs_tables(conn):
+    """
+    skill_pairs        (skill_a < skill_b) → weight (all mentions) and
+                       required_weight (both skills required)
+    skill_pairs_basis  the deduplicated (job_id, name_norm, required) rows the
+                       counts were built from, so a job's old pairs can be
+                       subtracted after it changes or disappears
+    skill_pairs_state  high-water marks of the skills / row_changes rows that
+                       are already counted
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PAIRS_TABLE} (
+            skill_a         TEXT NOT NULL,
+            skill_b         TEXT NOT NULL,
+            weight          INTEGER NOT NULL,
+            required_weight INTEGER NOT NULL,
+            PRIMARY KEY (skill_a, skill_b)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PAIRS_BASIS_TABLE} (
+            job_id,
+            name_norm TEXT NOT NULL,
+            required  INTEGER NOT NULL,
+            PRIMARY KEY (job_id, name_norm)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PAIRS_STATE_TABLE} (
+            name  TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+
+
+def _add_pair_counts(conn, sign, where):
+    """Add (sign=+1) or subtract (sign=-1) the pair counts of basis rows matching `where`."""
+    conn.execute(f"""
+        INSERT INTO {PAIRS_TABLE} (skill_a, skill_b, weight, required_weight)
+        SELECT a.name_norm, b.name_norm, {sign} * COUNT(*), {sign} * SUM(a.required AND b.required)
+          FROM {PAIRS_BASIS_TABLE} AS a
+          JOIN {PAIRS_BASIS_TABLE} AS b
+            ON a.job_id = b.job_id AND a.name_norm < b.name_norm
+         WHERE {where}
+         GROUP BY a.name_norm, b.name_norm
+        ON CONFLICT (skill_a, skill_b) DO UPDATE SET
+            weight = weight + excluded.weight,
+            required_weight = required_weight + excluded.required_weight
+    """)
+
+
+def _fill_basis(conn, where):
+    conn.execute(f"""
+        INSERT INTO {PAIRS_BASIS_TABLE} (job_id, name_norm, required)
+        SELECT job_id, name_norm, MAX(CASE WHEN required THEN 1 ELSE 0 END)
+          FROM skills
+         WHERE name_norm IS NOT NULL AND name_norm <> '' AND {where}
+         GROUP BY job_id, name_norm
+    """)
+
+
+def _database_file(conn):
+    """Path of the connection's main database file (None for in-memory databases)."""
+    for _, name, path in conn.execute("PRAGMA database_list"):
+        if name == "main":
+            return path or None
+    return None
+
+
+def _insert_aggregated_pairs(conn, db_file, max_workers):
+    """Fill skill_pairs from a process-parallel aggregate_corpus() pass."""
+    agg = aggregate_corpus(db_file, max_workers=max_workers)
+    a_ids, b_ids, weights = upper_pairs(agg.skill_cooccurrence)
+    required = np.asarray(agg.required_skill_cooccurrence[a_ids, b_ids]).ravel()
+    names = agg.skills.strings
+    conn.executemany(
+        f"INSERT INTO {PAIRS_TABLE} (skill_a, skill_b, weight, required_weight) VALUES (?, ?, ?, ?)",
+        (
+            (names[a], names[b], w, r) if names[a] < names[b] else (names[b], names[a], w, r)
+            for a, b, w, r in zip(a_ids.tolist(), b_ids.tolist(), weights.tolist(), required.tolist())
+        )
+    )
+
+
+def update_skill_pairs(conn, rebuild=False, max_workers=None):
+    """
+    Bring skill_pairs in line with the skills table.
+
+    • First run (or rebuild=True): count every pair from scratch, spread over
+      `max_workers` processes with aggregate.aggregate_corpus (the SQL
+      self-join is only used for in-memory databases).
+    • Afterwards: find jobs with skills rows above the stored rowid mark or in
+      row_changes, subtract their previously counted pairs (from the basis),
+      re-read their skills and add the new pairs, so the cost follows the
+      delta. Returns the number of jobs (re)counted.
+    """
+    tables = _tables(conn)
+    if "skills" not in tables:
+        return 0
+    if "name_norm" not in _table_columns(conn.cursor(), "skills"):
+        add_name_norm_columns(conn)
+    create_skill_pairs_tables(conn)
+    # Hold the write lock from here on, so the rows the aggregation workers
+    # read through their own connections are exactly the ones counted below.
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+
+    state = dict(conn.execute(f"SELECT name, value FROM {PAIRS_STATE_TABLE}"))
+    skills_hwm = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM skills").fetchone()[0]
+    has_log = CHANGE_LOG_TABLE in tables
+    log_hwm = conn.execute(f"SELECT COALESCE(MAX(change_id), 0) FROM {CHANGE_LOG_TABLE}").fetchone()[0] if has_log else 0
+
+    if rebuild or "skills" not in state:
+        conn.execute(f"DELETE FROM {PAIRS_TABLE}")
+        conn.execute(f"DELETE FROM {PAIRS_BASIS_TABLE}")
+        _fill_basis(conn, "1")
+        db_file = _database_file(conn)
+        if db_file:
+            _insert_aggregated_pairs(conn, db_file, max_workers)
+        else:
+            _add_pair_counts(conn, +1, "1")
+        counted = conn.execute(f"SELECT COUNT(DISTINCT job_id) FROM {PAIRS_BASIS_TABLE}").fetchone()[0]
+    else:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS pair_jobs (job_id PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.pair_jobs")
+        conn.execute("INSERT OR IGNORE INTO temp.pair_jobs SELECT job_id FROM skills WHERE rowid > ?", (state["skills"],))
+        if has_log:
+            conn.execute(
+                f"INSERT OR IGNORE INTO temp.pair_jobs SELECT job_id FROM {CHANGE_LOG_TABLE} "
+                f"WHERE change_id > ? AND table_name = 'skills'",
+                (state.get(CHANGE_LOG_TABLE, 0),)
+            )
+        counted = conn.execute("SELECT COUNT(*) FROM temp.pair_jobs").fetchone()[0]
+        if counted:
+            in_delta = "a.job_id IN (SELECT job_id FROM temp.pair_jobs)"
+            _add_pair_counts(conn, -1, in_delta)
+            conn.execute(f"DELETE FROM {PAIRS_BASIS_TABLE} WHERE job_id IN (SELECT job_id FROM temp.pair_jobs)")
+            _fill_basis(conn, "job_id IN (SELECT job_id FROM temp.pair_jobs)")
+            _add_pair_counts(conn, +1, in_delta)
+            conn.execute(f"DELETE FROM {PAIRS_TABLE} WHERE weight <= 0")
+
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {PAIRS_STATE_TABLE} (name, value) VALUES (?, ?)",
+        [("skills", skills_hwm), (CHANGE_LOG_TABLE, log_hwm)]
+    )
+    conn.commit()
+    return counted
+
+
+def create_indexes(conn):
+    """Create every missing index in INDEXES (dropping DROPPED_INDEXES); returns the names that were created."""
+    for name in DROPPED_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    tables = _tables(conn)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    created = []
+    for name, table, columns in INDEXES:
+        if table not in tables or not set(columns) <= _table_columns(conn.cursor(), table):
+            continue
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        if name not in existing:
+            created.append(name)
+    conn.commit()
+    return created
+
+
+def queries(conn):
+    """[(label, sql, params), …] for every query issued against the database."""
+    tables = _tables(conn)
+    out = [
+        ("load_corpus: jobs", select_jobs_sql(_table_columns(conn.cursor(), "jobs")), ()),
+    ]
+    for table in NAME_TABLES:
+        if table in tables:
+            out.append((f"load_corpus: {table}", select_names_sql(table, _table_columns(conn.cursor(), table))[0], ()))
+    if PAIRS_TABLE in tables:
+        out.append(("network charts: skill_pairs", stored_pairs_sql(required_only=False), (1,)))
+        out.append(("network charts: required skill_pairs", stored_pairs_sql(required_only=True), (1,)))
+    if {"salary_min", "salary_avg"} <= _table_columns(conn.cursor(), "jobs"):
+        out.append(("clean_salaries: lookup", SELECT_SALARY_COLUMNS_SQL, (None,)))
+        out.append(("clean_salaries: update", UPDATE_SALARY_COLUMNS_SQL, (None,) * 5))
+    return out
+
+
+def explain(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN detail lines for one query."""
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+
+def explain_all(conn):
+    return {label: explain(conn, sql, params) for label, sql, params in queries(conn)}
+
+
+def print_plans(before, after=None):
+    """Print the plans, or before/after pairs for every query in either run (e.g. skill_pairs only exists after)."""
+    if after is None:
+        for label, plan in before.items():
+            print(f"\n▶ {label}")
+            for line in plan:
+                print(f"    {line}")
+        return
+    for label in list(before) + [label for label in after if label not in before]:
+        print(f"\n▶ {label}")
+        for line in before.get(label, ["(not applicable before the migration)"]):
+            print(f"    before: {line}")
+        for line in after.get(label, []):
+            print(f"    after:  {line}")
+
+
+def setup_database(db_path=DEFAULT_DB_PATH, analyze=True, verbose=True, rebuild_pairs=False, max_workers=None):
+    """Migrate `db_path` (name_norm, indexes, skill_pairs, statistics); returns the created index names."""
+    conn = write_connection(db_path)
+    try:
+        before = explain_all(conn)
+        normalized = add_name_norm_columns(conn)
+        install_change_log(conn)
+        create_skill_pairs_tables(conn)
+        created = create_indexes(conn)
+        pair_jobs = update_skill_pairs(conn, rebuild=rebuild_pairs, max_workers=max_workers)
+        if analyze:
+            conn.execute("ANALYZE")
+            conn.commit()
+        if verbose:
+            print_plans(before, explain_all(conn))
+            for table, count in normalized.items():
+                print(f"\n✅ {table}.name_norm: {count} row(s) normalized.", end="")
+            print(f"\n✅ Created {len(created)} index(es): {', '.join(created) or 'none (already present)'}")
+            print(f"✅ skill_pairs: {pair_jobs} job(s) counted.")
+            if analyze:
+                print("✅ ANALYZE complete.")
+        return created
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create indexes on the jobs database and report query plans.")
+    parser.add_argument("db_path", nargs="?", default=DEFAULT_DB_PATH)
+    parser.add_argument("--no-analyze", action="store_true", help="skip ANALYZE")
+    parser.add_argument("--explain-only", action="store_true", help="only print the current query plans")
+    parser.add_argument("--rebuild-pairs", action="store_true", help="recount skill_pairs from scratch")
+    parser.add_argument("--workers", type=int, default=None, help="processes for a skill_pairs rebuild (default: all cores)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db_path):
+        print(f"ERROR: Database not found at '{args.db_path}'")
+        return
+    if args.explain_only:
+        print_plans(explain_all(read_connection(args.db_path)))
+        return
+    setup_database(args.db_path, analyze=not args.no_analyze, rebuild_pairs=args.rebuild_pairs, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
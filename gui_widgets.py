@@ -0,0 +1,181 @@
+# gui_widgets.py
+
+"""
+Tk widgets for long lists.
+
+Both widgets show any number of rows while only ever holding the few that
+fit on screen; scrolling just refills that window. Ten thousand job
+matches or skills cost as much to display as thirty.
+
+• VirtualTreeview: a ttk.Treeview whose rows come from a get_row(i) callback.
+• VirtualChecklist: a fixed pool of ttk.Checkbuttons over (key, label)
+  items; the checked keys live in a set, not in one variable per item.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+DEFAULT_ROW_HEIGHT = 20      # px, when the Treeview style does not set one
+WHEEL_ROWS = 3               # rows scrolled per mouse-wheel notch
+CHECK_PADY = 2               # vertical padding around each checklist row
+
+
+class _VirtualList(ttk.Frame):
+    """Scrollbar and scroll position shared by the virtual widgets: rows first … first+visible-1 are shown."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.n_rows = 0
+        self.first = 0               # index of the top visible row
+        self.visible = 1             # rows that fit in the current height
+
+    def _bind_scrolling(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", lambda e: self._scroll_rows(-WHEEL_ROWS))
+        widget.bind("<Button-5>", lambda e: self._scroll_rows(WHEEL_ROWS))
+        widget.bind("<Up>", lambda e: self._scroll_rows(-1))
+        widget.bind("<Down>", lambda e: self._scroll_rows(1))
+        widget.bind("<Prior>", lambda e: self._scroll_rows(-self.visible))
+        widget.bind("<Next>", lambda e: self._scroll_rows(self.visible))
+
+    def _set_rows(self, n_rows):
+        self.n_rows, self.first = n_rows, 0
+        self._render()
+
+    def _scroll_to(self, first):
+        first = max(0, min(int(first), self.n_rows - self.visible))
+        if first != self.first:
+            self.first = first
+            self._render()
+        return "break"
+
+    def _scroll_rows(self, rows):
+        return self._scroll_to(self.first + rows)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * self.n_rows)
+        elif action == "scroll":
+            step = self.visible if unit == "pages" else 1
+            self._scroll_rows(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        notches = int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+        return self._scroll_rows(notches * WHEEL_ROWS)
+
+    def _resize(self, visible):
+        visible = max(1, visible)
+        if visible != self.visible:
+            self.visible = visible
+            self.first = max(0, min(self.first, self.n_rows - visible))
+            self._render()
+
+    def _last(self):
+        """One past the last row on screen; also moves the scrollbar there."""
+        last = min(self.first + self.visible, self.n_rows)
+        if self.n_rows:
+            self.scrollbar.set(self.first / self.n_rows, last / self.n_rows)
+        else:
+            self.scrollbar.set(0, 1)
+        return last
+
+    def _render(self):
+        raise NotImplementedError
+
+
+class VirtualTreeview(_VirtualList):
+    """
+    A ttk.Treeview (headings only) plus scrollbar over `n_rows` virtual
+    rows. columns is a list of (id, heading, width); get_row(i) returns the
+    values of row i and is only called for rows being displayed.
+    """
+
+    def __init__(self, master, columns, **kwargs):
+        super().__init__(master, **kwargs)
+        self.tree = ttk.Treeview(self, columns=[c for c, _, _ in columns], show="headings", selectmode="browse")
+        for column, heading, width in columns:
+            self.tree.heading(column, text=heading, anchor="w")
+            self.tree.column(column, width=width, anchor="w", stretch=True)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.get_row = None
+        self.row_height = int(ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT)
+        # The heading takes about one row; whatever is left holds data rows
+        self.tree.bind("<Configure>", lambda e: self._resize(e.height // self.row_height - 1))
+        self._bind_scrolling(self.tree)
+
+    def set_source(self, n_rows, get_row):
+        """Show rows 0 … n_rows-1, fetched on demand with get_row(i); scrolls to the top."""
+        self.get_row = get_row
+        self._set_rows(n_rows)
+
+    def clear(self):
+        self.set_source(0, None)
+
+    def _render(self):
+        """Replace the Treeview items with the rows on screen."""
+        self.tree.delete(*self.tree.get_children())
+        for i in range(self.first, self._last()):
+            self.tree.insert("", "end", iid=str(i), values=self.get_row(i))
+
+
+class VirtualChecklist(_VirtualList):
+    """
+    Checkbutton list over (key, label) items. Only as many Checkbuttons as
+    fit exist; scrolling relabels them. `checked` is the set of checked
+    keys and survives set_items() (e.g. a new search filter). The list keeps
+    the width/height it is given instead of growing with its rows.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.pack_propagate(False)
+        self.body = ttk.Frame(self)
+        self.body.pack_propagate(False)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.items = []
+        self.checked = set()
+        self.buttons = []
+        self.button_vars = []
+
+        self._add_button()
+        self.row_height = self.buttons[0].winfo_reqheight() + 2 * CHECK_PADY
+        self.body.bind("<Configure>", lambda e: self._resize(e.height // self.row_height))
+        self._bind_scrolling(self.body)
+
+    def set_items(self, items):
+        """Show `items` ([(key, label), …]) from the top."""
+        self.items = items
+        self._set_rows(len(items))
+
+    def _add_button(self):
+        slot = len(self.buttons)
+        var = tk.BooleanVar()
+        button = ttk.Checkbutton(self.body, variable=var, onvalue=True, offvalue=False,
+                                 command=lambda: self._on_toggle(slot))
+        self._bind_scrolling(button)
+        self.buttons.append(button)
+        self.button_vars.append(var)
+
+    def _on_toggle(self, slot):
+        key = self.items[self.first + slot][0]
+        if self.button_vars[slot].get():
+            self.checked.add(key)
+        else:
+            self.checked.discard(key)
+
+    def _render(self):
+        """Relabel the pooled Checkbuttons with the items on screen; hide the spare ones."""
+        while len(self.buttons) < self.visible:
+            self._add_button()
+        n_shown = self._last() - self.first
+        for slot, (button, var) in enumerate(zip(self.buttons, self.button_vars)):
+            if slot < n_shown:
+                key, label = self.items[self.first + slot]
+                button.configure(text=label)
+                var.set(key in self.checked)
+                button.pack(anchor="w", padx=5, pady=CHECK_PADY)
+            else:
+                button.pack_forget()
@@ -0,0 +1,70 @@
+# job_matching.py
+
+"""
+Ranked job matches for a selected skill set.
+
+One sparse mat-vec over the job×required-skill indicator X gives, for every
+job at once, how many of its required skills the selection covers:
+
+    missing = (required skills per job) − X · selection
+
+Exact matches have missing == 0; near misses lack 1 … max_missing skills
+and share at least one skill with the selection (X · selection > 0), so a
+job is never offered just for listing few skills.
+The names of the missing skills are only looked up for the rows actually
+displayed (missing_skills).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+MAX_MISSING = 3              # near misses listed: jobs lacking up to this many skills
+
+
+class JobMatches(namedtuple("JobMatches", ["rows", "missing", "n_required"])):
+    """
+    Corpus rows ranked best first (fewest missing skills, then most skills
+    covered, then row), with how many required skills each lacks / lists.
+    """
+
+    def counts(self):
+        """{missing: number of jobs} for 0 … the largest missing count present."""
+        return dict(enumerate(np.bincount(self.missing).tolist())) if len(self.rows) else {}
+
+    def summary(self):
+        counts = self.counts()
+        if not counts:
+            return "No matching jobs."
+        parts = [f"{counts.get(0, 0)} exact match(es)"]
+        parts += [f"{n} missing {k}" for k, n in counts.items() if k > 0 and n]
+        return ", ".join(parts)
+
+
+def match_jobs(corpus, skills, max_missing=MAX_MISSING, required_only=True):
+    """
+    JobMatches of every listed job that has at least one of the selected
+    `skills` (names) among its (required) skills and lacks at most
+    `max_missing` of them.
+    """
+    X = corpus.skill_indicator(required_only)
+    selection = corpus.skill_mask(skills).astype(np.int32)
+    n_required = np.diff(X.indptr)
+    covered = X @ selection
+    missing = n_required - covered
+    candidates = corpus.listed & (covered > 0) & (missing <= max_missing)
+    rows = np.flatnonzero(candidates)
+    missing, n_required = missing[rows], n_required[rows]
+    order = np.lexsort((rows, -(n_required - missing), missing))
+    return JobMatches(rows[order], missing[order], n_required[order])
+
+
+def missing_skills(corpus, row, selection, required_only=True):
+    """
+    Names of the (required) skills of job `row` outside `selection` (a
+    boolean mask over skill IDs, e.g. corpus.skill_mask(skills)).
+    """
+    X = corpus.skill_indicator(required_only)
+    ids = X.indices[X.indptr[row]:X.indptr[row + 1]]
+    ids = ids[~selection[ids]]
+    return corpus.skill_names(np.sort(ids)).tolist()
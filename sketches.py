@@ -0,0 +1,215 @@
+# sketches.py
+
+"""
+Fixed-memory frequency sketches behind the charts' `approximate=True` mode.
+
+• CountMinSketch: depth × width counters. Estimates never undercount and,
+  with probability ≥ 1 − δ (δ = e^−depth), overcount by at most ε·N
+  (ε = e / width, N = total count added).
+• SpaceSaving: keeps the `capacity` heaviest keys. A tracked count is at most
+  `errors[i]` too high, and any key whose true count exceeds the smallest
+  tracked count is guaranteed to be tracked.
+• top_pairs / top_skills / top_companies / top_titles stream a JobCorpus
+  through both (a chunk of jobs at a time) and return HeavyHitters whose
+  estimate is the smaller of the two upper bounds.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_WIDTH = 1 << 16       # CMS counters per row (rounded up to a power of two)
+DEFAULT_DEPTH = 4             # CMS rows → δ = e^-4 ≈ 1.8 %
+CAPACITY_FACTOR = 4           # Space-Saving tracks this many × the requested top-k
+CHUNK_JOBS = 20_000           # jobs whose pairs are counted per step
+
+
+class CountMinSketch:
+    """Count-min sketch over int64 keys (multiply-shift hashing, vectorized updates)."""
+
+    def __init__(self, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH, seed=0):
+        bits = max(1, math.ceil(math.log2(max(width, 2))))
+        self.width = 1 << bits
+        self.depth = depth
+        self.total = 0
+        self.table = np.zeros((depth, self.width), dtype=np.int64)
+        self._shift = np.uint64(64 - bits)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**64, size=(depth, 1), dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 2**64, size=(depth, 1), dtype=np.uint64, endpoint=False)
+
+    @classmethod
+    def for_error(cls, epsilon, delta, seed=0):
+        """Smallest sketch overcounting by ≤ epsilon·N with probability ≥ 1 − delta."""
+        return cls(math.ceil(math.e / epsilon), math.ceil(math.log(1 / delta)), seed)
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+
+    @property
+    def error_bound(self):
+        """Overcount that holds for every estimate with probability ≥ 1 − delta."""
+        return self.epsilon * self.total
+
+    def _buckets(self, keys):
+        x = np.asarray(keys, dtype=np.int64).astype(np.uint64)
+        return ((self._a * x + self._b) >> self._shift).astype(np.intp)
+
+    def add(self, keys, counts=1):
+        keys = np.asarray(keys, dtype=np.int64)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), keys.shape)
+        self.total += int(counts.sum())
+        for row, buckets in enumerate(self._buckets(keys)):
+            self.table[row] += np.bincount(buckets, weights=counts, minlength=self.width).astype(np.int64)
+
+    def estimate(self, keys):
+        buckets = self._buckets(keys)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving summary over int64 keys. Each add() is merged in as
+    one exact batch (the mergeable-summaries variant), so updates stay
+    vectorized: keys new to the summary start from the current minimum.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.total = 0
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+
+    @property
+    def floor(self):
+        """Upper bound on the true count of every key that isn't tracked."""
+        return int(self.counts.min()) if len(self.keys) >= self.capacity else 0
+
+    def add(self, keys, counts=1):
+        keys = np.asarray(keys, dtype=np.int64)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), keys.shape)
+        if not len(keys):
+            return
+        batch_keys, inverse = np.unique(keys, return_inverse=True)
+        batch_counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        self.total += int(batch_counts.sum())
+
+        floor = self.floor
+        merged = np.union1d(self.keys, batch_keys)
+        merged_counts = np.full(len(merged), floor, dtype=np.int64)
+        merged_errors = np.full(len(merged), floor, dtype=np.int64)
+        tracked = np.searchsorted(merged, self.keys)
+        merged_counts[tracked] = self.counts
+        merged_errors[tracked] = self.errors
+        merged_counts[np.searchsorted(merged, batch_keys)] += batch_counts
+
+        if len(merged) > self.capacity:
+            keep = np.sort(np.argpartition(-merged_counts, self.capacity - 1)[:self.capacity])
+            merged, merged_counts, merged_errors = merged[keep], merged_counts[keep], merged_errors[keep]
+        self.keys, self.counts, self.errors = merged, merged_counts, merged_errors
+
+    def top(self, k):
+        """Indices of the k largest tracked counts, heaviest first."""
+        return np.lexsort((self.keys, -self.counts))[:k]
+
+
+class HeavyHitters(namedtuple("HeavyHitters", [
+    "keys", "estimates", "lower", "total", "untracked_max", "cms_error", "cms_delta",
+])):
+    """
+    Top keys of a stream, heaviest first. Each true count lies in
+    [lower, estimates]; any key not listed occurs at most `untracked_max`
+    times; estimates overcount by ≤ cms_error with probability ≥ 1 − cms_delta.
+    """
+
+    @property
+    def max_error(self):
+        """Largest possible overcount among the listed estimates."""
+        return int((self.estimates - self.lower).max()) if len(self.keys) else 0
+
+    def summary(self):
+        return (
+            f"≈ top {len(self.keys)} of {self.total:,} counted; estimates within "
+            f"+{self.max_error:,} (count-min ±{self.cms_error:,.0f} at {1 - self.cms_delta:.0%}); "
+            f"unlisted items ≤ {self.untracked_max:,}"
+        )
+
+
+def _heavy_hitters(cms, ss, k):
+    ranked = ss.top(len(ss.keys))
+    top, rest = ranked[:k], ranked[k:]
+    # Unlisted keys are either untracked (≤ floor) or tracked below the top k
+    untracked_max = max(ss.floor, int(np.minimum(ss.counts[rest], cms.estimate(ss.keys[rest])).max(initial=0)))
+    keys = ss.keys[top]
+    estimates = np.minimum(ss.counts[top], cms.estimate(keys))
+    lower = np.maximum(ss.counts[top] - ss.errors[top], 0)
+    order = np.lexsort((keys, -estimates))
+    return HeavyHitters(
+        keys[order], estimates[order], np.minimum(lower, estimates)[order],
+        ss.total, untracked_max, cms.error_bound, cms.delta,
+    )
+
+
+def _sketches(k, capacity, width, depth):
+    return CountMinSketch(width, depth), SpaceSaving(capacity or CAPACITY_FACTOR * k)
+
+
+# ─── Corpus drivers ──────────────────────────────────────────────────────────
+def pair_keys(a_ids, b_ids):
+    """Pack (a, b) skill ID pairs into one int64 key each."""
+    return (np.asarray(a_ids, dtype=np.int64) << 32) | np.asarray(b_ids, dtype=np.int64)
+
+
+def split_pair_keys(keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    return (keys >> 32).astype(np.int32), (keys & 0xFFFFFFFF).astype(np.int32)
+
+
+def top_pairs(corpus, k=1000, required_only=True, capacity=None, width=DEFAULT_WIDTH,
+              depth=DEFAULT_DEPTH, chunk_jobs=CHUNK_JOBS):
+    """
+    Heaviest co-occurring skill pairs (keys from pair_keys, a < b) counted in
+    fixed memory: only one chunk's Xᵀ·X exists at a time.
+    """
+    cms, ss = _sketches(k, capacity, width, depth)
+    X = corpus.skill_indicator(required_only).astype(np.int64)
+    for lo in range(0, X.shape[0], chunk_jobs):
+        chunk = X[lo:lo + chunk_jobs]
+        pairs = sparse.triu(chunk.T @ chunk, k=1).tocoo()
+        keys = pair_keys(pairs.row, pairs.col)
+        cms.add(keys, pairs.data)
+        ss.add(keys, pairs.data)
+    return _heavy_hitters(cms, ss, k)
+
+
+def top_items(ids, k=50, capacity=None, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH, chunk=1_000_000):
+    """Most frequent values of an int ID stream (negative IDs = missing, skipped)."""
+    cms, ss = _sketches(k, capacity, width, depth)
+    ids = np.asarray(ids)
+    for lo in range(0, len(ids), chunk):
+        part = ids[lo:lo + chunk]
+        part = part[part >= 0]
+        cms.add(part)
+        ss.add(part)
+    return _heavy_hitters(cms, ss, k)
+
+
+def top_skills(corpus, k=50, required_only=True, **kwargs):
+    """Most frequent skill IDs (one count per posting)."""
+    return top_items(corpus.skill_indicator(required_only).indices, k, **kwargs)
+
+
+def top_companies(corpus, k=50, **kwargs):
+    return top_items(corpus.company_id, k, **kwargs)
+
+
+def top_titles(corpus, k=50, **kwargs):
+    return top_items(corpus.title_id, k, **kwargs)
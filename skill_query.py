@@ -0,0 +1,252 @@
+# skill_query.py
+
+import re
+
+import numpy as np
+
+from data_loader import normalize_name
+
+EMPTY = np.array([], dtype=np.int32)
+
+# If the short list is this many times smaller than the long one, binary-search
+# ("gallop") its elements into the long list instead of doing a linear merge.
+GALLOP_RATIO = 8
+
+
+class SkillQueryError(ValueError):
+    """Raised for malformed boolean skill queries."""
+
+
+# ─── Sorted posting-list primitives ──────────────────────────────────────────
+def intersect(a, b):
+    """Intersection of two sorted, duplicate-free int arrays."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) == 0:
+        return EMPTY
+    if len(a) * GALLOP_RATIO < len(b):
+        pos = np.searchsorted(b, a)
+        pos[pos == len(b)] = len(b) - 1
+        return a[b[pos] == a]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def difference(a, b):
+    """Elements of sorted `a` that are not in sorted `b`."""
+    if len(a) == 0 or len(b) == 0:
+        return a
+    if len(a) * GALLOP_RATIO < len(b):
+        pos = np.searchsorted(b, a)
+        pos[pos == len(b)] = len(b) - 1
+        return a[b[pos] != a]
+    return np.setdiff1d(a, b, assume_unique=True)
+
+
+def union(lists):
+    """Union of any number of sorted posting lists."""
+    lists = [p for p in lists if len(p)]
+    if not lists:
+        return EMPTY
+    if len(lists) == 1:
+        return lists[0]
+    return np.unique(np.concatenate(lists))
+
+
+# ─── Query parsing ───────────────────────────────────────────────────────────
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def _tokenize(text):
+    """
+    Split a query into ("(", ")", "AND", "OR", "NOT", ("TERM", name)) tokens.
+    Operators must be upper-case; consecutive bare words form one multi-word
+    skill name ("power bi AND sql"), and "double quotes" force a literal name.
+    """
+    tokens, words = [], []
+
+    def flush():
+        if words:
+            tokens.append(("TERM", " ".join(words)))
+            words.clear()
+
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise SkillQueryError(f"Unexpected character at position {pos}: {text[pos]!r}")
+        pos = m.end()
+        lparen, rparen, quoted, word = m.groups()
+        if word is not None and word not in _OPERATORS:
+            words.append(word)
+            continue
+        flush()
+        if lparen:
+            tokens.append("(")
+        elif rparen:
+            tokens.append(")")
+        elif quoted is not None:
+            tokens.append(("TERM", quoted))
+        else:
+            tokens.append(word)
+    flush()
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser producing a small AST:
+        ("term", name) | ("not", node) | ("and", [nodes]) | ("or", [nodes])
+
+    Grammar:
+        expr   := and_ ( "OR" and_ )*
+        and_   := unary ( "AND" unary )*
+        unary  := "NOT" unary | "(" expr ")" | TERM
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        tok = self.peek()
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        if not self.tokens:
+            raise SkillQueryError("Empty query.")
+        node = self.expr()
+        if self.peek() is not None:
+            raise SkillQueryError(f"Unexpected token {self._show(self.peek())}.")
+        return node
+
+    def expr(self):
+        nodes = [self.and_()]
+        while self.peek() == "OR":
+            self.take()
+            nodes.append(self.and_())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def and_(self):
+        nodes = [self.unary()]
+        while self.peek() == "AND":
+            self.take()
+            nodes.append(self.unary())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def unary(self):
+        tok = self.take()
+        if tok == "NOT":
+            return ("not", self.unary())
+        if tok == "(":
+            node = self.expr()
+            if self.take() != ")":
+                raise SkillQueryError("Missing closing parenthesis.")
+            return node
+        if isinstance(tok, tuple):
+            return ("term", tok[1])
+        raise SkillQueryError(
+            "Query ended unexpectedly." if tok is None else f"Unexpected token {self._show(tok)}."
+        )
+
+    @staticmethod
+    def _show(tok):
+        return repr(tok[1]) if isinstance(tok, tuple) else repr(tok)
+
+
+def parse_query(text):
+    """Parse a boolean skill query into an AST (see _Parser)."""
+    return _Parser(_tokenize(text)).parse()
+
+
+# ─── Inverted index ──────────────────────────────────────────────────────────
+class SkillIndex:
+    """
+    Inverted index skill ID → sorted numpy array of corpus job rows.
+
+    Postings are the column slices of the job×skill matrix in CSC form, so
+    building the index is a single sparse conversion, and queries such as
+    `python AND (aws OR gcp) AND NOT java` are answered with sorted-array
+    merges / galloping intersections instead of a Python scan over every job.
+    """
+
+    def __init__(self, corpus, required_only=True):
+        self.corpus = corpus
+        self.required_only = required_only
+        X = corpus.skill_indicator(required_only).tocsc()
+        X.sort_indices()
+        self.indptr = X.indptr
+        self.indices = X.indices.astype(np.int32, copy=False)
+        self.all_jobs = np.arange(corpus.n_jobs, dtype=np.int32)
+
+    @classmethod
+    def for_corpus(cls, corpus, required_only=True):
+        """Index cached on the corpus (rebuilt after corpus.invalidate())."""
+        return corpus.derived(("skill_index", required_only), lambda: cls(corpus, required_only))
+
+    def postings(self, skill):
+        """Sorted job rows for a skill name or ID (empty if unknown)."""
+        skill_id = skill if isinstance(skill, (int, np.integer)) else self.corpus.skills.get(skill)
+        if skill_id is None or skill_id < 0 or skill_id + 1 >= len(self.indptr):
+            return EMPTY
+        return self.indices[self.indptr[skill_id]:self.indptr[skill_id + 1]]
+
+    def any_of(self, skills):
+        """Jobs listing at least one of `skills` (names or IDs)."""
+        return union([self.postings(s) for s in skills])
+
+    def all_of(self, skills):
+        """Jobs listing every one of `skills`; smallest lists are intersected first."""
+        lists = sorted((self.postings(s) for s in skills), key=len)
+        if not lists:
+            return EMPTY
+        result = lists[0]
+        for p in lists[1:]:
+            if len(result) == 0:
+                break
+            result = intersect(result, p)
+        return result
+
+    def query(self, text, unknown=None):
+        """
+        Evaluate a boolean query and return the sorted array of matching job rows.
+        Unknown skill names match nothing; pass a list as `unknown` to collect them.
+        """
+        return self._eval(parse_query(text), unknown if unknown is not None else [])
+
+    def _eval(self, node, unknown):
+        kind = node[0]
+        if kind == "term":
+            name = normalize_name(node[1])
+            if name not in self.corpus.skills:
+                unknown.append(name)
+            return self.postings(name)
+        if kind == "not":
+            return difference(self.all_jobs, self._eval(node[1], unknown))
+        if kind == "or":
+            return union([self._eval(child, unknown) for child in node[1]])
+
+        # AND: intersect the positive operands (smallest first), then subtract
+        # negated operands directly instead of materializing their complement.
+        positives = sorted((self._eval(c, unknown) for c in node[1] if c[0] != "not"), key=len)
+        negatives = [c[1] for c in node[1] if c[0] == "not"]
+        result = positives[0] if positives else self.all_jobs
+        for p in positives[1:]:
+            if len(result) == 0:
+                return EMPTY
+            result = intersect(result, p)
+        for child in negatives:
+            if len(result) == 0:
+                break
+            result = difference(result, self._eval(child, unknown))
+        return result
+
+
+def query_jobs(corpus, text, required_only=True, unknown=None):
+    """Convenience wrapper: job rows of `corpus` matching a boolean skill query."""
+    return SkillIndex.for_corpus(corpus, required_only).query(text, unknown)
@@ -0,0 +1,115 @@
+# skill_search.py
+
+"""
+Search-as-you-type over skill names.
+
+SkillSearchIndex is built once per skill list and answers each keystroke
+from prebuilt posting lists (sorted int32 arrays of skill positions, so
+results come back in the list's own order, i.e. most common skill first):
+
+• queries of 1–2 characters: prefix lookup of every name and every word
+  in it (bisect into the sorted word list), followed by the other names
+  containing the query anywhere ("++" → "c++"), found by a scan;
+• longer queries: trigram postings. Intersecting the query's trigrams gives
+  the substring candidates, which are then checked with `in`. Typo
+  tolerance comes from the same postings: names sharing at least
+  FUZZY_MIN_SHARE of the query's word-padded trigrams follow the exact
+  hits, ranked by trigram Jaccard similarity (so short close names beat
+  long ones that merely contain some of the trigrams).
+"""
+
+import re
+from bisect import bisect_left
+
+import numpy as np
+
+from skill_query import EMPTY, intersect
+
+FUZZY_MIN_LENGTH = 4         # queries shorter than this only match exactly
+FUZZY_MIN_SHARE = 0.3        # share of the query's trigrams a near miss must contain
+MAX_FUZZY = 50               # near misses listed after the exact matches
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text):
+    """Distinct 3-character substrings of `text`."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SkillSearchIndex:
+    """Trigram / word-prefix index over a list of skill names (positions are result IDs)."""
+
+    def __init__(self, names):
+        self.names = [name.lower() for name in names]
+        postings = {}
+        words = []
+        self.n_grams = np.zeros(len(self.names), dtype=np.int32)
+        for i, name in enumerate(self.names):
+            # Padding marks word starts/ends, so "pyhton" still shares " py" and "on " with "python"
+            grams = trigrams(f" {name} ")
+            self.n_grams[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+            words.extend((word, i) for word in {name, *_WORD_RE.findall(name)})
+        self.postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_ids = np.array([i for _, i in words], dtype=np.int32)
+        self.all_ids = np.arange(len(self.names), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    def prefix(self, text):
+        """Sorted IDs of names that (or one of whose words) start with `text`."""
+        lo = bisect_left(self.words, text)
+        hi = bisect_left(self.words, text + "\uffff", lo)
+        return np.unique(self.word_ids[lo:hi])
+
+    def substring(self, text):
+        """Sorted IDs of names containing `text` (at least 3 characters)."""
+        lists = sorted((self.postings.get(gram, EMPTY) for gram in trigrams(text)), key=len)
+        candidates = lists[0]
+        for posting in lists[1:]:
+            if not len(candidates):
+                break
+            candidates = intersect(candidates, posting)
+        return np.array([i for i in candidates.tolist() if text in self.names[i]], dtype=np.int32)
+
+    def scan(self, text, exclude=EMPTY):
+        """Sorted IDs of names containing `text`, minus `exclude` (linear scan, for queries too short for trigrams)."""
+        skip = set(exclude.tolist())
+        return np.array([i for i, name in enumerate(self.names) if text in name and i not in skip], dtype=np.int32)
+
+    def fuzzy(self, text, exclude=EMPTY, limit=MAX_FUZZY):
+        """IDs of names sharing ≥ FUZZY_MIN_SHARE of text's padded trigrams, most similar first."""
+        grams = trigrams(f" {text} ")
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return EMPTY
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.names))
+        shared[exclude] = 0
+        candidates = np.flatnonzero(shared >= max(2, FUZZY_MIN_SHARE * len(grams)))
+        common = shared[candidates]
+        jaccard = common / (len(grams) + self.n_grams[candidates] - common)
+        order = np.lexsort((candidates, -jaccard))
+        return candidates[order[:limit]].astype(np.int32)
+
+    def search(self, text, fuzzy=True):
+        """
+        IDs matching a search box entry, in display order: every ID for an
+        empty query, else the exact matches in list order (for 1–2
+        characters the word-prefix hits first, then the other substring
+        hits) followed by up to MAX_FUZZY near misses.
+        """
+        text = text.strip().lower()
+        if not text:
+            return self.all_ids
+        if len(text) < 3:
+            starts = self.prefix(text)
+            return np.concatenate([starts, self.scan(text, exclude=starts)])
+        exact = self.substring(text)
+        if not fuzzy or len(text) < FUZZY_MIN_LENGTH:
+            return exact
+        return np.concatenate([exact, self.fuzzy(text, exclude=exact)])
@@ -0,0 +1,190 @@
+# task_scheduler.py
+
+"""
+Background tasks for the GUI.
+
+TaskScheduler runs chart and analysis jobs on a bounded thread pool
+(MAX_WORKERS) instead of one unbounded Thread per click:
+
+• Inputs are snapshotted by the caller on the Tk thread: submit() gets
+  plain values (the selected skills as a list, …), never Tk variables.
+• A request identical to one still queued or running (same function and
+  arguments) is coalesced into it, so a double click starts one job.
+• Every task has a CancelToken. Cancelling is cooperative: a queued task
+  never starts, and a running one stops at its next checkpoint, where
+  TaskCancelled is raised: a progress report (progress=True tasks), a
+  compute_pool step, or check_cancelled(), which the charts call before
+  writing a file or opening the browser. The token reaches the task through
+  the thread it runs on (current_token()), so task functions keep their
+  signatures. A cancelled task stays listed as "cancelling" until it has
+  actually stopped, and an identical request made meanwhile is coalesced
+  into it instead of starting a second copy. Its on_done is dropped.
+• State changes, results and errors reach the UI through `post` (e.g.
+  lambda fn: root.after(0, fn)), so on_change / on_done / on_error always
+  run on the Tk thread.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4              # chart jobs running at once (heavy steps go to compute_pool); the rest wait
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task at its next progress report once it is cancelled."""
+
+
+_current = threading.local()  # .token: CancelToken of the task running on this thread
+
+
+def current_token():
+    """CancelToken of the task running on this thread (None outside a task)."""
+    return getattr(_current, "token", None)
+
+
+def check_cancelled():
+    """Raise TaskCancelled if the task running on this thread was cancelled (no-op outside a task)."""
+    token = current_token()
+    if token is not None:
+        token.check()
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if the task was cancelled."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class Task:
+    """A submitted job: label, state ("queued" / "running" / "cancelling"), progress (0–100 or None), token."""
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.state = "queued"
+        self.progress = None
+        self.token = CancelToken()
+        self.future = None
+
+
+def _freeze(value):
+    """Hashable stand-in for a task argument (lists → tuples, …; unhashable objects by identity)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    return value
+
+
+class TaskScheduler:
+    """
+    Bounded pool of background tasks. on_change(tasks) gets the queued,
+    running and cancelling tasks after every change; on_error(task,
+    exception) gets failures.
+    """
+
+    def __init__(self, post, on_change=None, on_error=None, max_workers=MAX_WORKERS):
+        self._post = post
+        self._on_change = on_change
+        self._on_error = on_error
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="task")
+        self._tasks = {}             # key → Task (until it has finished), in submission order
+        self._lock = threading.Lock()
+
+    def submit(self, label, fn, *args, on_done=None, progress=False, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the pool; with progress=True fn also gets
+        progress_callback=<report percent>. on_done(result) runs on the UI
+        thread after success. Returns the Task, or the identical task already
+        queued / running / cancelling.
+        """
+        key = (getattr(fn, "__qualname__", repr(fn)), _freeze(args), _freeze(kwargs))
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None:
+                return task
+            task = self._tasks[key] = Task(key, label)
+        if progress:
+            kwargs["progress_callback"] = lambda percent: self._report(task, percent)
+        task.future = self._pool.submit(self._run, task, fn, args, kwargs, on_done)
+        self._changed()
+        return task
+
+    def tasks(self):
+        """Unfinished tasks, oldest first."""
+        with self._lock:
+            return list(self._tasks.values())
+
+    def cancel(self, task=None):
+        """
+        Cancel `task`, or every unfinished task. Queued ones are dropped at
+        once; running ones are marked "cancelling" until they stop.
+        """
+        with self._lock:
+            targets = [task] if task is not None else list(self._tasks.values())
+            for t in targets:
+                if self._tasks.get(t.key) is not t:
+                    continue
+                t.token.cancel()
+                if t.future is not None and t.future.cancel():
+                    del self._tasks[t.key]  # never started, so _run won't remove it
+                else:
+                    t.state = "cancelling"
+        self._changed()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ── worker side ───────────────────────────────────────────────────────────
+    def _run(self, task, fn, args, kwargs, on_done):
+        _current.token = task.token
+        try:
+            with self._lock:
+                task.token.check()
+                task.state = "running"
+            self._changed()
+            result = fn(*args, **kwargs)
+            task.token.check()
+        except TaskCancelled:
+            return
+        except Exception as e:
+            if self._on_error and not task.token.cancelled:
+                self._post(lambda error=e: self._on_error(task, error))
+            return
+        finally:
+            _current.token = None
+            with self._lock:
+                if self._tasks.get(task.key) is task:
+                    del self._tasks[task.key]
+            self._changed()
+        if on_done:
+            # Checked again on the UI thread: the task may be cancelled before the post runs
+            self._post(lambda: task.token.cancelled or on_done(result))
+
+    def _report(self, task, percent):
+        task.token.check()
+        task.progress = percent
+        self._changed()
+
+    def _changed(self):
+        if self._on_change:
+            tasks = self.tasks()
+            self._post(lambda: self._on_change(tasks))
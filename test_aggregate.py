@@ -0,0 +1,69 @@
+import random
+import sqlite3
+
+import pytest
+
+import aggregate
+from aggregate import aggregate_corpus, partition_bounds, upper_pairs
+from conftest import add_jobs
+from cooccurrence import skill_pairs
+from data_loader import load_corpus
+from db_setup import setup_database
+
+
+def counts(vocab, values):
+    return {vocab[i]: v for i, v in enumerate(values.tolist()) if v}
+
+
+def pairs(vocab, matrix):
+    """{(name, name): weight} of a pair matrix's upper triangle, names ordered."""
+    return {tuple(sorted((vocab[a], vocab[b]))): w for a, b, w in zip(*(x.tolist() for x in upper_pairs(matrix)))}
+
+
+def edges(corpus, required_only):
+    return {
+        tuple(sorted((corpus.skills[a], corpus.skills[b]))): w
+        for a, b, w in zip(*(x.tolist() for x in skill_pairs(corpus, required_only)))
+    }
+
+
+def test_partition_bounds_are_sorted_job_ids(jobs_db):
+    bounds = partition_bounds(jobs_db, 8)
+    assert bounds == sorted(set(bounds)) and 0 < len(bounds) < 8
+    assert partition_bounds(jobs_db, 1) == []
+
+
+@pytest.mark.parametrize("max_workers, partitions", [(1, 1), (1, 7), (2, 5)])
+def test_aggregate_equals_corpus_counts(jobs_db, corpus, monkeypatch, max_workers, partitions):
+    monkeypatch.setattr(aggregate, "CHUNK_ROWS", 97)  # several chunks per partition
+    agg = aggregate_corpus(jobs_db, max_workers=max_workers, partitions=partitions)
+    assert agg.n_jobs == corpus.n_jobs
+    for required_only, skill_counts, cert_counts, cooccurrence in (
+        (False, agg.skill_counts, agg.cert_counts, agg.skill_cooccurrence),
+        (True, agg.required_skill_counts, agg.required_cert_counts, agg.required_skill_cooccurrence),
+    ):
+        assert counts(agg.skills, skill_counts) == counts(corpus.skills, corpus.skill_counts(required_only))
+        assert counts(agg.certs, cert_counts) == counts(corpus.certs, corpus.cert_counts(required_only))
+        assert pairs(agg.skills, cooccurrence) == pairs(corpus.skills, corpus.cooccurrence(required_only))
+        assert counts(agg.skills, cooccurrence.diagonal()) == counts(agg.skills, skill_counts)
+
+
+def test_stored_skill_pairs_equal_cooccurrence(jobs_db, monkeypatch):
+    setup_database(jobs_db, verbose=False, max_workers=1)
+    corpus = load_corpus(jobs_db, use_cache=False)
+    expected = {r: pairs(corpus.skills, corpus.cooccurrence(r)) for r in (False, True)}
+    with monkeypatch.context() as patch:
+        patch.setattr("cooccurrence._upper_pairs", None)  # must be read from the table
+        for required_only in (False, True):
+            assert edges(corpus, required_only) == expected[required_only]
+
+    conn = sqlite3.connect(jobs_db)
+    add_jobs(conn, range(10_000, 10_030), random.Random(3))
+    conn.execute("UPDATE skills SET name = 'renamed' WHERE rowid = 5")
+    conn.execute("DELETE FROM skills WHERE job_id = 2")
+    conn.commit()
+    conn.close()
+    setup_database(jobs_db, analyze=False, verbose=False)  # incremental update
+    corpus = load_corpus(jobs_db, use_cache=False)
+    for required_only in (False, True):
+        assert edges(corpus, required_only) == pairs(corpus.skills, corpus.cooccurrence(required_only))
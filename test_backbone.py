@@ -0,0 +1,127 @@
+import random
+
+import numpy as np
+import pytest
+
+from backbone import backbone_mask, disparity_alpha, endpoint_ranks
+from cooccurrence import backbone_pairs, cooccurrence_graph, skill_pairs
+
+
+def random_graph(n_nodes, n_edges, seed):
+    """(a_ids, b_ids, weights) of distinct random pairs a < b with small, often tied, weights."""
+    rng = random.Random(seed)
+    pairs = set()
+    while len(pairs) < n_edges:
+        a, b = rng.sample(range(n_nodes), 2)
+        pairs.add((min(a, b), max(a, b)))
+    pairs = sorted(pairs)
+    return (
+        np.array([a for a, _ in pairs], dtype=np.int32),
+        np.array([b for _, b in pairs], dtype=np.int32),
+        np.array([rng.choice([1, 1, 2, 3, 5, 8, 40]) for _ in pairs], dtype=np.int64),
+    )
+
+
+def node_edges(a_ids, b_ids):
+    """{node: [edge index, …]} built one edge at a time."""
+    edges = {}
+    for i, (a, b) in enumerate(zip(a_ids.tolist(), b_ids.tolist())):
+        edges.setdefault(a, []).append(i)
+        edges.setdefault(b, []).append(i)
+    return edges
+
+
+def brute_ranks(a_ids, b_ids, weights):
+    rank = [len(weights)] * len(weights)
+    for edges in node_edges(a_ids, b_ids).values():
+        for position, i in enumerate(sorted(edges, key=lambda i: (-weights[i], i))):
+            rank[i] = min(rank[i], position)
+    return rank
+
+
+def brute_alpha(a_ids, b_ids, weights):
+    alpha = [1.0] * len(weights)
+    for edges in node_edges(a_ids, b_ids).values():
+        strength = sum(weights[i] for i in edges)
+        for i in edges:
+            if len(edges) > 1:
+                alpha[i] = min(alpha[i], (1 - weights[i] / strength) ** (len(edges) - 1))
+    return alpha
+
+
+def brute_mask(a_ids, b_ids, weights, method, max_edges=None, alpha=None, k=None):
+    w = weights.tolist()
+    rank = brute_ranks(a_ids, b_ids, w)
+    score = brute_alpha(a_ids, b_ids, w) if method == "disparity" else [float(r) for r in rank]
+    keep = [
+        (alpha is None or method != "disparity" or score[i] < alpha)
+        and (k is None or method != "topk" or rank[i] < k)
+        for i in range(len(w))
+    ]
+    candidates = [i for i in range(len(w)) if keep[i]]
+    if max_edges is not None and len(candidates) > max_edges:
+        candidates.sort(key=lambda i: (rank[i] > 0, score[i], -w[i], i))
+        candidates = set(candidates[:max_edges])
+        keep = [i in candidates for i in range(len(w))]
+    return keep
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_scores_equal_per_node_reference(seed):
+    a_ids, b_ids, weights = random_graph(40, 150, seed)
+    assert endpoint_ranks(a_ids, b_ids, weights).tolist() == brute_ranks(a_ids, b_ids, weights.tolist())
+    assert disparity_alpha(a_ids, b_ids, weights).tolist() == pytest.approx(
+        brute_alpha(a_ids, b_ids, weights.tolist())
+    )
+
+
+@pytest.mark.parametrize("method, max_edges, alpha, k", [
+    ("disparity", None, 0.3, None),
+    ("disparity", 45, None, None),
+    ("disparity", 60, 0.5, None),
+    ("topk", None, None, 2),
+    ("topk", 30, None, None),
+    ("topk", 50, None, 3),
+    ("disparity", 5, None, None),
+])
+def test_backbone_mask_equals_per_node_reference(method, max_edges, alpha, k):
+    for seed in range(5):
+        a_ids, b_ids, weights = random_graph(40, 150, seed)
+        mask = backbone_mask(a_ids, b_ids, weights, method, max_edges, alpha, k)
+        assert mask.tolist() == brute_mask(a_ids, b_ids, weights, method, max_edges, alpha, k)
+        if max_edges is not None:
+            assert mask.sum() <= max_edges
+
+
+@pytest.mark.parametrize("method", ["disparity", "topk"])
+def test_budget_keeps_every_nodes_heaviest_edge(method):
+    a_ids, b_ids, weights = random_graph(60, 400, 9)
+    heaviest = {node: max(weights[i] for i in edges) for node, edges in node_edges(a_ids, b_ids).items()}
+    mask = backbone_mask(a_ids, b_ids, weights, method, max_edges=len(heaviest))
+    kept = {}
+    for a, b, w in zip(a_ids[mask].tolist(), b_ids[mask].tolist(), weights[mask].tolist()):
+        kept[a] = max(kept.get(a, 0), w)
+        kept[b] = max(kept.get(b, 0), w)
+    assert kept == heaviest
+
+
+def test_backbone_mask_edge_cases():
+    a_ids, b_ids, weights = random_graph(10, 20, 0)
+    assert backbone_mask(a_ids, b_ids, weights).all()
+    assert not backbone_mask(a_ids[:0], b_ids[:0], weights[:0], max_edges=3).size
+    with pytest.raises(ValueError):
+        backbone_mask(a_ids, b_ids, weights, method="nope")
+
+
+def test_backbone_pairs_cut_the_corpus_graph(corpus):
+    a_ids, b_ids, weights = skill_pairs(corpus, required_only=False)
+    nodes = np.unique(np.concatenate([a_ids, b_ids]))
+    budget = len(nodes)
+    assert len(weights) > budget
+    cut = backbone_pairs(corpus, required_only=False, max_edges=budget)
+    mask = backbone_mask(a_ids, b_ids, weights, max_edges=budget)
+    assert [x.tolist() for x in cut] == [a_ids[mask].tolist(), b_ids[mask].tolist(), weights[mask].tolist()]
+    assert backbone_pairs(corpus, required_only=False, max_edges=budget) is cut
+    G = cooccurrence_graph(corpus, required_only=False, max_edges=budget)
+    assert G.number_of_edges() == budget
+    assert set(G.nodes()) == set(corpus.skills[i] for i in nodes.tolist())  # no skill drops out
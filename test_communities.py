@@ -0,0 +1,66 @@
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy import sparse
+
+import communities
+from communities import community_members, louvain, modularity, skill_communities, skill_graph
+from data_loader import load_corpus
+
+
+def planted_partition(sizes, p_in=0.4, p_out=0.01, seed=0):
+    """Symmetric CSR adjacency of random blocks plus the block of every node."""
+    rng = np.random.default_rng(seed)
+    blocks = np.repeat(np.arange(len(sizes)), sizes)
+    same = blocks[:, None] == blocks[None, :]
+    edges = np.triu(rng.random((len(blocks), len(blocks))) < np.where(same, p_in, p_out), k=1)
+    weights = np.triu(rng.integers(1, 5, size=edges.shape), k=1) * edges
+    return sparse.csr_matrix(weights + weights.T), blocks
+
+
+def test_louvain_recovers_planted_communities():
+    A, blocks = planted_partition([50, 30, 20, 40])
+    labels = louvain(A, seed=1)
+    # One label per block, largest block first
+    assert {(b, l) for b, l in zip(blocks.tolist(), labels.tolist())} == {(0, 0), (1, 2), (2, 3), (3, 1)}
+    assert modularity(A, labels) == pytest.approx(modularity(A, blocks))
+    assert np.array_equal(louvain(A, seed=1), labels)
+
+
+def test_modularity_matches_networkx():
+    G = nx.karate_club_graph()
+    A = nx.to_scipy_sparse_array(G, weight="weight", format="csr")
+    labels = louvain(A)
+    groups = [set(np.flatnonzero(labels == c).tolist()) for c in range(labels.max() + 1)]
+    for resolution in (0.5, 1.0, 2.0):
+        assert modularity(A, labels, resolution) == pytest.approx(
+            nx.community.modularity(G, groups, weight="weight", resolution=resolution)
+        )
+    best = nx.community.modularity(G, nx.community.louvain_communities(G, weight="weight", seed=0), weight="weight")
+    assert modularity(A, labels) >= best - 0.02
+    assert louvain(sparse.csr_matrix((3, 3))).tolist() == [0, 1, 2]
+
+
+def test_skill_communities_are_persisted_and_reused(jobs_db, corpus, monkeypatch):
+    labels = skill_communities(corpus)
+    node_ids, A = skill_graph(corpus, communities.DEFAULT_REQUIRED_ONLY, communities.DEFAULT_MIN_WEIGHT)
+    assert len(node_ids) > 10
+    assert (labels[node_ids] >= 0).all() and (np.delete(labels, node_ids) == -1).all()
+    assert skill_communities(corpus) is labels  # memoized on the corpus
+    assert [name for name in os.listdir(corpus.cache_dir) if name.startswith("communities-")]
+
+    def no_louvain(*args, **kwargs):
+        raise AssertionError("the stored clustering must be reused")
+
+    monkeypatch.setattr(communities, "louvain", no_louvain)
+    reloaded = load_corpus(jobs_db, use_cache=False)
+    again = skill_communities(reloaded)
+    names = dict(zip(corpus.skill_names().tolist(), labels.tolist()))
+    assert dict(zip(reloaded.skill_names().tolist(), again.tolist())) == names
+
+    members = community_members(labels)
+    assert [len(m) for m in members] == sorted((len(m) for m in members), reverse=True)
+    assert sorted(np.concatenate(members).tolist()) == sorted(node_ids.tolist())
+    assert all((labels[m] == c).all() for c, m in enumerate(members))
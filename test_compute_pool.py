@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+import compute_pool
+
+
+def corpus_summary(corpus, required_only=False):
+    """Runs in the worker: what it sees of the corpus it was given."""
+    return (
+        os.getpid(), corpus.db_path, corpus.job_ids.tolist(),
+        dict(zip(corpus.skill_names().tolist(), corpus.skill_counts(required_only).tolist())),
+        corpus.skill_matrix.toarray(), corpus.hwm,
+    )
+
+
+@pytest.fixture
+def pool():
+    compute_pool.enable(max_workers=1)
+    yield
+    compute_pool.shutdown()
+
+
+def version(corpus, i):
+    """A copy of `corpus` that publishes as a different snapshot."""
+    other = corpus.copy()
+    other.hwm["skills"] = other.hwm.get("skills", 0) + i
+    return other
+
+
+def test_run_without_pool_is_in_process(corpus):
+    assert not compute_pool.enabled()
+    assert compute_pool.run(corpus_summary, corpus)[0] == os.getpid()
+
+
+def test_corpus_round_trips_through_a_snapshot(pool, corpus):
+    pid, db_path, job_ids, counts, matrix, hwm = compute_pool.run(corpus_summary, corpus, required_only=True)
+    assert pid != os.getpid()
+    assert db_path == corpus.db_path and job_ids == corpus.job_ids.tolist() and hwm == corpus.hwm
+    assert counts == dict(zip(corpus.skill_names().tolist(), corpus.skill_counts(True).tolist()))
+    assert np.array_equal(matrix, corpus.skill_matrix.toarray())
+    assert compute_pool._refs == {}  # released once the step is done
+
+
+def test_held_snapshots_outlive_newer_versions(pool, corpus):
+    held = compute_pool.publish(corpus, hold=True)  # a task that is still queued
+    for i in range(1, compute_pool.KEEP_SNAPSHOTS + 2):
+        compute_pool.publish(version(corpus, i))
+    assert os.path.isdir(held) and held in compute_pool._snapshots
+    assert len(compute_pool._snapshots) == compute_pool.KEEP_SNAPSHOTS + 1
+    assert compute_pool.run(corpus_summary, corpus)[2] == corpus.job_ids.tolist()
+
+    compute_pool.release([held])
+    assert not os.path.exists(held)
+    assert len(compute_pool._snapshots) == compute_pool.KEEP_SNAPSHOTS
+    assert all(os.path.isdir(path) for path in compute_pool._snapshots)
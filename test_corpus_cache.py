@@ -0,0 +1,108 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import corpus_cache
+from data_loader import load_corpus
+
+
+def assert_same_state(a, b):
+    arrays_a, meta_a = a.to_state()
+    arrays_b, meta_b = b.to_state()
+    assert meta_a == meta_b
+    assert arrays_a.keys() == arrays_b.keys()
+    for name, values in arrays_a.items():
+        if values.dtype.kind == "f":
+            assert np.array_equal(values, arrays_b[name], equal_nan=True), name
+        else:
+            assert values.tolist() == arrays_b[name].tolist(), name
+
+
+def test_cached_load_equals_database_load(jobs_db, monkeypatch):
+    fresh = load_corpus(jobs_db)          # miss: read from SQLite and stored
+    assert os.listdir(corpus_cache.cache_dir_for(jobs_db))
+
+    def no_sqlite(*args, **kwargs):
+        raise AssertionError("a warm start must not read the database")
+
+    monkeypatch.setattr("data_loader.read_corpus", no_sqlite)
+    monkeypatch.setattr(corpus_cache, "content_hash", no_sqlite)
+    cached = load_corpus(jobs_db)         # hit: manifest + cache entry only
+    assert_same_state(fresh, cached)
+    assert cached.skill_counts().tolist() == fresh.skill_counts().tolist()
+
+
+def test_fingerprint_follows_content_not_mtime(jobs_db):
+    first = corpus_cache.fingerprint(jobs_db)
+    assert corpus_cache.fingerprint(jobs_db) == first
+
+    later = time.time() + 10
+    os.utime(jobs_db, (later, later))     # stat changes, rows don't
+    assert corpus_cache.fingerprint(jobs_db) == first
+
+    conn = sqlite3.connect(jobs_db)
+    conn.execute("INSERT INTO skills VALUES (1, 'new skill', 1)")
+    conn.commit()
+    conn.close()
+    assert corpus_cache.fingerprint(jobs_db) != first
+
+
+def test_changed_database_is_reloaded(jobs_db):
+    load_corpus(jobs_db)
+    conn = sqlite3.connect(jobs_db)
+    conn.execute("INSERT INTO skills VALUES (1, 'new skill', 1)")
+    conn.commit()
+    conn.close()
+    assert "new skill" in load_corpus(jobs_db).skills
+    assert_same_state(load_corpus(jobs_db), load_corpus(jobs_db, use_cache=False))
+
+
+def test_store_prunes_old_entries_and_clear_empties(jobs_db):
+    cache_dir = corpus_cache.cache_dir_for(jobs_db)
+    arrays = {"values": np.arange(3)}
+    for i in range(corpus_cache.KEEP_ENTRIES + 3):
+        corpus_cache.store(jobs_db, f"key{i}", arrays, {"i": i})
+        os.utime(os.path.join(cache_dir, f"corpus-key{i}.npz"), (i, i))
+    entries = [name for name in os.listdir(cache_dir) if name.startswith("corpus-")]
+    assert len(entries) == corpus_cache.KEEP_ENTRIES
+    loaded, meta = corpus_cache.load(jobs_db, f"key{corpus_cache.KEEP_ENTRIES + 2}")
+    assert loaded["values"].tolist() == [0, 1, 2] and meta == {"i": corpus_cache.KEEP_ENTRIES + 2}
+    assert corpus_cache.load(jobs_db, "key0") is None
+
+    corpus_cache.clear(jobs_db)
+    assert os.listdir(cache_dir) == [".lock"]
+
+
+@pytest.mark.skipif(corpus_cache.fcntl is None, reason="shared locks need fcntl")
+def test_readers_share_the_lock_and_writers_wait(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    events = []
+    release = threading.Event()
+    holding = threading.Event()
+
+    def reader():
+        with corpus_cache.cache_lock(cache_dir, shared=True):
+            holding.set()
+            release.wait(5)
+
+    def writer():
+        with corpus_cache.cache_lock(cache_dir):
+            events.append("writer")
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    assert holding.wait(5)
+    with corpus_cache.cache_lock(cache_dir, shared=True):  # a second reader gets in
+        events.append("reader")
+    blocked = threading.Thread(target=writer)
+    blocked.start()
+    blocked.join(0.2)
+    assert events == ["reader"]                            # the writer waits for the first reader
+    release.set()
+    thread.join(5)
+    blocked.join(5)
+    assert events == ["reader", "writer"]
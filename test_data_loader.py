@@ -0,0 +1,121 @@
+import random
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import add_jobs, create_jobs_db, read_postings
+from data_loader import load_corpus, load_skills
+from db_setup import install_change_log
+
+
+def postings(corpus, required_only=False):
+    """{job_id: {skill name, …}} of every job with skills."""
+    return {job_id: set(names) for job_id, names in corpus.job_skill_map(required_only).items()}
+
+
+def jobs(corpus):
+    """{job_id: (title, company, salary_avg)} of the listed jobs."""
+    return {
+        corpus.job_ids[row]: (*corpus.job_info(row), corpus.salary_avg[row])
+        for row in np.flatnonzero(corpus.listed).tolist()
+    }
+
+
+def skill_counts(corpus, required_only=False):
+    return dict(zip(corpus.skill_names().tolist(), corpus.skill_counts(required_only).tolist()))
+
+
+def assert_same_corpus(a, b):
+    assert set(a.job_ids.tolist()) == set(b.job_ids.tolist())
+    assert jobs(a).keys() == jobs(b).keys()
+    for job_id, (title, company, salary) in jobs(a).items():
+        other = jobs(b)[job_id]
+        assert (title, company) == other[:2]
+        assert salary == other[2] or (np.isnan(salary) and np.isnan(other[2]))
+    for required_only in (False, True):
+        assert postings(a, required_only) == postings(b, required_only)
+        counts = {k: v for k, v in skill_counts(a, required_only).items() if v}
+        assert counts == {k: v for k, v in skill_counts(b, required_only).items() if v}
+
+
+def test_corpus_matches_database(jobs_db, corpus):
+    assert postings(corpus) == read_postings(jobs_db)
+    assert postings(corpus, required_only=True) == read_postings(jobs_db, required_only=True)
+    certs = read_postings(jobs_db, "certifications")
+    assert sum(len(names) for names in certs.values()) == corpus.cert_matrix.nnz
+
+
+def test_load_skills_counts_each_posting_once(jobs_db, corpus):
+    counts = {}
+    for names in read_postings(jobs_db).values():
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+    skills = load_skills(corpus=corpus)
+    assert len(skills) == sum(counts.values())
+    assert {name: skills.count(name) for name in counts} == counts
+
+
+def test_refresh_equals_full_reload(jobs_db):
+    conn = sqlite3.connect(jobs_db)
+    install_change_log(conn)
+    corpus = load_corpus(jobs_db, use_cache=False)
+    before = postings(corpus)
+
+    rng = random.Random(7)
+    add_jobs(conn, range(10_000, 10_050), rng)                        # new postings
+    conn.execute("INSERT INTO skills VALUES (1, 'brand new skill', 1)")  # appended to an old job
+    conn.execute("UPDATE skills SET name = 'renamed' WHERE rowid = 3")   # logged change
+    conn.execute("UPDATE jobs SET title = 'Chief Skill Officer' WHERE job_id = 2")
+    conn.commit()
+    conn.close()
+
+    updated, changed = corpus.refreshed()
+    assert changed > 50
+    assert_same_corpus(updated, load_corpus(jobs_db, use_cache=False))
+    assert postings(corpus) == before  # the original is left as it was
+
+    assert corpus.refresh() == changed
+    assert_same_corpus(corpus, updated)
+    assert corpus.refreshed()[1] == 0
+
+
+def test_path_objects_load_a_single_database(jobs_db):
+    corpus = load_corpus(Path(jobs_db), use_cache=False)
+    assert corpus.db_path == jobs_db
+    assert corpus.refreshed()[1] == 0
+
+
+def cooccurrence_pairs(corpus, required_only):
+    C = corpus.cooccurrence(required_only).tocoo()
+    return {(corpus.skills[a], corpus.skills[b]): w for a, b, w in zip(C.row.tolist(), C.col.tolist(), C.data.tolist())}
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_merged_shards_equal_one_combined_database(tmp_path, max_workers):
+    older = create_jobs_db(str(tmp_path / "older.db"), n_jobs=200, seed=1, first_job_id=1)
+    newer = create_jobs_db(str(tmp_path / "newer.db"), n_jobs=200, seed=2, first_job_id=150)
+    combined = create_jobs_db(str(tmp_path / "combined.db"), n_jobs=0)
+    conn = sqlite3.connect(combined)
+    conn.execute("ATTACH ? AS older", (older,))
+    conn.execute("ATTACH ? AS newer", (newer,))
+    for table in ("jobs", "skills", "certifications"):  # jobs 150–199 come from the newer shard only
+        conn.execute(f"INSERT INTO {table} SELECT * FROM older.{table} WHERE job_id < 150")
+        conn.execute(f"INSERT INTO {table} SELECT * FROM newer.{table}")
+    conn.commit()
+    conn.close()
+
+    merged = load_corpus([older, newer], use_cache=False, max_workers=max_workers)
+    expected = load_corpus(combined, use_cache=False)
+    assert merged.db_path == [older, newer]
+    assert_same_corpus(merged, expected)
+    for required_only in (False, True):
+        # Counts reduced from the shards minus the replaced rows, not recounted
+        assert ("skill_counts", required_only) in merged._derived
+        certs = dict(zip(merged.certs.strings, merged.cert_counts(required_only).tolist()))
+        assert {k: v for k, v in certs.items() if v} == dict(
+            zip(expected.certs.strings, expected.cert_counts(required_only).tolist())
+        )
+    assert ("cooccurrence", True) in merged._derived
+    assert cooccurrence_pairs(merged, True) == cooccurrence_pairs(expected, True)
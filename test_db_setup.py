@@ -0,0 +1,56 @@
+import sqlite3
+
+from conftest import read_postings
+from cooccurrence import skill_pairs
+from data_loader import normalize_name, read_corpus
+from db_setup import setup_database, update_skill_pairs
+
+
+def name_norms(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT name, name_norm FROM skills").fetchall()
+    conn.close()
+    return rows
+
+
+def test_setup_backfills_and_triggers_keep_name_norm(jobs_db):
+    setup_database(jobs_db, verbose=False)
+    assert all(norm == normalize_name(name) for name, norm in name_norms(jobs_db))
+
+    conn = sqlite3.connect(jobs_db)
+    conn.execute("INSERT INTO skills (job_id, name, required) VALUES (1, '  Power BI ', 1)")
+    conn.execute("UPDATE skills SET name = 'SQL\t' WHERE rowid = 2")
+    conn.commit()
+    conn.close()
+    assert all(norm == normalize_name(name) for name, norm in name_norms(jobs_db) if name.isascii())
+    postings = {job_id: set(names) for job_id, names in read_corpus(jobs_db).job_skill_map(False).items()}
+    assert postings == read_postings(jobs_db)
+
+
+def test_non_ascii_spellings_resolve_to_one_skill(jobs_db, monkeypatch):
+    setup_database(jobs_db, verbose=False, max_workers=1)
+    conn = sqlite3.connect(jobs_db)
+    for job_id, name in ((5000, "Ünity"), (5001, " ünity "), (5002, "ÜNITY")):
+        conn.execute("INSERT INTO jobs (job_id, title) VALUES (?, 'Game Developer')", (job_id,))
+        conn.execute("INSERT INTO skills (job_id, name, required) VALUES (?, ?, 1)", (job_id, name))
+        conn.execute("INSERT INTO skills (job_id, name, required) VALUES (?, 'c++', 1)", (job_id,))
+    conn.commit()
+    # The SQL triggers only fold ASCII, so the stored spellings still differ
+    assert len({norm for name, norm in name_norms(jobs_db) if "nity" in name}) > 1
+    update_skill_pairs(conn)  # incremental update from the trigger-written names
+    conn.commit()
+    conn.close()
+
+    corpus = read_corpus(jobs_db)
+    assert [name for name in corpus.skills.strings if "nity" in name] == ["ünity"]
+    unity, cpp = corpus.skills.get("ünity"), corpus.skills.get("c++")
+    assert corpus.skill_counts(True)[unity] == 3
+
+    expected = corpus.cooccurrence(True)
+    monkeypatch.setattr("cooccurrence._upper_pairs", None)  # must be read from the stored table
+    for min_weight in (1, 3):
+        a_ids, b_ids, weights = skill_pairs(corpus, required_only=True, min_weight=min_weight)
+        pairs = list(zip(a_ids.tolist(), b_ids.tolist()))
+        assert len(pairs) == len(set(pairs)) and all(a < b for a, b in pairs)
+        assert dict(zip(pairs, weights.tolist()))[tuple(sorted((unity, cpp)))] == 3
+        assert all(expected[a, b] == w for (a, b), w in zip(pairs, weights.tolist()))
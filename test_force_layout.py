@@ -0,0 +1,66 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from charts import force_layout as fl
+from charts.force_layout import force_layout
+
+
+def planted_clusters(n_clusters, size, seed=0, p_in=0.3, p_out=0.002):
+    """Dense clusters joined by a few light edges; node i belongs to cluster i // size."""
+    rng = np.random.default_rng(seed)
+    G = nx.Graph()
+    n = n_clusters * size
+    G.add_nodes_from(f"s{i}" for i in range(n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            same = i // size == j // size
+            if rng.random() < (p_in if same else p_out):
+                G.add_edge(f"s{i}", f"s{j}", weight=5 if same else 1)
+    return G
+
+
+def separation(pos, size):
+    """Mean distance between nodes of different clusters / within the same cluster."""
+    X = np.array(list(pos.values()))
+    cluster = np.arange(len(X)) // size
+    dist = np.linalg.norm(X[:, None, :] - X[None, :, :], axis=-1)
+    same = cluster[:, None] == cluster[None, :]
+    np.fill_diagonal(same, False)
+    other = cluster[:, None] != cluster[None, :]
+    return dist[other].mean() / dist[same].mean()
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_multilevel_layout_separates_planted_clusters(dim):
+    G = planted_clusters(4, 40)
+    assert len(fl._coarsen(nx.to_scipy_sparse_array(G, format="csr"), np.ones(160))) > 1
+    pos = force_layout(G, dim=dim, seed=1)
+    assert list(pos) == list(G.nodes())
+    X = np.array(list(pos.values()))
+    assert X.shape == (160, dim) and np.isfinite(X).all()
+    assert np.abs(X).max() == pytest.approx(1.0)
+    assert separation(pos, 40) > 2
+    again = force_layout(G, dim=dim, seed=1)
+    assert all(np.array_equal(pos[n], again[n]) for n in G)
+
+
+def test_approximate_repulsion_on_large_graphs(monkeypatch):
+    monkeypatch.setattr(fl, "EXACT_MAX_NODES", 100)  # use the k-d tree / grid path
+    G = planted_clusters(5, 60, seed=2, p_in=0.15, p_out=0.0005)
+    G.add_nodes_from(["isolated-a", "isolated-b"])
+    pos = force_layout(G, iterations=30, seed=3)
+    X = np.array(list(pos.values()))
+    assert np.isfinite(X).all() and np.abs(X).max() <= 1.0 + 1e-9
+    del pos["isolated-a"], pos["isolated-b"]
+    assert separation(pos, 60) > 2
+
+
+def test_trivial_graphs_and_warm_start():
+    assert force_layout(nx.Graph()) == {}
+    assert force_layout(nx.Graph([("a", "a")])) == {"a": pytest.approx(np.zeros(2))}
+    G = planted_clusters(3, 30)
+    pos = force_layout(G, seed=4)
+    warm = force_layout(G, pos=pos, iterations=5, seed=4)
+    moved = np.mean([np.linalg.norm(warm[n] - pos[n]) for n in G])
+    assert moved < 0.2  # a warm start refines instead of starting over
@@ -0,0 +1,53 @@
+from conftest import read_postings
+from job_matching import MAX_MISSING, match_jobs, missing_skills
+
+
+def brute_force_matches(db_path, corpus, selected):
+    """{job row: missing count} computed posting by posting."""
+    required = read_postings(db_path, required_only=True)
+    selected = {s.lower() for s in selected}
+    out = {}
+    for job_id, names in required.items():
+        row = corpus.job_index[job_id]
+        covered = len(names & selected)
+        if corpus.listed[row] and covered and len(names) - covered <= MAX_MISSING:
+            out[row] = len(names) - covered
+    return out
+
+
+def test_match_jobs_equals_brute_force(jobs_db, corpus):
+    for selected in (["python"], ["python", "sql", "excel"], ["aws", "docker", "kubernetes", "java"]):
+        matches = match_jobs(corpus, selected)
+        assert dict(zip(matches.rows.tolist(), matches.missing.tolist())) == \
+            brute_force_matches(jobs_db, corpus, selected)
+
+
+def test_matches_are_ranked_by_missing_then_covered(corpus):
+    matches = match_jobs(corpus, ["python", "sql", "excel", "tableau"])
+    keys = list(zip(matches.missing.tolist(), (matches.missing - matches.n_required).tolist(), matches.rows.tolist()))
+    assert keys == sorted(keys)
+
+
+def test_near_misses_share_a_selected_skill(corpus):
+    matches = match_jobs(corpus, ["python"])
+    python = corpus.skills.get("python")
+    X = corpus.skill_indicator(required_only=True)
+    assert len(matches.rows)
+    assert all(X[row, python] for row in matches.rows.tolist())
+
+
+def test_no_selection_matches_nothing(corpus):
+    matches = match_jobs(corpus, [])
+    assert len(matches.rows) == 0
+    assert matches.summary() == "No matching jobs."
+
+
+def test_missing_skills_names_the_unselected_required_skills(jobs_db, corpus):
+    selected = ["python", "sql"]
+    required = read_postings(jobs_db, required_only=True)
+    mask = corpus.skill_mask(selected)
+    matches = match_jobs(corpus, selected)
+    for row, missing in zip(matches.rows.tolist(), matches.missing.tolist()):
+        names = missing_skills(corpus, row, mask)
+        assert len(names) == missing
+        assert set(names) == required[corpus.job_ids[row]] - set(selected)
@@ -0,0 +1,72 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from charts import layout_cache
+from charts.force_layout import force_layout
+from charts.layout_cache import _align, cached_spring_layout, graph_fingerprint, pooled_spring_layout
+
+
+def coords(pos, nodes=None):
+    return np.array([pos[n] for n in (nodes if nodes is not None else list(pos))])
+
+
+def assert_unit_box(pos):
+    X = coords(pos)
+    assert np.isfinite(X).all()
+    assert np.abs(X).max() == pytest.approx(1.0)
+    assert np.abs(X.mean(axis=0)).max() < 1e-9
+
+
+def with_chain(G, length, start):
+    """G plus a path of `length` new nodes hanging off `start`."""
+    grown = G.copy()
+    nx.add_path(grown, [start] + [f"chain{i}" for i in range(length)], weight=1)
+    return grown
+
+
+def test_cold_start_and_exact_hit(tmp_path, monkeypatch):
+    G = nx.barabasi_albert_graph(300, 2, seed=0)
+    nx.set_edge_attributes(G, 1, "weight")
+    cold = cached_spring_layout(G, cache_dir=str(tmp_path))
+    assert list(cold) == list(G.nodes())
+    assert_unit_box(cold)
+    uncached = force_layout(G)
+    assert np.allclose(coords(cold, G), nx.rescale_layout(coords(uncached, G)))
+
+    def no_layout(*args, **kwargs):
+        raise AssertionError("an exact hit must not lay out again")
+
+    monkeypatch.setattr(layout_cache, "force_layout", no_layout)
+    for hit in (cached_spring_layout(G, cache_dir=str(tmp_path)), pooled_spring_layout(G, cache_dir=str(tmp_path))):
+        assert list(hit) == list(cold)  # pooled runs in-process here (no pool enabled)
+        assert np.allclose(coords(hit, G), coords(cold, G))
+
+
+def test_warm_starts_stay_in_the_unit_box_and_keep_known_nodes(tmp_path):
+    G = nx.barabasi_albert_graph(300, 2, seed=0)
+    nx.set_edge_attributes(G, 1, "weight")
+    first = cached_spring_layout(G, cache_dir=str(tmp_path))
+    previous, graph = first, G
+    for step in range(3):  # every warm start aligns to the one before
+        graph = with_chain(graph, 100, step)
+        graph = nx.relabel_nodes(graph, {f"chain{i}": f"chain{step}-{i}" for i in range(100)})
+        assert graph_fingerprint(graph) != graph_fingerprint(G)
+        warm = cached_spring_layout(graph, cache_dir=str(tmp_path))
+        assert_unit_box(warm)
+        known = [n for n in previous if n in warm]
+        before, after = coords(previous, known), coords(warm, known)
+        # Same orientation (no mirroring) and known nodes roughly in place
+        assert np.corrcoef(before[:, 0], after[:, 0])[0, 1] > 0.8
+        assert np.corrcoef(before[:, 1], after[:, 1])[0, 1] > 0.8
+        previous = warm
+    assert len(list(tmp_path.glob("layout-*.npz"))) == 4
+
+
+def test_align_never_mirrors():
+    init = {n: np.array([n, n * n / 10.0]) for n in range(6)}
+    mirrored = {n: -p for n, p in init.items()}
+    aligned = _align(mirrored, init, list(init))
+    X, Y = coords(aligned), coords(mirrored)
+    spread = lambda A: np.sqrt(((A - A.mean(axis=0)) ** 2).sum())
+    assert np.allclose(X - X.mean(axis=0), (Y - Y.mean(axis=0)) * spread(coords(init)) / spread(Y))
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from sketches import CountMinSketch, SpaceSaving, pair_keys, split_pair_keys, top_items, top_pairs, top_skills
+
+
+def zipf_stream(n=50_000, seed=0):
+    """Skewed int64 keys (a few heavy, a long tail) and their exact counts."""
+    rng = np.random.default_rng(seed)
+    keys = np.minimum(rng.zipf(1.3, size=n), 1 << 20).astype(np.int64) * 7919
+    values, counts = np.unique(keys, return_counts=True)
+    return keys, dict(zip(values.tolist(), counts.tolist()))
+
+
+def test_count_min_never_undercounts_and_stays_within_epsilon_n():
+    keys, exact = zipf_stream()
+    cms = CountMinSketch(width=256, depth=4)
+    for part in np.array_split(keys, 7):
+        cms.add(part)
+    assert cms.total == len(keys)
+    values = np.array(list(exact))
+    estimates = cms.estimate(values)
+    true = np.array(list(exact.values()))
+    assert (estimates >= true).all()
+    assert np.mean(estimates - true > cms.error_bound) <= cms.delta
+
+
+def test_count_min_weighted_adds_and_sizing():
+    cms = CountMinSketch.for_error(epsilon=0.001, delta=0.01)
+    assert cms.epsilon <= 0.001 and cms.delta <= 0.01
+    cms.add([5, 9, 5], [2, 3, 4])
+    assert cms.estimate([5, 9]).tolist() == [6, 3] and cms.total == 9
+
+
+def check_space_saving(ss, exact):
+    tracked = dict(zip(ss.keys.tolist(), zip(ss.counts.tolist(), ss.errors.tolist())))
+    assert len(tracked) <= ss.capacity
+    for key, (count, error) in tracked.items():
+        assert count - error <= exact.get(key, 0) <= count
+    for key, true in exact.items():
+        if true > ss.floor:
+            assert key in tracked, key
+
+
+@pytest.mark.parametrize("capacity, batches", [(20, 1), (20, 13), (100, 50), (5000, 3)])
+def test_space_saving_bounds(capacity, batches):
+    keys, exact = zipf_stream(seed=capacity + batches)
+    ss = SpaceSaving(capacity)
+    for part in np.array_split(keys, batches):
+        ss.add(part)
+    assert ss.total == len(keys)
+    check_space_saving(ss, exact)
+    if capacity >= len(exact):
+        assert ss.floor == 0 and dict(zip(ss.keys.tolist(), ss.counts.tolist())) == exact
+
+
+def check_heavy_hitters(hh, exact, k):
+    listed = hh.keys.tolist()
+    assert len(listed) <= k and hh.total == sum(exact.values())
+    assert hh.estimates.tolist() == sorted(hh.estimates.tolist(), reverse=True)
+    for key, lower, estimate in zip(listed, hh.lower.tolist(), hh.estimates.tolist()):
+        assert lower <= exact[key] <= estimate
+    for key, true in exact.items():
+        if key not in listed:
+            assert true <= hh.untracked_max
+
+
+def test_top_items_finds_the_heavy_hitters():
+    keys, exact = zipf_stream(seed=3)
+    ids = np.concatenate([keys, [-1, -1]])  # missing values are skipped
+    hh = top_items(ids, k=10, capacity=40, width=1024, chunk=4096)
+    check_heavy_hitters(hh, exact, 10)
+    heaviest = sorted(exact, key=exact.get, reverse=True)[:3]
+    assert hh.keys[:3].tolist() == heaviest
+    assert "top 10" in hh.summary()
+
+
+def test_top_pairs_and_skills_match_exact_counts(corpus):
+    X = corpus.skill_indicator(True).astype(np.int64)
+    upper = sparse.triu(X.T @ X, k=1).tocoo()
+    exact = dict(zip(pair_keys(upper.row, upper.col).tolist(), upper.data.tolist()))
+    hh = top_pairs(corpus, k=15, capacity=60, width=512, chunk_jobs=37)
+    check_heavy_hitters(hh, exact, 15)
+    a_ids, b_ids = split_pair_keys(hh.keys)
+    assert (a_ids < b_ids).all()
+    assert pair_keys(a_ids, b_ids).tolist() == hh.keys.tolist()
+
+    counts = corpus.skill_counts(True)
+    exact = {i: c for i, c in enumerate(counts.tolist()) if c}
+    check_heavy_hitters(top_skills(corpus, k=5, capacity=len(exact)), exact, 5)
+    full = top_skills(corpus, k=len(exact), capacity=len(exact))
+    assert dict(zip(full.keys.tolist(), full.estimates.tolist())) == exact and full.max_error == 0
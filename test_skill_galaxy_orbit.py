@@ -0,0 +1,66 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+pytest.importorskip("pythreejs")
+pytest.importorskip("ipywidgets")
+pytest.importorskip("IPython")
+
+from charts import skill_galaxy_orbit as orbit  # noqa: E402
+
+
+def weighted_graph(n=23, seed=0):
+    rng = np.random.default_rng(seed)
+    G = nx.Graph()
+    G.add_nodes_from(f"s{i}" for i in range(n))
+    for i in range(n):
+        for j in rng.choice(n, size=3, replace=False).tolist():
+            if i != j:
+                G.add_edge(f"s{i}", f"s{j}", weight=int(rng.integers(1, 20)))
+    pos = {node: rng.random(3) for node in G}
+    return G, pos
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(orbit, "CHUNK_NODES", 5)
+    monkeypatch.setattr(orbit, "CHUNK_EDGES", 4)
+    # Record what would be sent instead of building pythreejs objects
+    monkeypatch.setattr(orbit, "_points", lambda coords, colors, material: ("points", len(coords)))
+    monkeypatch.setattr(orbit, "_segments", lambda coords, colors, u, v, material: ("edges", u.tolist(), v.tolist()))
+
+
+def test_galaxy_arrays_order_nodes_and_edges(small_chunks):
+    G, pos = weighted_graph()
+    labels, coords, colors, strength, u, v, level = orbit.galaxy_arrays(G, pos)
+    expected_strength = dict(G.degree(weight="weight"))
+    assert sorted(labels) == sorted(G.nodes())
+    assert strength.tolist() == [expected_strength[n] for n in labels]
+    assert strength.tolist() == sorted(strength.tolist(), reverse=True)
+    assert coords.dtype == colors.dtype == np.float32 and coords.shape == colors.shape == (len(G), 3)
+
+    edges = {tuple(sorted((labels[a], labels[b]))) for a, b in zip(u.tolist(), v.tolist())}
+    assert edges == {tuple(sorted(e)) for e in G.edges()}
+    assert level.tolist() == (np.maximum(u, v) // orbit.CHUNK_NODES).tolist()
+    weights = [G[labels[a]][labels[b]]["weight"] for a, b in zip(u.tolist(), v.tolist())]
+    assert list(zip(level.tolist(), [-w for w in weights])) == sorted(zip(level.tolist(), [-w for w in weights]))
+
+
+def test_chunks_draw_each_edge_once_after_both_ends(small_chunks):
+    G, pos = weighted_graph()
+    labels, coords, colors, strength, u, v, level = orbit.galaxy_arrays(G, pos)
+    chunks = list(orbit._chunks(coords, colors, u, v, level, None, None))
+
+    loaded, drawn = 0, []
+    for chunk in chunks:
+        if chunk[0] == "points":
+            assert chunk[1] == min(orbit.CHUNK_NODES, len(labels) - loaded)
+            loaded += chunk[1]
+        else:
+            _, cu, cv = chunk
+            assert 0 < len(cu) <= orbit.CHUNK_EDGES
+            assert max(cu + cv) < loaded  # both endpoints already streamed
+            drawn += list(zip(cu, cv))
+    assert loaded == len(labels)
+    assert drawn == list(zip(u.tolist(), v.tolist()))
+    assert [c[0] for c in chunks].count("points") == -(-len(labels) // orbit.CHUNK_NODES)
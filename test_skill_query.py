@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+
+from conftest import read_postings
+from skill_query import (
+    GALLOP_RATIO, SkillIndex, SkillQueryError, difference, intersect, parse_query, query_jobs, union,
+)
+
+
+def sorted_sample(rng, n, high):
+    return np.array(sorted(rng.sample(range(high), n)), dtype=np.int32)
+
+
+@pytest.mark.parametrize("n_a, n_b", [(0, 10), (30, 40), (5, 5 * GALLOP_RATIO * 4), (200, 3)])
+def test_posting_primitives_match_set_operations(n_a, n_b):
+    rng = random.Random(n_a * 1000 + n_b)
+    a, b = sorted_sample(rng, n_a, 2000), sorted_sample(rng, n_b, 2000)
+    assert intersect(a, b).tolist() == sorted(set(a.tolist()) & set(b.tolist()))
+    assert difference(a, b).tolist() == sorted(set(a.tolist()) - set(b.tolist()))
+    assert union([a, b]).tolist() == sorted(set(a.tolist()) | set(b.tolist()))
+
+
+def test_parse_query_precedence_and_multiword_terms():
+    assert parse_query("power bi AND sql OR NOT java") == (
+        "or", [("and", [("term", "power bi"), ("term", "sql")]), ("not", ("term", "java"))]
+    )
+    assert parse_query('"c++" AND (aws OR gcp)') == (
+        "and", [("term", "c++"), ("or", [("term", "aws"), ("term", "gcp")])]
+    )
+
+
+@pytest.mark.parametrize("text", ["", "python AND", "(python OR sql", "python )", "AND sql"])
+def test_malformed_queries_raise(text):
+    with pytest.raises(SkillQueryError):
+        parse_query(text)
+
+
+def brute_force(node, postings, all_rows):
+    kind = node[0]
+    if kind == "term":
+        return {row for row, names in postings.items() if node[1].strip().lower() in names}
+    if kind == "not":
+        return all_rows - brute_force(node[1], postings, all_rows)
+    parts = [brute_force(child, postings, all_rows) for child in node[1]]
+    return set.intersection(*parts) if kind == "and" else set.union(*parts)
+
+
+QUERIES = [
+    "python",
+    "Python AND sql",
+    "python AND (aws OR gcp) AND NOT java",
+    "NOT excel",
+    "power bi OR tableau OR r",
+    "NOT (sql OR excel) AND NOT python",
+    '"c++" AND NOT "c++"',
+    "spark AND hadoop AND docker AND kubernetes",
+    "unknown skill OR sql",
+]
+
+
+@pytest.mark.parametrize("required_only", [True, False])
+def test_query_equals_brute_force(jobs_db, corpus, required_only):
+    by_job = read_postings(jobs_db, required_only=required_only)
+    postings = {corpus.job_index[job_id]: names for job_id, names in by_job.items()}
+    all_rows = set(range(corpus.n_jobs))
+    for text in QUERIES:
+        expected = sorted(brute_force(parse_query(text), postings, all_rows))
+        assert query_jobs(corpus, text, required_only=required_only).tolist() == expected, text
+
+
+def test_unknown_skills_are_reported(corpus):
+    unknown = []
+    rows = query_jobs(corpus, "unknown skill OR sql", unknown=unknown)
+    assert unknown == ["unknown skill"]
+    assert rows.tolist() == SkillIndex.for_corpus(corpus).postings("sql").tolist()
+    assert SkillIndex.for_corpus(corpus) is SkillIndex.for_corpus(corpus)
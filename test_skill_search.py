@@ -0,0 +1,49 @@
+import random
+import string
+
+import numpy as np
+
+from conftest import TEST_SKILLS
+from skill_search import SkillSearchIndex, trigrams
+
+NAMES = TEST_SKILLS + ["c#", ".net", "node.js", "machine learning", "deep learning", "ms excel"]
+
+
+def test_trigrams():
+    assert trigrams("python") == {"pyt", "yth", "tho", "hon"}
+    assert trigrams("ab") == set()
+
+
+def test_empty_query_lists_everything():
+    index = SkillSearchIndex(NAMES)
+    assert index.search("  ").tolist() == list(range(len(NAMES)))
+
+
+def test_substring_equals_brute_force():
+    index = SkillSearchIndex(NAMES)
+    rng = random.Random(0)
+    queries = ["learning", "ill1", "sql", "xcel", "ower b", "zzz"]
+    queries += ["".join(rng.choice(string.ascii_lowercase[:8]) for _ in range(3)) for _ in range(50)]
+    for query in queries:
+        expected = [i for i, name in enumerate(index.names) if query in name]
+        assert index.substring(query).tolist() == expected
+        assert index.search(query, fuzzy=False).tolist() == expected
+
+
+def test_short_queries_list_word_prefixes_then_substrings():
+    index = SkillSearchIndex(NAMES)
+    for query in ["++", "r", "c", "le", "#", ".n"]:
+        result = index.search(query).tolist()
+        assert sorted(result) == [i for i, name in enumerate(index.names) if query in name]
+        starts = index.prefix(query).tolist()
+        assert result[:len(starts)] == starts
+    assert index.names[index.search("++")[0]] == "c++"
+
+
+def test_fuzzy_ranks_typos_after_exact_hits():
+    index = SkillSearchIndex(NAMES)
+    result = index.search("pyhton")
+    assert index.names[result[0]] == "python"
+    learning = index.search("learnig").tolist()
+    assert {index.names[i] for i in learning[:2]} == {"machine learning", "deep learning"}
+    assert len(np.unique(learning)) == len(learning)
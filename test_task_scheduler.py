@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from task_scheduler import TaskCancelled, TaskScheduler, check_cancelled, current_token
+
+TIMEOUT = 5
+
+
+class Recorder:
+    """Scheduler callbacks run inline on the worker thread; results / errors collected."""
+
+    def __init__(self):
+        self.done = []
+        self.errors = []
+
+    def on_error(self, task, error):
+        self.errors.append((task.label, error))
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def scheduler(recorder):
+    scheduler = TaskScheduler(post=lambda fn: fn(), on_error=recorder.on_error, max_workers=2)
+    yield scheduler
+    scheduler.shutdown()
+
+
+def finish(scheduler, *tasks):
+    """Wait until `tasks` have run (callbacks included); nothing may be left listed."""
+    for task in tasks:
+        task.future.result(TIMEOUT)
+    assert scheduler.tasks() == []
+
+
+def blocking(started, release, *args):
+    started.set()
+    assert release.wait(TIMEOUT)
+    check_cancelled()
+    return args
+
+
+def test_runs_and_reports_result(scheduler, recorder):
+    task = scheduler.submit("sum", sum, [1, 2, 3], on_done=recorder.done.append)
+    finish(scheduler, task)
+    assert recorder.done == [6]
+
+
+def test_identical_requests_are_coalesced(scheduler, recorder):
+    started, release = threading.Event(), threading.Event()
+    first = scheduler.submit("a", blocking, started, release, [1, 2], on_done=recorder.done.append)
+    assert scheduler.submit("a", blocking, started, release, [1, 2]) is first
+    other = scheduler.submit("b", blocking, started, release, [3])
+    assert other is not first
+    release.set()
+    finish(scheduler, first, other)
+    assert recorder.done == [([1, 2],)]
+
+
+def test_errors_reach_on_error(scheduler, recorder):
+    def fail():
+        raise ValueError("boom")
+
+    finish(scheduler, scheduler.submit("fail", fail, on_done=recorder.done.append))
+    assert recorder.done == []
+    assert [(label, str(error)) for label, error in recorder.errors] == [("fail", "boom")]
+
+
+def test_cancelled_task_stays_listed_until_it_stops(scheduler, recorder):
+    started, release = threading.Event(), threading.Event()
+    task = scheduler.submit("slow", blocking, started, release, on_done=recorder.done.append)
+    assert started.wait(TIMEOUT)
+    scheduler.cancel(task)
+    assert scheduler.tasks() == [task]
+    assert task.state == "cancelling"
+    # A duplicate request waits for the cancelled one instead of starting beside it
+    assert scheduler.submit("slow", blocking, started, release) is task
+
+    release.set()
+    finish(scheduler, task)
+    assert recorder.done == [] and recorder.errors == []
+
+
+def test_queued_task_is_dropped_at_once():
+    scheduler = TaskScheduler(post=lambda fn: fn(), max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    ran = []
+    slow = scheduler.submit("slow", blocking, started, release)
+    assert started.wait(TIMEOUT)
+    queued = scheduler.submit("queued", ran.append, 1)
+    assert queued.state == "queued"
+    scheduler.cancel(queued)
+    assert scheduler.tasks() == [slow]
+    assert queued.future.cancelled()
+    release.set()
+    finish(scheduler, slow)
+    assert ran == []
+    scheduler.shutdown()
+
+
+def test_progress_reports_and_stops_when_cancelled(scheduler, recorder):
+    reported, release = threading.Event(), threading.Event()
+    steps = []
+
+    def work(progress_callback):
+        for percent in (10, 20, 30):
+            progress_callback(percent)
+            steps.append(percent)
+            reported.set()
+            assert release.wait(TIMEOUT)
+        return "finished"
+
+    task = scheduler.submit("progress", work, progress=True, on_done=recorder.done.append)
+    assert reported.wait(TIMEOUT)
+    assert task.progress == 10
+    scheduler.cancel()
+    release.set()
+    finish(scheduler, task)
+    assert steps == [10] and recorder.done == []
+
+
+def test_token_is_only_set_inside_tasks(scheduler):
+    check_cancelled()  # no-op outside a task
+    assert current_token() is None
+    seen = []
+    task = scheduler.submit("token", lambda: seen.append(current_token()))
+    finish(scheduler, task)
+    assert seen == [task.token]
+    task.token.cancel()
+    with pytest.raises(TaskCancelled):
+        task.token.check()
@@ -0,0 +1,66 @@
+import networkx as nx
+import numpy as np
+import plotly.graph_objects as go
+
+from charts.trace_utils import edge_segments, edge_traces, graph_arrays, line_trace, width_buckets
+
+
+def small_graph():
+    G = nx.Graph()
+    G.add_edge("a", "b", weight=3)
+    G.add_edge("b", "c")          # no weight → 1
+    G.add_edge("a", "d", weight=7)
+    pos = {"a": (0, 0), "b": (1, 0), "c": (1, 2), "d": (-1, -1)}
+    return G, pos
+
+
+def test_graph_arrays_index_nodes_in_graph_order():
+    G, pos = small_graph()
+    nodes, coords, u, v, weights = graph_arrays(G, pos)
+    assert nodes == ["a", "b", "c", "d"]
+    assert coords.dtype == np.float32 and coords.tolist() == [[0, 0], [1, 0], [1, 2], [-1, -1]]
+    assert [(nodes[i], nodes[j]) for i, j in zip(u.tolist(), v.tolist())] == list(G.edges())
+    assert weights.tolist() == [3, 7, 1]
+    assert graph_arrays(G, {n: (*p, 5) for n, p in pos.items()})[1].shape == (4, 3)
+    empty = graph_arrays(nx.Graph(), {})
+    assert empty[1].shape == (0, 2) and len(empty[2]) == 0
+
+
+def test_edge_segments_put_a_nan_after_every_edge():
+    coords = np.array([[0, 0, 0], [1, 2, 3], [4, 5, 6]], dtype=np.float32)
+    x, y, z = edge_segments(coords, [0, 2], [1, 1])
+    nan = float("nan")
+    np.testing.assert_array_equal(x, [0, 1, nan, 4, 1, nan])
+    np.testing.assert_array_equal(y, [0, 2, nan, 5, 2, nan])
+    np.testing.assert_array_equal(z, [0, 3, nan, 6, 3, nan])
+    assert all(len(axis) == 0 for axis in edge_segments(coords[:, :2], [], []))
+
+
+def test_line_trace_picks_the_trace_type():
+    coords2, coords3 = np.zeros((2, 2), dtype=np.float32), np.zeros((2, 3), dtype=np.float32)
+    assert isinstance(line_trace(coords2, [0], [1]), go.Scatter)
+    assert isinstance(line_trace(coords2, [0], [1], webgl=True), go.Scattergl)
+    trace = line_trace(coords3, [0], [1], line=dict(width=2))
+    assert isinstance(trace, go.Scatter3d) and trace.mode == "lines" and trace.line.width == 2
+
+
+def test_width_buckets_split_at_quantiles():
+    widths = np.arange(1, 11, dtype=float)
+    bucket, bucket_widths = width_buckets(widths, n_buckets=5)
+    assert bucket.tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert bucket_widths.tolist() == [1.5, 3.5, 5.5, 7.5, 9.5]
+    bucket, bucket_widths = width_buckets([2, 2, 2], n_buckets=5)  # equal widths share one bucket
+    assert len(set(bucket.tolist())) == 1 and bucket_widths[bucket].tolist() == [2.0] * 3
+    assert width_buckets([])[0].size == 0
+
+
+def test_edge_traces_draw_every_edge_once_thinnest_first():
+    coords = np.random.default_rng(0).random((20, 2)).astype(np.float32)
+    u, v = np.arange(19), np.arange(1, 20)
+    widths = np.r_[np.ones(15), np.full(4, 5.0)]
+    traces = edge_traces(coords, u, v, widths, n_buckets=3, color="red")
+    assert [t.line.width for t in traces] == sorted(t.line.width for t in traces)
+    assert sum(np.isnan(t.x).sum() for t in traces) == len(u)
+    drawn = sorted(tuple(p) for t in traces for p in np.c_[t.x, t.y][~np.isnan(t.x)].reshape(-1, 2, 2).tolist())
+    expected = sorted(tuple(p) for p in np.stack([coords[u], coords[v]], axis=1).tolist())
+    assert drawn == expected